@@ -1,15 +1,28 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends, Query, Request
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
 from fastapi.concurrency import run_in_threadpool
 import json
 import os
 import shutil
-import pandas as pd
-from typing import Optional
+import tempfile
+import uuid
+from typing import AsyncIterator, List, Optional
 from app.schemas.config import DataProcessingConfig, ModelTrainingConfig, ModelTestingConfig
+from app.schemas.prediction import PredictionInput, PredictionOutput
 from app.services.data_service import DataService
 from app.services.ml_service import MLService
+from app.services.prediction_service import PredictionService
+from app.services.model_cache import resolve_artifact_path
+from app.services.dataset_io import MEDIA_TYPES, read_columns, UnsupportedFormatError
+from app.services.dataset_store import dataset_store, CHUNK_SIZE
+from app.services.preprocessing import preprocessor_path
+from app.services.job_service import job_manager, JobQueueFullError, JobNotFoundError
+from app.services.model_registry import model_registry
+from app.services.result_cache import result_cache
+from app.services.admission import admission, AdmissionRejected
 from app.core.logging_config import logger
+from app.core.config import settings
 
 api_router = APIRouter()
 
@@ -20,34 +33,107 @@ def get_data_service() -> DataService:
 def get_ml_service() -> MLService:
     return MLService()
 
+def get_prediction_service() -> PredictionService:
+    return PredictionService()
+
 # --- YARDIMCI FONKSİYONLAR ---
-def save_upload_file(upload_file: UploadFile, destination: str):
+async def iter_upload(upload_file: UploadFile) -> AsyncIterator[bytes]:
+    while True:
+        chunk = await upload_file.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
+
+async def store_upload(upload_file: UploadFile, parse: bool = True) -> dict:
+    """
+    Yüklemeyi içerik adresli depoya alır. Dosya tek geçişte hash'lenir, yazılır ve parse
+    edilir; sütun isimleri de döner (auto-config dosyayı tekrar açmaz).
+    """
     try:
-        os.makedirs(os.path.dirname(destination), exist_ok=True)
-        with open(destination, "wb") as buffer:
-            shutil.copyfileobj(upload_file.file, buffer)
-        return destination
+        async with admission.slot("upload"):
+            return await dataset_store.ingest_stream(iter_upload(upload_file), upload_file.filename, parse)
     finally:
-        upload_file.file.close()
+        await upload_file.close()
 
-def generate_auto_config(file_path: str, target_col: str, config_type: str):
-    if file_path.endswith('.csv'):
-        df = pd.read_csv(file_path, nrows=1)
-    elif file_path.endswith(('.xls', '.xlsx')):
-        df = pd.read_excel(file_path, nrows=1)
-    else:
-        raise ValueError("Desteklenmeyen format! Sadece .csv veya .xlsx")
+async def resolve_dataset(upload_file: Optional[UploadFile], dataset_id: Optional[str]) -> dict:
+    """İstekteki dosyayı depoya alır ya da POST /datasets ile önceden yüklenmiş veri setini döner."""
+    if dataset_id:
+        try:
+            return await admission.run("upload", dataset_store.get, dataset_id)
+        except FileNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    if upload_file is None:
+        raise HTTPException(status_code=400, detail="Dosya veya dataset_id gerekli.")
+    try:
+        return await store_upload(upload_file)
+    except ValueError as e:
+        raise invalid_upload(e)
+
+def invalid_upload(e: ValueError) -> HTTPException:
+    # Desteklenmeyen uzantı 415, okunamayan (bozuk/boş) dosya 400
+    status_code = 415 if isinstance(e, UnsupportedFormatError) else 400
+    return HTTPException(status_code=status_code, detail=str(e))
+
+def stage_model(model_path: str, preprocessor) -> str:
+    """
+    Adapter'lar preprocessing'i model dosyasının yanından yükler. Depodaki model başka
+    isteklerle paylaşıldığı için yanına yazılmaz; istek başına geçici bir klasöre hard link
+    verilir ve preprocessing dosyası oraya yazılır. Geçici model yolunu döner.
+    """
+    incoming_dir = os.path.join(dataset_store.root, "incoming")
+    os.makedirs(incoming_dir, exist_ok=True)
+    work_dir = tempfile.mkdtemp(prefix="test-model-", dir=incoming_dir)
+    staged_path = os.path.join(work_dir, os.path.basename(model_path))
+    try:
+        try:
+            os.link(model_path, staged_path)
+        except OSError:
+            shutil.copyfile(model_path, staged_path)
+        with open(preprocessor_path(staged_path), "wb") as buffer:
+            shutil.copyfileobj(preprocessor, buffer, CHUNK_SIZE)
+    except BaseException:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        raise
+    return staged_path
+
+def overloaded(e: AdmissionRejected) -> HTTPException:
+    return HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+def generate_auto_config(file_path: str, target_col: str, config_type: str, columns: Optional[List[str]] = None):
+    if columns is None:
+        columns = read_columns(file_path)
     
-    if target_col not in df.columns:
-        raise ValueError(f"Hedef sütun '{target_col}' dosyada bulunamadı! Mevcut sütunlar: {list(df.columns)}")
+    if target_col not in columns:
+        raise ValueError(f"Hedef sütun '{target_col}' dosyada bulunamadı! Mevcut sütunlar: {columns}")
     
-    features = [col for col in df.columns if col != target_col]
+    features = [col for col in columns if col != target_col]
     
     if config_type == "process":
         return {"target_column": target_col, "feature_columns": features, "test_size": 0.2, "raw_data_path": file_path}
     elif config_type == "train":
         return {"experiment_name": "Auto_Experiment", "target_column": target_col, "feature_columns": features, "algorithm_config": {"type": "random_forest", "params": {"n_estimators": 100}}, "train_data_path": file_path, "save_model_path": "models/auto_model.pkl"}
 
+def build_train_config(train_path: str, config_str: Optional[str], target_column: Optional[str],
+                       base_model_id: Optional[str] = None, register_as: Optional[str] = None,
+                       columns: Optional[List[str]] = None) -> ModelTrainingConfig:
+    if config_str:
+        config_dict = json.loads(config_str)
+    else:
+        if not target_column:
+            raise HTTPException(status_code=400, detail="Target column veya JSON gerekli.")
+        config_dict = generate_auto_config(train_path, target_column, "train", columns)
+    
+    config_obj = ModelTrainingConfig(**config_dict)
+    if not config_obj.train_data_path:
+        config_obj.train_data_path = train_path
+    if base_model_id:
+        config_obj.base_model_id = base_model_id
+    if register_as:
+        config_obj.register_as = register_as
+    return config_obj
+
 # --- 0. Health Check (YENİ - Yöneticiler buna bayılır) ---
 @api_router.get(
     "/health", 
@@ -58,6 +144,42 @@ def generate_auto_config(file_path: str, target_col: str, config_type: str):
 async def health_check():
     return {"status": "active", "version": "2.0.0", "mode": "production"}
 
+@api_router.get(
+    "/admission/stats",
+    tags=["System Status"],
+    summary="🚦 Kuyruk ve Eşzamanlılık Durumu",
+    description="Ağır uçların havuz bazında çalışan/bekleyen istek sayılarını, reddedilen istekleri ve ortalama bekleme sürelerini döner."
+)
+async def admission_stats():
+    return admission.stats()
+
+# --- 1. Veri Yükleme ---
+@api_router.post(
+    "/datasets",
+    tags=["1. Data Pipeline"],
+    summary="📤 Veri Seti Yükleme (Streaming)",
+    description=(
+        "Dosyayı multipart yerine ham gövde olarak gönderin (örn. curl --data-binary @veri.csv). "
+        "Gövde alınırken parça parça hash'lenir, diske yazılır ve CSV ise Parquet'e çevrilir. "
+        "Dönen dataset_id, diğer uçlarda dosya yerine kullanılabilir."
+    )
+)
+async def upload_dataset(
+    request: Request,
+    filename: str = Query(..., description="Format için dosya adı, örn: 'veri.csv' (.csv, .xlsx, .parquet, .feather)")
+):
+    try:
+        async with admission.slot("upload"):
+            stored = await dataset_store.ingest_stream(request.stream(), filename)
+        return {"dataset_id": stored["digest"], "path": stored["path"], "columns": stored["columns"]}
+    except AdmissionRejected as e:
+        raise overloaded(e)
+    except ValueError as e:
+        raise invalid_upload(e)
+    except Exception as e:
+        logger.error(f"Dataset Yükleme Hata: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 # --- 1. Veri İşleme ---
 @api_router.post(
     "/process-data", 
@@ -67,14 +189,15 @@ async def health_check():
     description="CSV veya Excel dosyası yükleyin. Sistem otomatik olarak temizleyip, Train/Test olarak ayırıp size geri indirtecektir."
 )
 async def process_data(
-    file: UploadFile = File(..., description="İşlenecek ham veri dosyası (.csv veya .xlsx)"),
+    file: Optional[UploadFile] = File(None, description="İşlenecek ham veri dosyası (.csv veya .xlsx)"),
     config_str: Optional[str] = Form(None, description="Opsiyonel: Detaylı JSON ayarları"),
     target_column: Optional[str] = Form(None, description="JSON yoksa, sadece hedef sütun adını yazın (örn: 'price')"),
+    dataset_id: Optional[str] = Form(None, description="Dosya yerine POST /datasets ile yüklenmiş veri seti"),
     service: DataService = Depends(get_data_service)
 ):
     try:
-        temp_input_path = f"data/uploads/{file.filename}"
-        save_upload_file(file, temp_input_path)
+        stored = await resolve_dataset(file, dataset_id)
+        temp_input_path = stored["path"]
         
         if config_str:
             logger.info("Manuel config kullanılıyor.")
@@ -83,16 +206,21 @@ async def process_data(
             if not target_column:
                 raise HTTPException(status_code=400, detail="Ya JSON config gönderin ya da 'target_column' alanını doldurun.")
             logger.info("Otomatik config üretiliyor...")
-            config_dict = generate_auto_config(temp_input_path, target_column, "process")
+            config_dict = generate_auto_config(temp_input_path, target_column, "process", stored["columns"])
 
         config_obj = DataProcessingConfig(**config_dict)
         if not config_obj.raw_data_path:
             config_obj.raw_data_path = temp_input_path
             
-        result = await run_in_threadpool(service.process_data, config_obj)
+        result = await admission.run("data", service.process_data, config_obj)
         
-        return FileResponse(path=result["train_path"], filename="processed_train_data.csv", media_type='text/csv')
+        ext = os.path.splitext(result["train_path"])[1]
+        return FileResponse(path=result["train_path"], filename=f"processed_train_data{ext}", media_type=MEDIA_TYPES[ext])
         
+    except HTTPException:
+        raise
+    except AdmissionRejected as e:
+        raise overloaded(e)
     except Exception as e:
         logger.error(f"Hata: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -106,30 +234,33 @@ async def process_data(
     description="İşlenmiş veriyi yükleyin. Random Forest, XGBoost vb. ile eğitilen model (.pkl) otomatik olarak iner. MLflow ile loglanır."
 )
 async def train_model(
-    file: UploadFile = File(..., description="Eğitim verisi (CSV/Excel)"), 
+    file: Optional[UploadFile] = File(None, description="Eğitim verisi (CSV/Excel)"), 
     config_str: Optional[str] = Form(None, description="Model hiperparametreleri (JSON)"),
     target_column: Optional[str] = Form(None, description="JSON yoksa hedef sütun adı"),
+    base_model_id: Optional[str] = Form(None, description="Artımlı eğitim: devam edilecek model, örn: 'models/auto_model.pkl' (sadece yeni veriyi yükleyin)"),
+    register_as: Optional[str] = Form(None, description="Opsiyonel: modeli registry'ye bu isimle yeni versiyon olarak kaydet"),
+    dataset_id: Optional[str] = Form(None, description="Dosya yerine POST /datasets ile yüklenmiş veri seti"),
     service: MLService = Depends(get_ml_service)
 ):
     try:
-        temp_train_path = f"data/uploads/train_{file.filename}"
-        save_upload_file(file, temp_train_path)
+        stored = await resolve_dataset(file, dataset_id)
+        config_obj = build_train_config(stored["path"], config_str, target_column, base_model_id, register_as,
+                                        stored["columns"])
         
-        if config_str:
-            config_dict = json.loads(config_str)
-        else:
-            if not target_column:
-                raise HTTPException(status_code=400, detail="Target column veya JSON gerekli.")
-            config_dict = generate_auto_config(temp_train_path, target_column, "train")
-        
-        config_obj = ModelTrainingConfig(**config_dict)
-        if not config_obj.train_data_path:
-            config_obj.train_data_path = temp_train_path
-        
-        result = await run_in_threadpool(service.train_model, config_obj)
+        result = await admission.run("training", service.train_model, config_obj)
         
-        return FileResponse(path=result["save_path"], filename="trained_model.pkl", media_type='application/octet-stream')
+        # XGBoost/Keras adapter'ları uzantıyı değiştirir; diske yazılan gerçek dosya indirilir
+        ext = os.path.splitext(result["artifact_path"])[1]
+        headers = {}
+        if result["registry"]:
+            headers = {"X-Model-Name": result["registry"]["name"], "X-Model-Version": result["registry"]["version"]}
+        return FileResponse(path=result["artifact_path"], filename=f"trained_model{ext}",
+                            media_type='application/octet-stream', headers=headers)
         
+    except HTTPException:
+        raise
+    except AdmissionRejected as e:
+        raise overloaded(e)
     except Exception as e:
         logger.error(f"Train Hata: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -139,29 +270,273 @@ async def train_model(
     "/test-model",
     tags=["2. Machine Learning"],
     summary="📊 Model Performans Testi",
-    description="Test verisini ve eğitilmiş model (.pkl) dosyasını yükleyin. Size Accuracy, F1 Score gibi metrikleri içeren bir rapor döner."
+    description="Test verisini ve eğitilmiş model (.pkl) dosyasını yükleyin. Size Accuracy, F1 Score gibi metrikleri içeren bir rapor döner. ROC-AUC 1M satıra kadar tam hesaplanır; daha büyük verilerde histogramdan yaklaşık hesaplanır ve raporda roc_auc_approximate=true olur."
 )
 async def test_model(
-    test_file: UploadFile = File(..., description="Test verisi"),
-    model_file: UploadFile = File(..., description="Eğitilmiş model dosyası"),
+    test_file: Optional[UploadFile] = File(None, description="Test verisi"),
+    model_file: Optional[UploadFile] = File(None, description="Eğitilmiş model dosyası (config'te registry_name varsa gerekmez)"),
     config_str: str = Form(..., description="Config JSON"),
+    preprocessor_file: Optional[UploadFile] = File(None, description="Opsiyonel: eğitimde üretilen *.preprocessor.json dosyası"),
+    dataset_id: Optional[str] = Form(None, description="Test dosyası yerine POST /datasets ile yüklenmiş veri seti"),
     service: MLService = Depends(get_ml_service)
 ):
+    staged_dir = None
     try:
         config_dict = json.loads(config_str)
-        temp_test_path = f"data/uploads/test_{test_file.filename}"
-        temp_model_path = f"models/uploads/{model_file.filename}"
-        
-        save_upload_file(test_file, temp_test_path)
-        save_upload_file(model_file, temp_model_path)
-        
+        temp_test_path = (await resolve_dataset(test_file, dataset_id))["path"]
         config_obj = ModelTestingConfig(**config_dict)
         setattr(config_obj, 'test_data_path', temp_test_path)
+        if config_obj.registry_name:
+            logger.info("Test Model isteği alındı (registry).")
+            return await admission.run("testing", service.test_model, config_obj)
+        if model_file is None:
+            raise HTTPException(status_code=400, detail="model_file veya config'te registry_name gerekli.")
+
+        temp_model_path = (await store_upload(model_file, parse=False))["path"]
+        if preprocessor_file is not None:
+            try:
+                temp_model_path = await admission.run("upload", stage_model, temp_model_path, preprocessor_file.file)
+                staged_dir = os.path.dirname(temp_model_path)
+            finally:
+                await preprocessor_file.close()
+        
         setattr(config_obj, 'model_path', temp_model_path)
         
         logger.info("Test Model isteği alındı.")
-        return await run_in_threadpool(service.test_model, config_obj)
+        return await admission.run("testing", service.test_model, config_obj)
         
+    except HTTPException:
+        raise
+    except AdmissionRejected as e:
+        raise overloaded(e)
     except Exception as e:
         logger.error(f"Test Hata: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if staged_dir is not None:
+            await run_in_threadpool(shutil.rmtree, staged_dir, True)
+
+# --- 4. Online Tahmin ---
+@api_router.post(
+    "/predict",
+    response_model=PredictionOutput,
+    tags=["3. Inference"],
+    summary="⚡ Tek Satır Tahmin",
+    description="Eğitilmiş bir modelle tek satırlık tahmin yapar. Model ilk çağrıda yüklenir ve bellekte tutulur; eşzamanlı istekler tek bir vektörel predict çağrısında toplanır."
+)
+async def predict(
+    payload: PredictionInput,
+    service: PredictionService = Depends(get_prediction_service)
+):
+    try:
+        if settings.PREDICT_BATCHING_ENABLED:
+            return await service.predict_batched(payload)
+        return await admission.run("inference", service.predict, payload)
+    except AdmissionRejected as e:
+        raise overloaded(e)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error(f"Predict Hata: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.post(
+    "/predict-matrix",
+    tags=["3. Inference"],
+    summary="🚄 Çok Satırlı Tahmin (Arrow / float32 / .npy)",
+    description=(
+        "Gövde JSON yerine ikili formatta gönderilir ve kopyalanmadan NumPy matrisine çevrilir. "
+        "Content-Type: application/vnd.apache.arrow.stream | application/vnd.apache.arrow.file | "
+        "application/x-npy | application/octet-stream (ham little-endian float32, n_features gerekli) | application/json. "
+        "Yanıt Accept başlığına göre Arrow IPC stream veya JSON (orjson) döner."
+    )
+)
+async def predict_matrix(
+    request: Request,
+    model_id: str = Query(..., description="Model yolu veya registry adı"),
+    model_type: str = Query("random_forest", description="random_forest, xgboost veya neural_network"),
+    version: Optional[str] = Query(None, description="Opsiyonel model versiyonu"),
+    n_features: Optional[int] = Query(None, description="Ham float32 gövdesinde satır başına özellik sayısı (boşsa modelden alınır)"),
+    service: PredictionService = Depends(get_prediction_service)
+):
+    try:
+        body = await request.body()
+        content, media_type = await admission.run(
+            "inference", service.predict_matrix, body, request.headers.get("content-type"), request.headers.get("accept"),
+            model_id, model_type, version, n_features
+        )
+        return Response(content=content, media_type=media_type)
+    except AdmissionRejected as e:
+        raise overloaded(e)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except (ValueError, KeyError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error(f"Predict Matrix Hata: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.get(
+    "/prediction-cache/stats",
+    tags=["3. Inference"],
+    summary="📈 Tahmin Önbelleği İstatistikleri",
+    description="Tahmin sonucu önbelleğinin boyutunu, isabet oranını ve atılan kayıt sayılarını döner (PREDICTION_CACHE_ENABLED ile açılır)."
+)
+async def prediction_cache_stats():
+    return result_cache.stats()
+
+# --- 5. Toplu Skorlama ---
+@api_router.post(
+    "/batch-predict",
+    response_class=StreamingResponse,
+    tags=["3. Inference"],
+    summary="📦 Toplu Tahmin (CSV/Parquet)",
+    description="Büyük bir CSV veya Parquet dosyasını parça parça okuyarak satır bazında tahmin üretir. Sonuçlar hazır oldukça CSV olarak akıtılır."
+)
+async def batch_predict(
+    file: UploadFile = File(..., description="Skorlanacak veri (.csv veya .parquet)"),
+    model_id: str = Form(..., description="Eğitilmiş modelin yolu, örn: 'models/auto_model.pkl'"),
+    model_type: str = Form("random_forest", description="random_forest, xgboost veya neural_network"),
+    feature_columns: Optional[str] = Form(None, description="Opsiyonel: JSON liste. Boşsa modeldeki sütun isimleri kullanılır"),
+    chunksize: int = Form(50_000, description="Her seferde okunacak satır sayısı"),
+    service: PredictionService = Depends(get_prediction_service)
+):
+    try:
+        columns = json.loads(feature_columns) if feature_columns else None
+        # Slot yanıt akışı bitene kadar tutulur
+        release = await admission.hold("batch")
+        try:
+            stream = await run_in_threadpool(
+                service.iter_batch_predictions, file.file, file.filename, model_id, model_type, columns, chunksize
+            )
+        except BaseException:
+            await release()
+            raise
+        return StreamingResponse(
+            admission.stream(stream, release),
+            media_type="text/csv",
+            headers={"Content-Disposition": "attachment; filename=predictions.csv"},
+            background=BackgroundTask(release)
+        )
+    except AdmissionRejected as e:
+        raise overloaded(e)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error(f"Batch Predict Hata: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# --- 6. Arka Plan Eğitim İşleri ---
+@api_router.post(
+    "/jobs",
+    status_code=202,
+    tags=["2. Machine Learning"],
+    summary="🕒 Arka Planda Model Eğitimi",
+    description="Eğitimi ayrı bir süreçte kuyruğa alır ve hemen bir iş ID'si döner. Durum için GET /jobs/{job_id}, model için GET /jobs/{job_id}/artifact kullanın."
+)
+async def create_training_job(
+    file: Optional[UploadFile] = File(None, description="Eğitim verisi (CSV/Excel)"),
+    config_str: Optional[str] = Form(None, description="Model hiperparametreleri (JSON)"),
+    target_column: Optional[str] = Form(None, description="JSON yoksa hedef sütun adı"),
+    base_model_id: Optional[str] = Form(None, description="Artımlı eğitim: devam edilecek model"),
+    register_as: Optional[str] = Form(None, description="Opsiyonel: registry'ye bu isimle kaydet"),
+    dataset_id: Optional[str] = Form(None, description="Dosya yerine POST /datasets ile yüklenmiş veri seti")
+):
+    try:
+        job_id = uuid.uuid4().hex
+        stored = await resolve_dataset(file, dataset_id)
+        config_obj = build_train_config(stored["path"], config_str, target_column, base_model_id, register_as,
+                                        stored["columns"])
+        # Eşzamanlı işler birbirinin modelini ezmesin diye her iş kendi klasörüne yazar
+        config_obj.save_model_path = os.path.join("models", "jobs", job_id, os.path.basename(config_obj.save_model_path))
+        
+        job = await run_in_threadpool(job_manager.submit, config_obj.model_dump(), job_id)
+        return {"job_id": job["job_id"], "status": job["status"]}
+        
+    except HTTPException:
+        raise
+    except AdmissionRejected as e:
+        raise overloaded(e)
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+    except Exception as e:
+        logger.error(f"Job Hata: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.get(
+    "/jobs/{job_id}",
+    tags=["2. Machine Learning"],
+    summary="🔎 Eğitim İşi Durumu"
+)
+async def get_training_job(job_id: str):
+    try:
+        job = job_manager.get(job_id)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {key: job[key] for key in ("job_id", "status", "stage", "progress", "created_at", "started_at", "finished_at", "result", "error")}
+
+@api_router.get(
+    "/jobs/{job_id}/artifact",
+    response_class=FileResponse,
+    tags=["2. Machine Learning"],
+    summary="📥 Eğitilmiş Modeli İndir"
+)
+async def get_training_job_artifact(job_id: str):
+    try:
+        job = job_manager.get(job_id)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if job["status"] != "completed":
+        raise HTTPException(status_code=409, detail=f"İş henüz tamamlanmadı (durum: {job['status']}).")
+    
+    model_type = job["config"]["algorithm_config"]["type"]
+    artifact_path = resolve_artifact_path(model_type, job["result"]["save_path"])
+    if os.path.isdir(artifact_path):
+        raise HTTPException(status_code=409, detail="Model bir klasör olarak kaydedildi, dosya olarak indirilemez.")
+    return FileResponse(path=artifact_path, filename=os.path.basename(artifact_path), media_type='application/octet-stream')
+
+# --- 7. Model Registry ---
+@api_router.get(
+    "/models",
+    tags=["4. Model Registry"],
+    summary="📚 Kayıtlı Modeller",
+    description="Registry'deki modelleri, servis edilen ve en son versiyonlarıyla listeler."
+)
+async def list_registered_models():
+    return await run_in_threadpool(model_registry.list_models)
+
+@api_router.get(
+    "/models/{name}/versions",
+    tags=["4. Model Registry"],
+    summary="🗂️ Model Versiyonları",
+    description="Bir modelin tüm versiyonlarını metadata'larıyla (özellikler, test metrikleri, MLflow run) döner."
+)
+async def list_model_versions(name: str):
+    try:
+        return {"name": name, "serving_version": model_registry.serving_version(name),
+                "versions": await run_in_threadpool(model_registry.list_versions, name)}
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+@api_router.post(
+    "/models/{name}/versions/{version}/promote",
+    tags=["4. Model Registry"],
+    summary="🚀 Versiyonu Servise Al",
+    description="Versiyonu önce önbelleğe yükler, sonra atomik olarak 'serving' yapar. Geçiş sırasında istekler eski versiyonla cevaplanmaya devam eder."
+)
+async def promote_model_version(name: str, version: str):
+    try:
+        return await run_in_threadpool(model_registry.promote, name, version)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error(f"Promote Hata: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
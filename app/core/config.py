@@ -1,4 +1,5 @@
 import os
+from typing import Dict, Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -6,8 +7,65 @@ class Settings(BaseSettings):
     VERSION: str = "1.0.0"
     
     BASE_DIR: str = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    # Online tahmin için bellekte tutulan model önbelleği
+    MODEL_CACHE_MAX_ITEMS: int = 8
+    MODEL_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024  # 1 GB
+
+    # /predict isteklerini tek predict çağrısında toplayan micro-batching
+    PREDICT_BATCHING_ENABLED: bool = True
+    PREDICT_BATCH_MAX_SIZE: int = 64
+    PREDICT_BATCH_MAX_WAIT_MS: float = 2.0
+
+    # Çok worker'lı servis: ağaç modelleri diziye çevrilip memory-map ile açılır, tüm worker'lar
+    # modelin tek kopyasını paylaşır (RAM worker sayısıyla artmaz). Diziler MODEL_SHARED_DIR'de tutulur.
+    MODEL_SHARED_MEMORY: bool = False
+    MODEL_SHARED_DIR: str = "models/shared"
+    # Eski model versiyonlarının klasörleri, son kullanımdan bu kadar saniye sonra silinir
+    MODEL_SHARED_GRACE_S: float = 300.0
+
+    # Opsiyonel tahmin sonucu önbelleği (aynı/yuvarlanmış özellik vektörleri modele tekrar gitmez)
+    PREDICTION_CACHE_ENABLED: bool = False
+    PREDICTION_CACHE_MAX_ITEMS: int = 100_000
+    PREDICTION_CACHE_TTL_S: float = 300.0  # 0: süresiz
+    PREDICTION_CACHE_ROUND_DECIMALS: Optional[int] = None  # Örn. 2: değerler 2 ondalığa yuvarlanıp hash'lenir
+
+    # Ağır uçlar için kabul kontrolü: havuz başına eşzamanlılık sınırı ve öncelikli kuyruk.
+    # priority küçük olan önce başlar; reserved, daha düşük öncelikli havuzların dokunamayacağı slot sayısıdır.
+    # Kuyruk (max_queue) dolunca veya bekleme max_wait_s'i aşınca 429 + Retry-After döner.
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_MAX_CONCURRENCY: int = 8  # Tüm havuzların toplamı (Starlette threadpool'u 40 thread)
+    ADMISSION_POOLS: Dict[str, dict] = {
+        "inference": {"priority": 0, "max_concurrency": 4, "reserved": 2, "max_queue": 256, "max_wait_s": 2.0},
+        "batch": {"priority": 1, "max_concurrency": 2, "max_queue": 16, "max_wait_s": 30.0},
+        # Yükleme alma/parse (POST /datasets ve dosya alan tüm uçlar); UPLOAD_MAX_CONCURRENCY ile aynı
+        "upload": {"priority": 1, "max_concurrency": 4, "max_queue": 16, "max_wait_s": 60.0},
+        "data": {"priority": 1, "max_concurrency": 2, "max_queue": 8, "max_wait_s": 60.0},
+        "testing": {"priority": 1, "max_concurrency": 2, "max_queue": 8, "max_wait_s": 60.0},
+        "training": {"priority": 2, "max_concurrency": 1, "max_queue": 4, "max_wait_s": 120.0},
+    }
+
+    # Versiyonlu model kaydı (registry) kök klasörü
+    MODEL_REGISTRY_DIR: str = "models/registry"
+
+    # İçerik adresli yükleme/veri seti deposu
+    DATASET_STORE_DIR: str = "data/store"
+    UPLOAD_MAX_CONCURRENCY: int = 4  # Aynı anda parse edilen yükleme sayısı (ayrı thread havuzu)
+
+    # Arka plan eğitim işleri (ayrı süreçlerde çalışır)
+    TRAINING_JOBS_DIR: str = "data/jobs"
+    TRAINING_MAX_WORKERS: int = 2
+    TRAINING_MAX_PENDING_JOBS: int = 16
+
+    # MLflow kayıtları arka plan kuyruğunda yazılır; eğitim yanıtı tracking store'u beklemez
+    MLFLOW_ASYNC_LOGGING: bool = True
+    MLFLOW_LOG_QUEUE_SIZE: int = 1000
+    MLFLOW_LOG_BATCH_SIZE: int = 32
+    MLFLOW_LOG_MAX_RETRIES: int = 3
+    MLFLOW_LOG_RETRY_BACKOFF_S: float = 1.0
+    MLFLOW_STAGING_DIR: str = "data/tracking"
     
     class Config:
         case_sensitive = True
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
@@ -0,0 +1,103 @@
+from contextlib import contextmanager
+from prometheus_client import Counter, Gauge, Histogram
+
+# --- HTTP ---
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP istek süresi (route şablonu bazında)",
+    ["method", "route", "status"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+
+# --- Servis içi aşamalar (upload, parse, fit, save, mlflow ...) ---
+STAGE_LATENCY = Histogram(
+    "ml_stage_duration_seconds",
+    "Servis içindeki aşamaların süresi",
+    ["service", "stage"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+)
+
+# --- Model önbelleği ve batching ---
+MODEL_CACHE_REQUESTS = Counter(
+    "model_cache_requests_total", "Model önbelleği istekleri", ["result"]  # result: hit / miss
+)
+MODEL_CACHE_BYTES = Gauge("model_cache_bytes", "Önbellekteki modellerin tahmini boyutu")
+PREDICTION_CACHE_REQUESTS = Counter(
+    "prediction_cache_requests_total", "Tahmin sonucu önbelleği istekleri (satır bazında)", ["result"]
+)
+PREDICT_BATCH_SIZE = Histogram(
+    "predict_batch_size", "Micro-batcher'ın tek predict çağrısında işlediği satır sayısı",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+
+# --- Veri işleme ---
+ROWS_PROCESSED = Counter("data_rows_processed_total", "İşlenen satır sayısı", ["service"])
+ROWS_PER_SECOND = Gauge("data_rows_per_second", "Son işlemde saniye başına satır", ["service"])
+
+# --- MLflow arka plan kuyruğu ---
+TRACKING_QUEUE_DEPTH = Gauge("mlflow_log_queue_depth", "Yazılmayı bekleyen MLflow kaydı sayısı")
+TRACKING_RECORDS = Counter(
+    "mlflow_log_records_total", "MLflow kayıt denemeleri", ["result"]  # logged / retry / failed / dropped
+)
+
+# --- Kabul kontrolü (admission) ---
+ADMISSION_RUNNING = Gauge("admission_running", "Havuzda çalışan ağır istek sayısı", ["pool"])
+ADMISSION_QUEUE_DEPTH = Gauge("admission_queue_depth", "Havuzda slot bekleyen istek sayısı", ["pool"])
+ADMISSION_REJECTED = Counter(
+    "admission_rejected_total", "429 ile reddedilen istekler", ["pool", "reason"]  # reason: queue_full / timeout
+)
+ADMISSION_WAIT = Histogram(
+    "admission_wait_seconds", "Slot için kuyrukta bekleme süresi", ["pool"],
+    buckets=(0.0, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+
+# --- Threadpool (her /metrics çağrısında güncellenir) ---
+THREADPOOL_BORROWED = Gauge("threadpool_busy_threads", "Starlette threadpool'da meşgul thread sayısı")
+THREADPOOL_WAITING = Gauge("threadpool_waiting_tasks", "Threadpool'da boş thread bekleyen iş sayısı")
+THREADPOOL_CAPACITY = Gauge("threadpool_capacity", "Threadpool kapasitesi")
+
+
+@contextmanager
+def stage_timer(service: str, stage: str):
+    """with stage_timer("ml_service", "fit"): ... bloğunun süresini ölçer."""
+    with STAGE_LATENCY.labels(service, stage).time():
+        yield
+
+
+def record_rows(service: str, rows: int, seconds: float):
+    ROWS_PROCESSED.labels(service).inc(rows)
+    if seconds > 0:
+        ROWS_PER_SECOND.labels(service).set(rows / seconds)
+
+
+def update_threadpool_gauges():
+    # Event loop içinden çağrılmalı (anyio limiter'ı loop'a bağlıdır)
+    from anyio.to_thread import current_default_thread_limiter
+    limiter = current_default_thread_limiter()
+    stats = limiter.statistics()
+    THREADPOOL_BORROWED.set(stats.borrowed_tokens)
+    THREADPOOL_WAITING.set(stats.tasks_waiting)
+    THREADPOOL_CAPACITY.set(stats.total_tokens)
+
+
+def route_label(scope: dict) -> str:
+    """
+    İsteğin eşleştiği route şablonu, include/mount prefix'i dahil (/api/v1/jobs/{job_id}).
+    Kardinalite patlamasın diye gerçek URL yerine şablon kullanılır. Route nesnesi prefix'i
+    her zaman taşımadığı için prefix, isteğin yolundan şablonun doldurulmuş hali çıkarılarak bulunur.
+    """
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    template = getattr(route, "path_format", None) or route.path
+    path = scope.get("path", "")
+    root_path = scope.get("root_path", "")
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    try:
+        concrete = template.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return template
+    if path.endswith(concrete):
+        return path[:len(path) - len(concrete)] + template
+    return template
@@ -1,15 +1,50 @@
-from fastapi import FastAPI
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from app.api.v1.router import api_router
 from app.core.config import settings
+from app.services.job_service import job_manager
+from app.services.tracking_service import tracking_queue
+from app.core.metrics import REQUEST_LATENCY, route_label, update_threadpool_gauges
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Önceki çalışmadan yarım kalan (sahibi ölmüş) eğitim işleri tekrar kuyruğa alınır
+    job_manager.resume_pending()
+    yield
+    # Kapanışta eğitim süreçlerini bırak; bekleyen işler diskte kalır ve sonraki açılışta devam eder
+    job_manager.shutdown()
+    # Kuyrukta bekleyen MLflow kayıtlarını yazmaya çalış (daemon thread süreçle birlikte ölür)
+    tracking_queue.flush(timeout=30)
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    description="Config-Driven ML API"
+    description="Config-Driven ML API",
+    lifespan=lifespan
 )
 
 app.include_router(api_router, prefix="/api/v1")
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Gerçek URL yerine prefix'li route şablonu kullanılır (/api/v1/jobs/{job_id})
+        REQUEST_LATENCY.labels(request.method, route_label(request.scope), str(status)).observe(
+            time.perf_counter() - started)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    update_threadpool_gauges()
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 @app.get("/")
 def root():
     return {"message": "System Online. Go to /docs"}
\ No newline at end of file
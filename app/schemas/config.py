@@ -5,6 +5,8 @@ from typing import List, Literal, Dict, Any, Optional
 class ModelConfig(BaseModel):
     type: Literal["random_forest", "xgboost", "neural_network"]
     params: Dict[str, Any]
+    # Ağaç modelleri için dizi tabanlı hızlı tahmin formatı da üretilip kaydedilir
+    compile_inference: bool = False
 
 # --- 2. Data Processing Config ---
 class DataProcessingConfig(BaseModel):
@@ -17,8 +19,31 @@ class DataProcessingConfig(BaseModel):
     random_state: int = 42
     output_train_path: str = "data/processed_train.csv"
     output_test_path: str = "data/processed_test.csv"
+    # parquet/feather: dtype'lar korunur ve okurken sadece gereken sütunlar yüklenir
+    output_format: Literal["csv", "parquet", "feather"] = "csv"
+    # streaming: dosya tek geçişte parça parça okunur, satırlar hash ile train/test'e atanır
+    streaming: bool = False
+    chunksize: int = 100_000
+    stratify: bool = False
 
 # --- 3. Training Config ---
+class PreprocessingConfig(BaseModel):
+    impute_strategy: Optional[Literal["mean", "median", "most_frequent"]] = None
+    scale_features: bool = False
+    class_imbalance_method: Optional[Literal["smote"]] = None  # Sadece eğitimde uygulanır
+    random_state: int = 42
+
+class SearchConfig(BaseModel):
+    # grid: tüm kombinasyonlar, random: n_iter rastgele aday, halving: successive halving
+    strategy: Literal["grid", "random", "halving"] = "grid"
+    param_grid: Dict[str, List[Any]]
+    n_iter: int = 10
+    cv_folds: int = 5
+    scoring: Literal["accuracy", "precision", "recall", "f1", "roc_auc"] = "f1"
+    halving_factor: int = 3
+    n_jobs: int = -1
+    random_state: int = 42
+
 class ModelTrainingConfig(BaseModel):
     # BURASI DEĞİŞTİ: Alanı geri getirdik ama Optional yaptık
     train_data_path: Optional[str] = None
@@ -28,6 +53,14 @@ class ModelTrainingConfig(BaseModel):
     algorithm_config: ModelConfig
     experiment_name: str
     save_model_path: str = "models/model.pkl"
+    search: Optional[SearchConfig] = None  # Verilirse önce hiperparametre araması yapılır
+    preprocessing: Optional[PreprocessingConfig] = None  # Model ile birlikte kaydedilir
+    # Verilirse bu model yüklenip sadece yeni veriyle eğitilmeye devam edilir (artımlı eğitim).
+    # Bu modda params'taki n_estimators / epochs eklenecek ağaç / tur / epoch sayısıdır.
+    base_model_id: Optional[str] = None
+    # Verilirse model registry'de bu isimle yeni bir versiyon olarak kaydedilir
+    register_as: Optional[str] = None
+    promote: bool = False  # Kaydedilen versiyonu hemen "serving" yap
     
     model_config = ConfigDict(protected_namespaces=())
 
@@ -41,5 +74,13 @@ class ModelTestingConfig(BaseModel):
     target_column: str
     feature_columns: List[str]
     output_report_path: str = "reports/test_results.json"
+    # Hesaplanacak metrikler (config.json'daki evaluation.metrics ile aynı isimler)
+    metrics: List[Literal["accuracy", "precision", "recall", "f1", "f1_score", "roc_auc"]] = [
+        "accuracy", "precision", "recall", "f1_score", "roc_auc"
+    ]
+    chunksize: int = 100_000  # Test verisi bu boyutta parçalarla okunup skorlanır
+    # Registry'deki bir model test edilecekse (model dosyası yüklemeye gerek yok); metrikler metadata'ya yazılır
+    registry_name: Optional[str] = None
+    registry_version: Optional[str] = None  # Boşsa serving versiyonu
     
     model_config = ConfigDict(protected_namespaces=())
\ No newline at end of file
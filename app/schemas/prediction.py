@@ -1,15 +1,22 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, ConfigDict
+from typing import List, Literal, Optional
 
 class PredictionInput(BaseModel):
+    model_id: str  # Eğitimde kullanılan save_model_path (örn: "models/auto_model.pkl") veya registry adı
+    model_type: Literal["random_forest", "xgboost", "neural_network"] = "random_forest"  # Registry'de metadata'dan alınır
+    version: Optional[str] = None  # Boşsa dosyanın son değişme zamanı / registry'de serving versiyonu
     features: List[float]  # Örneğin: [0.5, 1.2, -0.3, ...]
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        protected_namespaces=(),
+        json_schema_extra={
             "example": {
+                "model_id": "models/auto_model.pkl",
+                "model_type": "random_forest",
                 "features": [0.1, 0.5, 1.2, 0.8, -0.5] # Örnek değerler
             }
         }
+    )
 
 class PredictionOutput(BaseModel):
     prediction: float
@@ -19,4 +26,4 @@ class PredictionOutput(BaseModel):
 class TrainOutput(BaseModel):
     message: str
     accuracy: float
-    loss: float
\ No newline at end of file
+    loss: float
@@ -0,0 +1,228 @@
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict, Optional
+from fastapi.concurrency import run_in_threadpool, iterate_in_threadpool
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.core.metrics import ADMISSION_RUNNING, ADMISSION_QUEUE_DEPTH, ADMISSION_REJECTED, ADMISSION_WAIT
+
+
+class AdmissionRejected(Exception):
+    """Kuyruk dolu veya bekleme süresi aşıldı; istemci Retry-After kadar sonra tekrar denemeli."""
+
+    def __init__(self, pool: str, reason: str, retry_after: int):
+        self.pool = pool
+        self.reason = reason
+        self.retry_after = retry_after
+        messages = {"queue_full": "kuyruk dolu", "timeout": "bekleme süresi aşıldı"}
+        super().__init__(f"Sunucu yoğun ({pool}: {messages.get(reason, reason)}), "
+                         f"{retry_after} saniye sonra tekrar deneyin.")
+
+
+class _Pool:
+    def __init__(self, name: str, priority: int, max_concurrency: int, max_queue: int,
+                 max_wait_s: float, reserved: int = 0):
+        self.name = name
+        self.priority = priority
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait = max_wait_s
+        self.reserved = reserved
+        self.running = 0
+        self.waiters: "deque[asyncio.Future]" = deque()
+        self.admitted = 0
+        self.rejected = 0
+        self.timeouts = 0
+        # Retry-After tahmini için işlerin ortalama süresi (EWMA)
+        self.avg_service_s = 1.0
+        self.avg_wait_s = 0.0
+
+    def retry_after(self) -> int:
+        rounds = math.ceil((len(self.waiters) + 1) / max(self.max_concurrency, 1))
+        return int(min(max(math.ceil(rounds * self.avg_service_s), 1), 600))
+
+
+class AdmissionController:
+    """
+    Ağır uçlar için öncelikli kabul kontrolü. Her havuzun (inference, data, training ...)
+    kendi eşzamanlılık sınırı ve kuyruğu vardır; tüm havuzlar toplam max_concurrency slotu
+    paylaşır. Slot boşaldığında en yüksek öncelikli (küçük sayı) bekleyen iş başlar ve
+    daha düşük öncelikli havuzlar, yüksek öncelikli havuzların 'reserved' slotlarına
+    dokunamaz; eğitim patlaması tahminleri aç bırakmaz. Kuyruk dolunca veya bekleme
+    max_wait_s'i aşınca AdmissionRejected (HTTP 429 + Retry-After) fırlatılır.
+
+    Tüm durum event loop'ta tutulur (kilit gerekmez). Ağır uçlar (yükleme, veri, eğitim,
+    test, tahmin) Starlette threadpool'unu sadece slot alarak kullanır; bu işlerin tuttuğu
+    thread sayısı max_concurrency ile sınırlıdır ve hafif uçlara (health, istatistikler,
+    registry okuma) her zaman thread kalır.
+    """
+
+    def __init__(self, max_concurrency: int = settings.ADMISSION_MAX_CONCURRENCY,
+                 pools: Optional[Dict[str, dict]] = None, enabled: bool = settings.ADMISSION_CONTROL_ENABLED):
+        self.max_concurrency = max_concurrency
+        self.enabled = enabled
+        self.running = 0
+        pools = settings.ADMISSION_POOLS if pools is None else pools
+        self.pools = {name: _Pool(name, **config) for name, config in pools.items()}
+        # Dağıtım sırası: öncelik, sonra isim (deterministik)
+        self._order = sorted(self.pools.values(), key=lambda p: (p.priority, p.name))
+
+    def _pool(self, name: str) -> _Pool:
+        try:
+            return self.pools[name]
+        except KeyError:
+            raise ValueError(f"Tanımsız kabul havuzu: '{name}'. Tanımlı: {list(self.pools)}")
+
+    def _can_start(self, pool: _Pool) -> bool:
+        if pool.running >= pool.max_concurrency:
+            return False
+        # Daha yüksek öncelikli havuzların kullanmadığı ayrılmış slotlar boş bırakılır
+        held_back = sum(max(p.reserved - p.running, 0) for p in self._order if p.priority < pool.priority)
+        return self.running + held_back < self.max_concurrency
+
+    def _start(self, pool: _Pool):
+        pool.running += 1
+        pool.admitted += 1
+        self.running += 1
+        ADMISSION_RUNNING.labels(pool.name).set(pool.running)
+
+    def _dispatch(self):
+        for pool in self._order:
+            while pool.waiters and self._can_start(pool):
+                future = pool.waiters.popleft()
+                if future.done():
+                    continue  # Vazgeçmiş istek (iptal / zaman aşımı)
+                self._start(pool)
+                future.set_result(None)
+            ADMISSION_QUEUE_DEPTH.labels(pool.name).set(len(pool.waiters))
+
+    def _reject(self, pool: _Pool, reason: str) -> AdmissionRejected:
+        if reason == "timeout":
+            pool.timeouts += 1
+        else:
+            pool.rejected += 1
+        ADMISSION_REJECTED.labels(pool.name, reason).inc()
+        error = AdmissionRejected(pool.name, reason, pool.retry_after())
+        logger.warning(f"İstek reddedildi: {error}")
+        return error
+
+    async def acquire(self, name: str):
+        pool = self._pool(name)
+        if not self.enabled:
+            pool.running += 1
+            self.running += 1
+            return
+        if not pool.waiters and self._can_start(pool):
+            self._start(pool)
+            ADMISSION_WAIT.labels(pool.name).observe(0.0)
+            return
+        if len(pool.waiters) >= pool.max_queue:
+            raise self._reject(pool, "queue_full")
+
+        future = asyncio.get_running_loop().create_future()
+        pool.waiters.append(future)
+        ADMISSION_QUEUE_DEPTH.labels(pool.name).set(len(pool.waiters))
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(future, pool.max_wait)
+        except asyncio.TimeoutError:
+            self._forget(pool, future)
+            raise self._reject(pool, "timeout")
+        except asyncio.CancelledError:
+            # İstemci bağlantıyı kesti; slot tam bu sırada verildiyse geri bırak
+            if future.done() and not future.cancelled():
+                self.release(name)
+            else:
+                self._forget(pool, future)
+            raise
+        waited = time.perf_counter() - started
+        pool.avg_wait_s = 0.9 * pool.avg_wait_s + 0.1 * waited
+        ADMISSION_WAIT.labels(pool.name).observe(waited)
+
+    def _forget(self, pool: _Pool, future: asyncio.Future):
+        try:
+            pool.waiters.remove(future)
+        except ValueError:
+            pass
+        ADMISSION_QUEUE_DEPTH.labels(pool.name).set(len(pool.waiters))
+
+    def release(self, name: str, service_s: Optional[float] = None):
+        pool = self._pool(name)
+        pool.running -= 1
+        self.running -= 1
+        if service_s is not None:
+            pool.avg_service_s = 0.8 * pool.avg_service_s + 0.2 * service_s
+        ADMISSION_RUNNING.labels(pool.name).set(pool.running)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, name: str):
+        await self.acquire(name)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(name, time.perf_counter() - started)
+
+    async def run(self, name: str, func: Callable, *args, **kwargs):
+        """func'ı havuzdan slot alarak threadpool'da çalıştırır."""
+        async with self.slot(name):
+            return await run_in_threadpool(func, *args, **kwargs)
+
+    async def hold(self, name: str) -> Callable[[], Awaitable[None]]:
+        """
+        Handler'dan uzun yaşayan işler (StreamingResponse) için slot alır ve tek seferlik
+        bırakma fonksiyonunu döner. Hem gövde bitince hem de yanıtın background task'ı
+        olarak çağrılmalı; gövde hiç başlamadan bağlantı kesilse de slot sızmaz.
+        """
+        await self.acquire(name)
+        started = time.perf_counter()
+        released = False
+
+        async def release():
+            nonlocal released
+            if not released:
+                released = True
+                self.release(name, time.perf_counter() - started)
+        return release
+
+    @staticmethod
+    async def stream(iterator, release: Callable[[], Awaitable[None]]):
+        """Senkron iteratörü threadpool'da tüketir; bitince veya iptal edilince slotu bırakır."""
+        try:
+            async for chunk in iterate_in_threadpool(iterator):
+                yield chunk
+        finally:
+            await release()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "max_concurrency": self.max_concurrency,
+            "running": self.running,
+            "pools": {
+                pool.name: {
+                    "priority": pool.priority,
+                    "running": pool.running,
+                    "queued": len(pool.waiters),
+                    "max_concurrency": pool.max_concurrency,
+                    "reserved": pool.reserved,
+                    "max_queue": pool.max_queue,
+                    "max_wait_s": pool.max_wait,
+                    "admitted": pool.admitted,
+                    "rejected": pool.rejected,
+                    "timeouts": pool.timeouts,
+                    "avg_wait_ms": round(pool.avg_wait_s * 1000, 2),
+                    "avg_service_ms": round(pool.avg_service_s * 1000, 2),
+                    "retry_after_s": pool.retry_after(),
+                }
+                for pool in self._order
+            },
+        }
+
+
+# Global kabul kontrolü (süreç başına; çok worker'lı kurulumda sınırlar worker başınadır)
+admission = AdmissionController()
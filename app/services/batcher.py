@@ -0,0 +1,78 @@
+import asyncio
+from typing import Any, Callable, Dict, List, Tuple
+import numpy as np
+from app.core.config import settings
+from app.services.admission import admission
+from app.core.logging_config import logger
+from app.core.metrics import PREDICT_BATCH_SIZE
+
+
+class _PendingBatch:
+    def __init__(self):
+        self.rows: List[np.ndarray] = []
+        self.futures: List[asyncio.Future] = []
+        self.timer: asyncio.TimerHandle = None
+
+
+class MicroBatcher:
+    """
+    Eşzamanlı tek satırlık tahmin isteklerini toplayıp tek bir vektörel
+    predict çağrısına dönüştürür. Batch, max_batch_size'a ulaşınca veya
+    ilk isteğin üzerinden max_wait_ms geçince çalıştırılır.
+    """
+
+    def __init__(self, max_batch_size: int = settings.PREDICT_BATCH_MAX_SIZE,
+                 max_wait_ms: float = settings.PREDICT_BATCH_MAX_WAIT_MS):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._pending: Dict[Any, _PendingBatch] = {}
+
+    async def submit(self, key: Any, fn: Callable[[np.ndarray], Tuple], row: np.ndarray):
+        """
+        key: aynı modeli paylaşan istekleri gruplar.
+        fn: (n, d) matrisini alıp satır bazında sonuç dizileri döndüren fonksiyon.
+        Çağırana kendi satırının sonucu (tuple) döner.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = _PendingBatch()
+            self._pending[key] = batch
+            batch.timer = loop.call_later(self.max_wait, self._flush, key, fn)
+        batch.rows.append(row)
+        batch.futures.append(future)
+
+        if len(batch.rows) >= self.max_batch_size:
+            batch.timer.cancel()
+            self._flush(key, fn)
+
+        return await future
+
+    def _flush(self, key: Any, fn: Callable):
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        asyncio.ensure_future(self._run(batch, fn))
+
+    async def _run(self, batch: _PendingBatch, fn: Callable):
+        try:
+            X = np.vstack(batch.rows)
+            PREDICT_BATCH_SIZE.observe(len(batch.rows))
+            # Her batch tek bir inference slotu kullanır; aşırı yükte 429 tüm batch'e döner
+            results = await admission.run("inference", fn, X)
+        except Exception as e:
+            logger.error(f"Batch tahmin hatası ({len(batch.rows)} satır): {str(e)}")
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for i, future in enumerate(batch.futures):
+            if not future.done():
+                future.set_result(tuple(column[i] for column in results))
+
+
+# Global batcher nesnesi
+micro_batcher = MicroBatcher()
@@ -0,0 +1,292 @@
+import json
+import numpy as np
+
+# Büyük matrisler parça parça gezilir; (satır x ağaç) düğüm dizileri belleği şişirmesin
+CHUNK_ROWS = 4096
+
+
+def _chunked(predict_proba, X) -> np.ndarray:
+    if len(X) <= CHUNK_ROWS:
+        return predict_proba(X)
+    return np.concatenate([predict_proba(X[i:i + CHUNK_ROWS]) for i in range(0, len(X), CHUNK_ROWS)])
+
+
+def _input_info(model) -> dict:
+    # Paylaşımlı modda sklearn/xgboost nesnesi yüklenmez; girdi şeması dizilerle birlikte saklanır
+    info = {}
+    if getattr(model, "n_features_in_", None) is not None:
+        info["n_features_in_"] = np.asarray(model.n_features_in_)
+    if getattr(model, "feature_names_in_", None) is not None:
+        info["feature_names_in_"] = np.asarray(model.feature_names_in_, dtype=str)
+    return info
+
+
+class CompiledForest:
+    """
+    Eğitilmiş bir sklearn RandomForest'ın düzleştirilmiş, dizi tabanlı hali.
+    Tüm ağaçların düğümleri tek bir dizide birleştirilir; tahmin, satırlar x ağaçlar
+    üzerinde derinlik kadar adımda vektörel olarak yapılır. sklearn'ün her çağrıdaki
+    doğrulama ve joblib thread maliyeti olmadığı için tek satır / küçük batch'lerde hızlıdır.
+    """
+
+    def __init__(self, feature, threshold, left, right, missing_left, leaf_proba, roots, max_depth, classes,
+                 n_features_in_=None, feature_names_in_=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.leaf_proba = leaf_proba
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.classes_ = classes
+        self.n_features_in_ = None if n_features_in_ is None else int(n_features_in_)
+        self.feature_names_in_ = feature_names_in_
+
+    @classmethod
+    def from_sklearn(cls, forest) -> "CompiledForest":
+        features, thresholds, lefts, rights, missing, probas, roots = [], [], [], [], [], [], []
+        offset, max_depth = 0, 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n = tree.node_count
+            is_leaf = tree.children_left == -1
+            node_ids = np.arange(n)
+            # Yapraklar kendine döner; böylece sabit sayıda adımla tüm satırlar yaprağa ulaşır
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            missing.append(getattr(tree, "missing_go_to_left", np.zeros(n, dtype=np.uint8)).astype(bool))
+            values = tree.value[:, 0, :]
+            probas.append(values / values.sum(axis=1, keepdims=True))
+            roots.append(offset)
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts).astype(np.intp),
+            right=np.concatenate(rights).astype(np.intp),
+            missing_left=np.concatenate(missing),
+            leaf_proba=np.concatenate(probas),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max_depth,
+            classes=np.asarray(forest.classes_),
+            **_input_info(forest),
+        )
+
+    def predict_proba(self, X) -> np.ndarray:
+        # sklearn ağaçları girdiyi float32'ye çevirip float64 eşiklerle karşılaştırır; aynısı yapılır
+        return _chunked(self._predict_proba, np.asarray(X, dtype=np.float32))
+
+    def _predict_proba(self, X) -> np.ndarray:
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], len(self.roots)))
+        for _ in range(self.max_depth):
+            values = X[rows, self.feature[nodes]]
+            go_left = (values <= self.threshold[nodes]) | (np.isnan(values) & self.missing_left[nodes])
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return self.leaf_proba[nodes].mean(axis=1)
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def arrays(self) -> dict:
+        arrays = dict(feature=self.feature, threshold=self.threshold, left=self.left,
+                      right=self.right, missing_left=self.missing_left, leaf_proba=self.leaf_proba,
+                      roots=self.roots, max_depth=np.asarray(self.max_depth), classes=self.classes_)
+        if self.n_features_in_ is not None:
+            arrays["n_features_in_"] = np.asarray(self.n_features_in_)
+        if self.feature_names_in_ is not None:
+            arrays["feature_names_in_"] = np.asarray(self.feature_names_in_, dtype=str)
+        return arrays
+
+    def save(self, path: str):
+        # np.savez: sıkıştırmasız, yüklerken doğrudan dizi olarak açılır
+        with open(path, "wb") as f:
+            np.savez(f, **self.arrays())
+
+    @staticmethod
+    def files(path: str) -> list:
+        """save(path)'in yazdığı dosyalar."""
+        return [path]
+
+    @classmethod
+    def load(cls, path: str) -> "CompiledForest":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(**{key: data[key] for key in data.files})
+
+
+class CompiledBooster:
+    """
+    XGBClassifier sarmalayıcısı yerine ham Booster üzerinde inplace_predict kullanır;
+    DMatrix oluşturma ve sklearn katmanı atlanır.
+    """
+
+    def __init__(self, booster, classes):
+        self.booster = booster
+        self.classes_ = np.asarray(classes)
+
+    @classmethod
+    def from_xgboost(cls, model) -> "CompiledBooster":
+        return cls(model.get_booster(), getattr(model, "classes_", [0, 1]))
+
+    def predict_proba(self, X) -> np.ndarray:
+        proba = self.booster.inplace_predict(np.asarray(X, dtype=np.float32), validate_features=False)
+        if proba.ndim == 1:
+            return np.column_stack([1.0 - proba, proba])
+        return proba
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def save(self, path: str):
+        # UBJSON: JSON'dan daha küçük ve daha hızlı yüklenir
+        self.booster.save_model(path)
+        np.save(path + ".classes.npy", self.classes_, allow_pickle=False)
+
+    @staticmethod
+    def files(path: str) -> list:
+        """save(path)'in yazdığı dosyalar (booster + sınıflar)."""
+        return [path, path + ".classes.npy"]
+
+    @classmethod
+    def load(cls, path: str) -> "CompiledBooster":
+        import xgboost as xgb
+        booster = xgb.Booster()
+        booster.load_model(path)
+        return cls(booster, np.load(path + ".classes.npy", allow_pickle=False))
+
+
+class ArrayBooster:
+    """
+    XGBoost (gbtree) ağaçlarının CompiledForest ile aynı düzende düzleştirilmiş hali.
+    Yapraklar olasılık değil margin taşır: satırın margin'i grubundaki (sınıf) ağaçların
+    yaprak toplamı + base margin'dir, olasılık sigmoid/softmax ile hesaplanır. Diziler
+    .npy olarak diske yazılıp memory-map ile açılabildiği için birden çok worker aynı
+    modeli kopyalamadan paylaşır (Booster ise her süreçte kendi C++ belleğine yüklenir).
+    """
+
+    def __init__(self, feature, threshold, left, right, missing_left, leaf_value, roots, tree_group,
+                 base_margin, max_depth, classes, n_features_in_=None, feature_names_in_=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.leaf_value = leaf_value
+        self.roots = roots
+        self.tree_group = tree_group
+        self.base_margin = base_margin
+        self.max_depth = int(max_depth)
+        self.classes_ = classes
+        self.n_features_in_ = None if n_features_in_ is None else int(n_features_in_)
+        self.feature_names_in_ = feature_names_in_
+
+    @classmethod
+    def from_xgboost(cls, model) -> "ArrayBooster":
+        booster = model.get_booster()
+        learner = json.loads(booster.save_raw("json"))["learner"]
+        objective = learner["objective"]["name"]
+        gbm = learner["gradient_booster"]
+        if gbm["name"] != "gbtree" or objective not in ("binary:logistic", "multi:softprob", "multi:softmax"):
+            raise ValueError(f"Dizi tabanlı XGBoost sadece gbtree + sınıflandırmayı destekler "
+                             f"(booster={gbm['name']}, objective={objective}).")
+
+        features, thresholds, lefts, rights, missing, leaves, roots = [], [], [], [], [], [], []
+        offset, max_depth = 0, 0
+        for tree in gbm["model"]["trees"]:
+            if any(tree["split_type"]):
+                raise ValueError("Kategorik split içeren XGBoost modelleri dizi tabanlı servis edilemez.")
+            left = np.asarray(tree["left_children"], dtype=np.intp)
+            right = np.asarray(tree["right_children"], dtype=np.intp)
+            n = len(left)
+            is_leaf = left == -1
+            node_ids = np.arange(n)
+            conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+            lefts.append(np.where(is_leaf, node_ids, left) + offset)
+            rights.append(np.where(is_leaf, node_ids, right) + offset)
+            features.append(np.where(is_leaf, 0, tree["split_indices"]))
+            thresholds.append(conditions)
+            missing.append(np.asarray(tree["default_left"], dtype=bool))
+            # Yaprakta split_conditions yaprak değeridir (learning rate uygulanmış)
+            leaves.append(np.where(is_leaf, conditions, 0.0).astype(np.float32))
+            roots.append(offset)
+            offset += n
+            max_depth = max(max_depth, _tree_depth(left, right))
+
+        n_groups = max(int(learner["learner_model_param"].get("num_class", "0")), 1)
+        forest = cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts).astype(np.intp),
+            right=np.concatenate(rights).astype(np.intp),
+            missing_left=np.concatenate(missing),
+            leaf_value=np.concatenate(leaves),
+            roots=np.asarray(roots, dtype=np.intp),
+            tree_group=np.asarray(gbm["model"]["tree_info"], dtype=np.intp),
+            base_margin=np.zeros(n_groups, dtype=np.float64),
+            max_depth=max_depth,
+            classes=np.asarray(getattr(model, "classes_", [0, 1])),
+            **_input_info(model),
+        )
+        # base_score'un margin karşılığı sürüme göre farklı saklanıyor; Booster'ın kendi
+        # çıktısından geri hesaplamak tüm sürümlerde doğru sonucu verir
+        x0 = np.zeros((1, int(learner["learner_model_param"]["num_feature"])), dtype=np.float32)
+        reference = booster.inplace_predict(x0, predict_type="margin", validate_features=False)
+        forest.base_margin = np.asarray(reference, dtype=np.float64).reshape(-1) - forest._margin(x0)[0]
+        return forest
+
+    def _margin(self, X) -> np.ndarray:
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], len(self.roots)))
+        for _ in range(self.max_depth):
+            values = X[rows, self.feature[nodes]]
+            # XGBoost float32 karşılaştırır ve eşitlikte sağa gider
+            go_left = (values < self.threshold[nodes]) | (np.isnan(values) & self.missing_left[nodes])
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        leaves = self.leaf_value[nodes].astype(np.float64)
+        if len(self.base_margin) == 1:
+            return leaves.sum(axis=1, keepdims=True) + self.base_margin
+        margin = np.zeros((X.shape[0], len(self.base_margin)))
+        for group in range(len(self.base_margin)):
+            margin[:, group] = leaves[:, self.tree_group == group].sum(axis=1)
+        return margin + self.base_margin
+
+    def _predict_proba(self, X) -> np.ndarray:
+        margin = self._margin(X)
+        if margin.shape[1] == 1:
+            proba = 1.0 / (1.0 + np.exp(-margin[:, 0]))
+            return np.column_stack([1.0 - proba, proba])
+        exp = np.exp(margin - margin.max(axis=1, keepdims=True))
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def predict_proba(self, X) -> np.ndarray:
+        return _chunked(self._predict_proba, np.asarray(X, dtype=np.float32))
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def arrays(self) -> dict:
+        arrays = dict(feature=self.feature, threshold=self.threshold, left=self.left, right=self.right,
+                      missing_left=self.missing_left, leaf_value=self.leaf_value, roots=self.roots,
+                      tree_group=self.tree_group, base_margin=self.base_margin,
+                      max_depth=np.asarray(self.max_depth), classes=self.classes_)
+        if self.n_features_in_ is not None:
+            arrays["n_features_in_"] = np.asarray(self.n_features_in_)
+        if self.feature_names_in_ is not None:
+            arrays["feature_names_in_"] = np.asarray(self.feature_names_in_, dtype=str)
+        return arrays
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    # Kökten başlayıp seviye seviye iner; yaprak -1 çocuk taşır
+    depth, level = 0, np.array([0])
+    while True:
+        children = np.concatenate([left[level], right[level]])
+        level = children[children >= 0]
+        if len(level) == 0:
+            return depth
+        depth += 1
@@ -1,12 +1,19 @@
+import hashlib
+import numpy as np
 import pandas as pd
 import os
-from sklearn.model_selection import train_test_split
+import time
 from app.schemas.config import DataProcessingConfig
 from app.core.logging_config import logger  # <-- Logger eklendi
+from app.services.dataset_io import (
+    read_table, write_table, with_format_extension, read_columns, iter_table_chunks, ChunkedTableWriter
+)
+from app.core.metrics import stage_timer, record_rows
 
 class DataService:
     def process_data(self, config: DataProcessingConfig):
         logger.info(f"Veri işleme süreci başladı: {config.raw_data_path}")
+        started = time.perf_counter()
         
         # 1. Dosya Kontrolü
         if not os.path.exists(config.raw_data_path):
@@ -14,29 +21,18 @@ class DataService:
             logger.error(error_msg)
             raise FileNotFoundError(error_msg)
         
-        if config.raw_data_path.endswith('.csv'):
-            df = pd.read_csv(config.raw_data_path)
-        elif config.raw_data_path.endswith(('.xls', '.xlsx')):
-            df = pd.read_excel(config.raw_data_path)
-        else:
-            raise ValueError("Geçersiz dosya formatı. Lütfen .csv veya .xlsx dosyası kullanın.")
+        if config.streaming:
+            if config.raw_data_path.endswith((".xls", ".xlsx")):
+                # Excel parça parça okunamaz; normal akışa düşülür
+                logger.warning("Excel dosyası streaming modda işlenemez, tüm dosya belleğe okunacak.")
+            else:
+                return self._process_streaming(config, started)
+        
+        with stage_timer("data_service", "parse"):
+            df = read_table(config.raw_data_path)
         
         # 2. Güvenlik Kontrolleri
-        missing_features = [col for col in config.feature_columns if col not in df.columns]
-        if missing_features:
-            error_msg = f"Şu sütunlar CSV'de yok: {missing_features}"
-            logger.error(error_msg)
-            raise ValueError(error_msg)
-
-        if config.target_column not in df.columns:
-            error_msg = f"Hedef sütun '{config.target_column}' CSV dosyasında yok!"
-            logger.error(error_msg)
-            raise ValueError(error_msg)
-
-        # Target yanlışlıkla feature listesindeyse çıkar
-        if config.target_column in config.feature_columns:
-            logger.warning(f"Target '{config.target_column}' feature listesinden çıkarılıyor.")
-            config.feature_columns = [col for col in config.feature_columns if col != config.target_column]
+        self._validate_columns(config, df.columns)
 
         # 3. Temizlik
         df = df.dropna(subset=[config.target_column])
@@ -46,30 +42,158 @@ class DataService:
             raise ValueError(error_msg)
 
         # 4. Seçim ve Bölme
+        from sklearn.model_selection import train_test_split  # API açılışını yavaşlatmasın
         X = df[config.feature_columns]
         y = df[config.target_column]
         
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, 
-            test_size=config.test_size, 
-            random_state=config.random_state
-        )
+        with stage_timer("data_service", "split"):
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y, 
+                test_size=config.test_size, 
+                random_state=config.random_state
+            )
         
         # 5. Kaydetme
         train_df = pd.concat([X_train, y_train], axis=1)
         test_df = pd.concat([X_test, y_test], axis=1)
         
-        os.makedirs(os.path.dirname(config.output_train_path), exist_ok=True)
-        os.makedirs(os.path.dirname(config.output_test_path), exist_ok=True)
+        config.output_train_path = with_format_extension(config.output_train_path, config.output_format)
+        config.output_test_path = with_format_extension(config.output_test_path, config.output_format)
         
-        train_df.to_csv(config.output_train_path, index=False)
-        test_df.to_csv(config.output_test_path, index=False)
+        with stage_timer("data_service", "save"):
+            write_table(train_df, config.output_train_path)
+            write_table(test_df, config.output_test_path)
         
+        record_rows("data_service", len(df), time.perf_counter() - started)
         logger.info(f"Veri işleme tamamlandı. Train: {len(train_df)} satır, Test: {len(test_df)} satır.")
         
         return {
             "status": "Data Processed",
             "train_rows": len(train_df),
             "test_rows": len(test_df),
-            "train_path": config.output_train_path
-        }
\ No newline at end of file
+            "train_path": config.output_train_path,
+            "test_path": config.output_test_path
+        }
+
+    def _validate_columns(self, config: DataProcessingConfig, columns):
+        missing_features = [col for col in config.feature_columns if col not in columns]
+        if missing_features:
+            error_msg = f"Şu sütunlar CSV'de yok: {missing_features}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        if config.target_column not in columns:
+            error_msg = f"Hedef sütun '{config.target_column}' CSV dosyasında yok!"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        # Target yanlışlıkla feature listesindeyse çıkar
+        if config.target_column in config.feature_columns:
+            logger.warning(f"Target '{config.target_column}' feature listesinden çıkarılıyor.")
+            config.feature_columns = [col for col in config.feature_columns if col != config.target_column]
+
+    # --- Streaming (out-of-core) mod ---
+    def _process_streaming(self, config: DataProcessingConfig, started: float):
+        """
+        Dosyayı tek geçişte chunksize'lık parçalarla okur ve her parçayı doğrudan
+        train/test dosyalarına yazar; bellek kullanımı dosya boyutundan bağımsızdır.
+        Satır ataması, dosyadaki satır numarası ve random_state'in hash'i ile yapılır;
+        bu yüzden sonuç chunksize'dan bağımsız ve tekrarlanabilirdir.
+        """
+        self._validate_columns(config, read_columns(config.raw_data_path))
+        columns = config.feature_columns + [config.target_column]
+
+        config.output_train_path = with_format_extension(config.output_train_path, config.output_format)
+        config.output_test_path = with_format_extension(config.output_test_path, config.output_format)
+
+        splitter = _StreamingSplitter(config.test_size, config.random_state, config.stratify)
+        row_offset = 0
+        with ChunkedTableWriter(config.output_train_path) as train_writer, \
+                ChunkedTableWriter(config.output_test_path) as test_writer:
+            for chunk in iter_table_chunks(config.raw_data_path, config.raw_data_path, columns, config.chunksize):
+                row_ids = np.arange(row_offset, row_offset + len(chunk), dtype=np.uint64)
+                row_offset += len(chunk)
+
+                keep = chunk[config.target_column].notna().to_numpy()
+                chunk, row_ids = chunk[keep], row_ids[keep]
+                if len(chunk) == 0:
+                    continue
+                chunk = _float_integer_features(chunk, config.feature_columns)[columns]
+
+                is_test = splitter.assign(row_ids, chunk[config.target_column].to_numpy())
+                with stage_timer("data_service", "save"):
+                    train_writer.write(chunk[~is_test])
+                    test_writer.write(chunk[is_test])
+
+        train_rows, test_rows = train_writer.rows, test_writer.rows
+        if train_rows + test_rows == 0:
+            error_msg = "Temizlik sonrası veri kalmadı! Hedef sütun tamamen boş."
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        record_rows("data_service", row_offset, time.perf_counter() - started)
+        logger.info(f"Streaming veri işleme tamamlandı. Train: {train_rows} satır, Test: {test_rows} satır.")
+
+        return {
+            "status": "Data Processed",
+            "train_rows": train_rows,
+            "test_rows": test_rows,
+            "train_path": config.output_train_path,
+            "test_path": config.output_test_path
+        }
+
+
+def _float_integer_features(chunk: pd.DataFrame, feature_columns) -> pd.DataFrame:
+    # Bir parçada boş değer olmayan tamsayı sütun sonraki parçada float olabilir;
+    # dosya şeması parçalar arasında sabit kalsın diye tamsayı özellikler float64'e çekilir.
+    int_cols = [col for col in feature_columns if chunk[col].dtype.kind in "iub"]
+    if int_cols:
+        chunk = chunk.astype({col: np.float64 for col in int_cols})
+    return chunk
+
+
+def _uniform_hash(values: np.ndarray, seed: int) -> np.ndarray:
+    """splitmix64: (değer, seed) -> [0, 1) aralığında deterministik sayı (vektörel)."""
+    with np.errstate(over="ignore"):
+        z = values.astype(np.uint64) + np.uint64(seed) * np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z = z ^ (z >> np.uint64(31))
+    return (z >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+class _StreamingSplitter:
+    """
+    Satırları tek geçişte train/test'e atar.
+    stratify=False: satır numarasının hash'i test_size'dan küçükse test.
+    stratify=True : her sınıf içinde rastgele başlangıçlı sistematik örnekleme; her
+                    sınıfın test oranı, veri sırasından bağımsız olarak test_size'a eşit kalır.
+    """
+
+    def __init__(self, test_size: float, random_state: int, stratify: bool):
+        self.test_size = test_size
+        self.random_state = random_state
+        self.stratify = stratify
+        self._class_counts: dict = {}
+        self._class_offsets: dict = {}
+
+    def _offset(self, label) -> float:
+        if label not in self._class_offsets:
+            digest = hashlib.sha256(f"{self.random_state}:{label}".encode()).digest()
+            self._class_offsets[label] = int.from_bytes(digest[:8], "little") / 2.0 ** 64
+        return self._class_offsets[label]
+
+    def assign(self, row_ids: np.ndarray, labels: np.ndarray) -> np.ndarray:
+        if not self.stratify:
+            return _uniform_hash(row_ids, self.random_state) < self.test_size
+
+        is_test = np.zeros(len(labels), dtype=bool)
+        for label in pd.unique(labels):
+            mask = labels == label
+            start = self._class_counts.get(label, 0)
+            k = np.arange(start, start + mask.sum(), dtype=np.float64)
+            u = self._offset(label)
+            # k. örnek, floor((k+1)*p + u) bir artıyorsa teste gider
+            is_test[mask] = np.floor((k + 1) * self.test_size + u) > np.floor(k * self.test_size + u)
+            self._class_counts[label] = start + int(mask.sum())
+        return is_test
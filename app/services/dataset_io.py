@@ -0,0 +1,172 @@
+import os
+from typing import Iterator, List, Optional
+import pandas as pd
+
+# Desteklenen tablo formatları ve uzantıları
+FORMAT_EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
+MEDIA_TYPES = {
+    ".csv": "text/csv",
+    ".parquet": "application/vnd.apache.parquet",
+    ".feather": "application/vnd.apache.arrow.file",
+}
+
+# Okunabilen (yüklenebilen) dosya uzantıları
+READABLE_EXTENSIONS = (".csv", ".xlsx", ".xls", ".parquet", ".feather")
+
+
+class UnsupportedFormatError(ValueError):
+    """Dosya uzantısı okunabilen formatlardan biri değil."""
+
+    def __init__(self, filename: str):
+        super().__init__(f"Geçersiz dosya formatı: '{filename}'. "
+                         "Lütfen .csv, .xlsx, .parquet veya .feather dosyası kullanın.")
+
+
+def check_readable(filename: str):
+    """Dosya okunmadan (ör. yükleme başlamadan) uzantıyı doğrular."""
+    if not (filename or "").lower().endswith(READABLE_EXTENSIONS):
+        raise UnsupportedFormatError(filename)
+
+
+def with_format_extension(path: str, output_format: str) -> str:
+    """Yolun uzantısını seçilen formata göre düzeltir (data/train.csv -> data/train.parquet)."""
+    ext = FORMAT_EXTENSIONS[output_format]
+    root, current_ext = os.path.splitext(path)
+    if current_ext in FORMAT_EXTENSIONS.values() and current_ext != ext:
+        return root + ext
+    return path if current_ext else path + ext
+
+
+def read_table(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Dosyayı uzantısına göre okur. columns verilirse sadece o sütunlar okunur;
+    Parquet/Feather'da bu gerçek bir sütun projeksiyonudur, diğer sütunlar diskten hiç okunmaz.
+    """
+    if path.endswith(".csv"):
+        return pd.read_csv(path, usecols=columns)
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path, columns=columns, engine="pyarrow", memory_map=True)
+    if path.endswith(".feather"):
+        import pyarrow.feather as feather
+        # Feather (Arrow IPC) sıkıştırmasızsa memory-map ile kopyasız açılır
+        return feather.read_table(path, columns=columns, memory_map=True).to_pandas()
+    if path.endswith((".xls", ".xlsx")):
+        return pd.read_excel(path, usecols=columns)
+    raise UnsupportedFormatError(path)
+
+
+def read_columns(path: str) -> List[str]:
+    """Veriyi yüklemeden sadece sütun isimlerini döner."""
+    if path.endswith(".csv"):
+        return list(pd.read_csv(path, nrows=0).columns)
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        return list(pq.read_schema(path).names)
+    if path.endswith(".feather"):
+        import pyarrow.feather as feather
+        return list(feather.read_table(path, memory_map=True).schema.names)
+    if path.endswith((".xls", ".xlsx")):
+        return list(pd.read_excel(path, nrows=1).columns)
+    raise UnsupportedFormatError(path)
+
+
+def write_table(df: pd.DataFrame, path: str):
+    """DataFrame'i uzantısına göre yazar; Parquet/Feather dtype'ları korur."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if path.endswith(".csv"):
+        df.to_csv(path, index=False)
+    elif path.endswith(".parquet"):
+        df.to_parquet(path, index=False, engine="pyarrow")
+    elif path.endswith(".feather"):
+        # Sıkıştırmasız yazılır ki okurken memory-map kullanılabilsin
+        df.reset_index(drop=True).to_feather(path, compression="uncompressed")
+    else:
+        raise ValueError(f"Desteklenmeyen çıktı formatı: {path}")
+
+
+def iter_table_chunks(source, filename: str, columns: Optional[List[str]] = None,
+                      chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+    """
+    Dosyayı (yol veya açık dosya nesnesi) en fazla chunksize satırlık parçalar halinde okur.
+    Bellek kullanımı dosya boyutundan bağımsızdır. filename sadece formatı belirlemek için kullanılır.
+    """
+    if filename.endswith(".csv"):
+        yield from pd.read_csv(source, usecols=columns, chunksize=chunksize)
+    elif filename.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        for record_batch in pq.ParquetFile(source).iter_batches(batch_size=chunksize, columns=columns):
+            yield record_batch.to_pandas()
+    elif filename.endswith(".feather"):
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+        source = pa.memory_map(source) if isinstance(source, str) else source
+        reader = ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if columns is not None:
+                batch = batch.select(columns)
+            for start in range(0, batch.num_rows, chunksize):
+                yield batch.slice(start, chunksize).to_pandas()
+    else:
+        raise ValueError("Parça parça okuma için .csv, .parquet veya .feather dosyası kullanın.")
+
+
+class ChunkedTableWriter:
+    """
+    Parçaları sırayla aynı dosyaya ekler (CSV, Parquet veya Feather).
+    İlk dolu parçanın şeması referans alınır; sonraki parçalar ona dönüştürülür.
+    Boş parçalar atlanır; hiç dolu parça gelmezse close() boş şemayla boş bir dosya yazar.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows = 0
+        self._writer = None
+        self._schema = None
+        self._empty = None
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if path.endswith(".csv") and os.path.exists(path):
+            os.remove(path)
+
+    def write(self, df: pd.DataFrame):
+        if df.empty:
+            if self._empty is None:
+                self._empty = df.head(0)
+            return
+        self._write(df)
+        self.rows += len(df)
+
+    def _write(self, df: pd.DataFrame):
+        if self.path.endswith(".csv"):
+            df.to_csv(self.path, mode="a", header=(self.rows == 0), index=False)
+        else:
+            import pyarrow as pa
+            table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+            if self._writer is None:
+                self._schema = table.schema
+                self._writer = self._open(table.schema)
+            self._writer.write_table(table)
+
+    def _open(self, schema):
+        if self.path.endswith(".parquet"):
+            import pyarrow.parquet as pq
+            return pq.ParquetWriter(self.path, schema)
+        if self.path.endswith(".feather"):
+            import pyarrow.ipc as ipc
+            # Feather V2 = Arrow IPC dosyası (sıkıştırmasız, memory-map ile okunabilir)
+            return ipc.new_file(self.path, schema)
+        raise ValueError(f"Desteklenmeyen çıktı formatı: {self.path}")
+
+    def close(self):
+        # Split'in bu tarafına hiç satır düşmediyse de çağıran dosyanın var olduğunu varsayar
+        if self.rows == 0 and self._empty is not None:
+            self._write(self._empty)
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,227 @@
+import asyncio
+import hashlib
+import os
+import queue
+import re
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, BinaryIO, Optional
+import pandas as pd
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.core.metrics import stage_timer
+from app.services.dataset_io import (
+    read_table, write_table, read_columns, check_readable, ChunkedTableWriter, UnsupportedFormatError
+)
+
+CHUNK_SIZE = 1024 * 1024  # 1 MB
+PARSE_CHUNK_ROWS = 100_000
+DIGEST_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+DIGEST_LOCK_STRIPES = 64
+
+
+class _ChunkPipe:
+    """
+    Event loop'tan gelen yükleme parçalarını yazıcı thread'ine aktaran sınırlı kuyruk.
+    Kuyruk doluysa yükleme yavaşlar, bellek şişmez. Her parça ham dosyaya yazılır ve hash'lenir.
+    """
+
+    def __init__(self, sink: BinaryIO, max_chunks: int = 8):
+        self.queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=max_chunks)
+        self.sink = sink
+        self.sha = hashlib.sha256()
+        self.size = 0
+
+    def drain(self):
+        """Yazıcı thread'i: sonlandırma parçası (None) gelene kadar yazar ve hash'ler."""
+        while True:
+            chunk = self.queue.get()
+            if chunk is None:
+                return
+            self.sha.update(chunk)
+            self.sink.write(chunk)
+            self.size += len(chunk)
+
+
+class DatasetStore:
+    """
+    İçerik adresli (SHA-256) yükleme deposu.
+    raw/     : yüklenen dosyanın kendisi ({hash}{uzantı})
+    parsed/  : dosyanın tipleri korunmuş Parquet hali ({hash}.parquet)
+    Aynı içerik tekrar yüklendiğinde ne diske yazılır ne de yeniden parse edilir;
+    farklı istemcilerin aynı isimli dosyaları da birbirini ezmez.
+    """
+
+    def __init__(self, root: str = settings.DATASET_STORE_DIR,
+                 max_ingests: int = settings.UPLOAD_MAX_CONCURRENCY):
+        self.root = root
+        # Parse/yazma thread'leri ayrı ve sınırlı bir havuzda çalışır: uzun yüklemeler
+        # Starlette threadpool'unu (tahmin vb. için) işgal etmez
+        self._executor = ThreadPoolExecutor(max_workers=max_ingests, thread_name_prefix="ingest")
+        # Digest başına kilit yerine sabit sayıda şeritli kilit: bellek yüklenen dosya sayısıyla büyümez;
+        # farklı digest'lerin aynı kilide düşmesi sadece kısa süreli beklemeye yol açar
+        self._digest_locks = [threading.Lock() for _ in range(DIGEST_LOCK_STRIPES)]
+
+    def _digest_lock(self, digest: str) -> threading.Lock:
+        return self._digest_locks[int(digest[:8], 16) % len(self._digest_locks)]
+
+    def raw_path(self, digest: str, ext: str) -> str:
+        return os.path.join(self.root, "raw", f"{digest}{ext}")
+
+    def parsed_path(self, digest: str) -> str:
+        return os.path.join(self.root, "parsed", f"{digest}.parquet")
+
+    def get_parsed(self, digest: str, raw_path: str) -> str:
+        """Dosyanın Parquet halini döner; ilk istekte bir kez parse edilip kaydedilir."""
+        with self._digest_lock(digest):
+            return self._parse(raw_path, self.parsed_path(digest)) or raw_path
+
+    @staticmethod
+    def _parse(raw_path: str, parsed_path: str) -> Optional[str]:
+        """
+        Digest kilidi altında çağrılır. Dosyayı okuyup Parquet'e çevirir ve parsed_path'i döner;
+        ham dosya doğrudan kullanılacaksa None döner. Okunamayan dosyada ValueError yükselir.
+        """
+        if os.path.exists(parsed_path):
+            return parsed_path
+        tmp_path = f"{parsed_path}.{threading.get_ident()}.tmp.parquet"
+        os.makedirs(os.path.dirname(parsed_path), exist_ok=True)
+        if raw_path.endswith(".csv") and DatasetStore._convert_csv(raw_path, tmp_path):
+            os.replace(tmp_path, parsed_path)
+            logger.info(f"Veri seti parça parça Parquet'e çevrildi: {parsed_path}")
+            return parsed_path
+        try:
+            if raw_path.endswith(".parquet"):
+                read_columns(raw_path)  # Sadece şema okunarak doğrulanır
+                return None
+            with stage_timer("dataset_store", "parse"):
+                df = read_table(raw_path)
+        except UnsupportedFormatError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Dosya okunamadı: {str(e)}") from e
+        try:
+            with stage_timer("dataset_store", "write_parquet"):
+                write_table(df, tmp_path)
+            os.replace(tmp_path, parsed_path)
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            # Karışık tipli Excel sütunları gibi Arrow'a çevrilemeyen dosyalarda ham dosya kullanılır
+            logger.warning(f"Parquet'e çevrilemedi, ham dosya kullanılacak: {raw_path} ({str(e)})")
+            return None
+        logger.info(f"Veri seti parse edilip Parquet olarak saklandı: {parsed_path} ({len(df)} satır)")
+        return parsed_path
+
+    @staticmethod
+    def _convert_csv(raw_path: str, tmp_path: str) -> bool:
+        """
+        CSV'yi PARSE_CHUNK_ROWS satırlık parçalarla Parquet'e yazar; bellek dosya boyutuyla büyümez.
+        Parçalar arası tip uyuşmazlığı gibi durumlarda False döner ve dosya bütün olarak okunur.
+        """
+        try:
+            with stage_timer("dataset_store", "stream_parse"), ChunkedTableWriter(tmp_path) as writer:
+                for chunk in pd.read_csv(raw_path, chunksize=PARSE_CHUNK_ROWS):
+                    writer.write(chunk)
+            return True
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            # Örn. ilk parçada tamsayı olan sütunda sonradan metin
+            logger.warning(f"CSV parça parça çevrilemedi, tamamı okunacak: {raw_path} ({str(e)})")
+            return False
+
+    # --- Akış (streaming) yükleme ---
+    async def ingest_stream(self, chunks: AsyncIterator[bytes], filename: str, parse: bool = True) -> dict:
+        """
+        Yüklemeyi parça parça alırken hash'ler ve geçici ham dosyaya yazar; disk yazımı bir
+        thread'de yapılır, event loop sadece parçaları kuyruğa koyar. Parse, digest belli
+        olduktan sonra ve sadece depoda olmayan içerik için yapılır: aynı dosyanın tekrar
+        yüklenmesi ne diske yazar ne de yeniden parse edilir. Bunun bedeli, yeni dosyaların
+        parse için diskten (genelde sayfa önbelleğinden) bir kez daha okunmasıdır.
+        """
+        if parse:
+            check_readable(filename)
+        ext = os.path.splitext(filename or "")[1].lower()
+        incoming_dir = os.path.join(self.root, "incoming")
+        os.makedirs(incoming_dir, exist_ok=True)
+        tmp_raw = os.path.join(incoming_dir, f"{uuid.uuid4().hex}{ext}")
+
+        sink = open(tmp_raw, "wb")
+        pipe = _ChunkPipe(sink)
+        loop = asyncio.get_running_loop()
+        writer = loop.run_in_executor(self._executor, pipe.drain)
+        try:
+            try:
+                async for chunk in chunks:
+                    if chunk and not await self._put(pipe, chunk, writer):
+                        break
+            finally:
+                # Yükleme yarıda kesilse bile yazıcı thread'i sonlanmalı
+                await self._put(pipe, None, writer)
+            await writer
+            sink.close()
+            digest = pipe.sha.hexdigest()
+            return await loop.run_in_executor(
+                self._executor, self._finalize, digest, ext, tmp_raw, filename, parse
+            )
+        finally:
+            # Hata durumunda da thread'in dosyayı bırakmasını bekle (sonlandırma parçası kuyruğa kondu)
+            if not writer.done():
+                await asyncio.wait({writer})
+            if not writer.cancelled():
+                writer.exception()
+            sink.close()
+            if os.path.exists(tmp_raw):
+                os.remove(tmp_raw)
+
+    @staticmethod
+    async def _put(pipe: _ChunkPipe, chunk: Optional[bytes], writer: asyncio.Future) -> bool:
+        # Thread tutmadan bekle: kuyruk doluysa yazıcının yetişmesi beklenir
+        while True:
+            try:
+                pipe.queue.put_nowait(chunk)
+                return True
+            except queue.Full:
+                if writer.done():
+                    return False  # Yazıcı thread'i hata ile çıktı; hata await writer'da yükselir
+                await asyncio.sleep(0.005)
+
+    def _finalize(self, digest: str, ext: str, tmp_raw: str, filename: str, parse: bool) -> dict:
+        raw_path = self.raw_path(digest, ext)
+        path = raw_path
+        with self._digest_lock(digest):
+            cached = os.path.exists(raw_path)
+            if parse:
+                # Yeni dosya depoya alınmadan önce parse edilir; okunamazsa (bozuk/boş dosya)
+                # hata yükselir ve geçici dosya silinir, depoya çöp girmez. Önbellekteki dosyanın
+                # Parquet hali zaten vardır, _parse onu doğrudan döner.
+                path = self._parse(raw_path if cached else tmp_raw, self.parsed_path(digest)) or raw_path
+            if cached:
+                logger.info(f"Yükleme önbellekte bulundu: {filename} ({digest[:12]})")
+            else:
+                os.makedirs(os.path.dirname(raw_path), exist_ok=True)
+                os.replace(tmp_raw, raw_path)
+                logger.info(f"Yükleme depoya yazıldı: {filename} -> {raw_path}")
+
+        if not parse:
+            return {"digest": digest, "raw_path": raw_path, "path": raw_path, "columns": None}
+        return {"digest": digest, "raw_path": raw_path, "path": path, "columns": read_columns(path)}
+
+    def get(self, digest: str) -> dict:
+        """Daha önce yüklenmiş veri setini (dataset_id = içerik hash'i) döner."""
+        if not DIGEST_PATTERN.match(digest or ""):
+            raise ValueError(f"Geçersiz dataset_id: '{digest}'")
+        raw_dir = os.path.join(self.root, "raw")
+        names = [n for n in os.listdir(raw_dir) if n.startswith(digest)] if os.path.isdir(raw_dir) else []
+        names = [n for n in names if not n.endswith(".tmp")]
+        if not names:
+            raise FileNotFoundError(f"Veri seti bulunamadı: {digest}")
+        raw_path = os.path.join(raw_dir, names[0])
+        path = self.get_parsed(digest, raw_path)
+        return {"digest": digest, "raw_path": raw_path, "path": path, "columns": read_columns(path)}
+
+
+# Global depo nesnesi
+dataset_store = DatasetStore()
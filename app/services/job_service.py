@@ -0,0 +1,216 @@
+import fcntl
+import json
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from app.core.config import settings
+from app.core.logging_config import logger
+
+
+class JobQueueFullError(Exception):
+    """Bekleyen eğitim işi sayısı sınırı aşıldığında fırlatılır."""
+
+
+class JobNotFoundError(Exception):
+    pass
+
+
+def _owner() -> dict:
+    """İşi yürüten API sürecinin kimliği; aynı iş dizinini paylaşan worker'lar birbirinin işini ayırt eder."""
+    return {"owner_host": socket.gethostname(), "owner_pid": os.getpid()}
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Süreç var ama başka kullanıcıya ait
+    return True
+
+
+# --- Kalıcı İş Deposu (her iş için bir JSON dosyası) ---
+class JobStore:
+    def __init__(self, jobs_dir: str):
+        self.jobs_dir = jobs_dir
+
+    def _path(self, job_id: str) -> str:
+        return os.path.join(self.jobs_dir, f"{job_id}.json")
+
+    def read(self, job_id: str) -> dict:
+        try:
+            with open(self._path(job_id)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise JobNotFoundError(f"İş bulunamadı: {job_id}")
+
+    def write(self, job: dict):
+        # Yarım yazılmış dosya okunmasın diye önce geçici dosyaya yazıp taşıyoruz
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        tmp_path = self._path(job["job_id"]) + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(job, f, indent=4)
+        os.replace(tmp_path, self._path(job["job_id"]))
+
+    def update(self, job_id: str, **fields) -> dict:
+        job = self.read(job_id)
+        job.update(fields)
+        self.write(job)
+        return job
+
+    def all(self):
+        if not os.path.isdir(self.jobs_dir):
+            return
+        for name in sorted(os.listdir(self.jobs_dir)):
+            if name.endswith(".json"):
+                yield self.read(name[:-len(".json")])
+
+
+# --- Worker süreçte çalışan fonksiyon (pickle edilebilir olmalı) ---
+def _run_training_job(job_id: str, config_dict: dict, jobs_dir: str) -> dict:
+    # Ağır kütüphaneler sadece worker süreçte import edilir
+    from app.schemas.config import ModelTrainingConfig
+    from app.services.ml_service import MLService
+
+    store = JobStore(jobs_dir)
+    store.update(job_id, status="running", stage="starting", progress=0.0, started_at=time.time(),
+                 worker_pid=os.getpid())
+
+    def report(stage: str, pct: float):
+        store.update(job_id, stage=stage, progress=pct)
+
+    try:
+        result = MLService().train_model(ModelTrainingConfig(**config_dict), progress=report)
+    except Exception as e:
+        store.update(job_id, status="failed", error=str(e), finished_at=time.time())
+        raise
+    store.update(job_id, status="completed", stage="done", progress=1.0,
+                 result=result, finished_at=time.time())
+    # Worker süreç havuzla birlikte kapanabilir; MLflow kaydı kaybolmasın diye iş bitmeden yazılır
+    from app.services.tracking_service import tracking_queue
+    tracking_queue.flush()
+    return result
+
+
+class TrainingJobManager:
+    """
+    Eğitim işlerini ayrı süreçlerde (ProcessPoolExecutor) çalıştırır.
+    Böylece uzun eğitimler API sürecinin GIL'ini ve threadpool'unu meşgul etmez.
+    İş durumları diskte tutulur; süreç yeniden başlarsa sahibi ölmüş yarım işler açılışta
+    (resume_pending) tekrar kuyruğa alınır.
+    """
+
+    def __init__(self, jobs_dir: str = settings.TRAINING_JOBS_DIR,
+                 max_workers: int = settings.TRAINING_MAX_WORKERS,
+                 max_pending: int = settings.TRAINING_MAX_PENDING_JOBS):
+        self.store = JobStore(jobs_dir)
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._active = 0
+        self._dispatched: set = set()  # Bu süreçte kuyruğa alınıp henüz bitmemiş işler
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # fork yerine spawn: TensorFlow/threadlerle fork güvenli değil
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _is_orphaned(self, job: dict) -> bool:
+        if job["job_id"] in self._dispatched:
+            return False
+        # Başka makinedeki sürecin durumu buradan bilinemez; o makinenin kendi açılışı devralır
+        if job.get("owner_host") not in (None, socket.gethostname()):
+            return False
+        # Kendi pid'imiz kayıtlı ama iş bu süreçte kuyruğa alınmadıysa önceki çalışmadan kalmıştır
+        # (örn. konteynerde API süreci hep pid 1 olur)
+        pids = (job.get("owner_pid"), job.get("worker_pid"))
+        return not any(pid != os.getpid() and _pid_alive(pid) for pid in pids)
+
+    def resume_pending(self):
+        """
+        Açılışta çağrılır. Yarım kalan (queued/running) işlerden sahibi olan API süreci ve
+        worker'ı artık yaşamayanları devralıp tekrar kuyruğa alır. Aynı dizini paylaşan diğer
+        worker'ların hâlâ yürüttüğü işlere dokunulmaz; eşzamanlı açılışlarda bir işi sadece
+        bir süreç devralsın diye tarama dosya kilidi altında yapılır.
+        """
+        os.makedirs(self.store.jobs_dir, exist_ok=True)
+        with open(os.path.join(self.store.jobs_dir, ".resume.lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            orphaned = [job for job in self.store.all()
+                        if job["status"] in ("queued", "running") and self._is_orphaned(job)]
+            for job in orphaned:
+                logger.warning(f"Yarım kalan eğitim işi tekrar kuyruğa alınıyor: {job['job_id']}")
+                self.store.update(job["job_id"], status="queued", stage="queued", progress=0.0,
+                                  worker_pid=None, **_owner())
+        for job in orphaned:
+            self._dispatch(job["job_id"], job["config"])
+
+    def _dispatch(self, job_id: str, config_dict: dict):
+        with self._lock:
+            self._active += 1
+            self._dispatched.add(job_id)
+        future = self._get_executor().submit(_run_training_job, job_id, config_dict, self.store.jobs_dir)
+        future.add_done_callback(lambda f: self._on_done(job_id, f))
+
+    def _on_done(self, job_id: str, future):
+        with self._lock:
+            self._active -= 1
+            self._dispatched.discard(job_id)
+        error = future.exception()
+        if error is None:
+            logger.info(f"Eğitim işi tamamlandı: {job_id}")
+            return
+        logger.error(f"Eğitim işi başarısız: {job_id} - {str(error)}")
+        # Worker süreç çöktüyse durum dosyası güncellenmemiş olabilir
+        if self.store.read(job_id)["status"] != "failed":
+            self.store.update(job_id, status="failed", error=str(error), finished_at=time.time())
+
+    def submit(self, config_dict: dict, job_id: Optional[str] = None) -> dict:
+        with self._lock:
+            if self._active >= self.max_pending:
+                raise JobQueueFullError(
+                    f"Eğitim kuyruğu dolu ({self._active}/{self.max_pending}). Daha sonra tekrar deneyin."
+                )
+        job = {
+            "job_id": job_id or uuid.uuid4().hex,
+            "status": "queued",
+            "stage": "queued",
+            "progress": 0.0,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "config": config_dict,
+            "result": None,
+            "error": None,
+            "worker_pid": None,
+            **_owner(),
+        }
+        self.store.write(job)
+        self._dispatch(job["job_id"], config_dict)
+        logger.info(f"Eğitim işi kuyruğa alındı: {job['job_id']}")
+        return job
+
+    def get(self, job_id: str) -> dict:
+        return self.store.read(job_id)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global iş yöneticisi
+job_manager = TrainingJobManager()
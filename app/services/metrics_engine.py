@@ -0,0 +1,144 @@
+from typing import List, Optional, Sequence
+import numpy as np
+
+SUPPORTED_METRICS = ("accuracy", "precision", "recall", "f1", "f1_score", "roc_auc")
+# ROC-AUC, örnek sayısı EXACT_ROC_MAX_SAMPLES'ı aşmadıkça skorlar tutularak tam (sklearn ile aynı)
+# hesaplanır. Aşınca skorlar bırakılır ve histogramdan yaklaşık hesaplanır (2^16 kutuda hata ~1e-5
+# mertebesinde); sonuçta roc_auc_approximate=True döner.
+ROC_BINS = 1 << 16
+EXACT_ROC_MAX_SAMPLES = 1_000_000
+
+
+class MetricsAccumulator:
+    """
+    Tek geçişte, parça parça biriktirilen sınıflandırma metrikleri.
+    update() her parça için sadece bir karışıklık matrisi (np.bincount) ve skor histogramı
+    günceller; tahmin edilen etiketler hiçbir zaman bir arada tutulmaz. result() tüm metrikleri
+    bu sayaçlardan hesaplar. roc_auc istenirse, tam hesap için ROC sınıflarının skorları
+    EXACT_ROC_MAX_SAMPLES'a kadar tutulur. İkili sınıflandırmada pozitif sınıf classes'ın son elemanıdır
+    (sklearn pos_label=1 ile aynı); çok sınıflıda precision/recall/f1/roc_auc makro ortalamadır.
+    """
+
+    def __init__(self, classes: Sequence, metrics: Optional[List[str]] = None, roc_bins: int = ROC_BINS,
+                 exact_roc_max_samples: int = EXACT_ROC_MAX_SAMPLES):
+        unknown = [m for m in (metrics or []) if m not in SUPPORTED_METRICS]
+        if unknown:
+            raise ValueError(f"Desteklenmeyen metrik: {unknown}. Desteklenenler: {list(SUPPORTED_METRICS)}")
+        self.classes = np.asarray(classes)
+        self.metrics = list(metrics) if metrics else ["accuracy", "precision", "recall", "f1_score"]
+        self.roc_bins = roc_bins
+        k = len(self.classes)
+        self.confusion = np.zeros((k, k), dtype=np.int64)
+        # Sınıf başına (negatif, pozitif) örneklerin skor histogramı (one-vs-rest);
+        # ikili sınıflandırmada sadece pozitif sınıf için tutulur
+        self._roc_classes = ([k - 1] if k == 2 else list(range(k))) if "roc_auc" in self.metrics else []
+        self._score_hist = {c: np.zeros((2, roc_bins), dtype=np.int64) for c in self._roc_classes}
+        # Tam hesap için ROC sınıflarının skorları ve gerçek sınıflar (sınır aşılınca None)
+        self.exact_roc_max_samples = exact_roc_max_samples
+        self._roc_samples = 0
+        self._roc_scores: Optional[list] = [] if self._roc_classes else None
+        self._roc_true: Optional[list] = [] if self._roc_classes else None
+
+    def _index(self, labels) -> np.ndarray:
+        labels = np.asarray(labels).reshape(-1)
+        idx = np.searchsorted(self.classes, labels)
+        idx = np.clip(idx, 0, len(self.classes) - 1)
+        if not np.all(self.classes[idx] == labels):
+            unknown = np.setdiff1d(labels, self.classes)
+            raise ValueError(f"Modelin bilmediği sınıflar: {unknown.tolist()} (model: {self.classes.tolist()})")
+        return idx
+
+    def update(self, y_true, y_pred, y_score: Optional[np.ndarray] = None):
+        """y_score: (n, k) sınıf olasılıkları; sadece roc_auc istendiğinde gerekli."""
+        k = len(self.classes)
+        true_idx = self._index(y_true)
+        pred_idx = self._index(y_pred)
+        self.confusion += np.bincount(true_idx * k + pred_idx, minlength=k * k).reshape(k, k)
+
+        if self._roc_classes:
+            if y_score is None:
+                raise ValueError("roc_auc için sınıf olasılıkları (predict_proba) gerekli.")
+            y_score = np.asarray(y_score, dtype=np.float64).reshape(len(true_idx), -1)
+            bins = np.clip((y_score * self.roc_bins).astype(np.int64), 0, self.roc_bins - 1)
+            for c in self._roc_classes:
+                positive = (true_idx == c).astype(np.int64)
+                flat = positive * self.roc_bins + bins[:, c]
+                self._score_hist[c] += np.bincount(flat, minlength=2 * self.roc_bins).reshape(2, self.roc_bins)
+
+            self._roc_samples += len(true_idx)
+            if self._roc_scores is not None:
+                if self._roc_samples > self.exact_roc_max_samples:
+                    self._roc_scores = self._roc_true = None  # Bellek sınırı: histograma düşülür
+                else:
+                    self._roc_scores.append(y_score[:, self._roc_classes].copy())
+                    self._roc_true.append(true_idx)
+
+    @property
+    def roc_auc_approximate(self) -> bool:
+        return self._roc_scores is None
+
+    def _roc_auc(self, c: int) -> Optional[float]:
+        neg, pos = self._score_hist[c]
+        n_neg, n_pos = neg.sum(), pos.sum()
+        if n_neg == 0 or n_pos == 0:
+            return None  # Tek sınıf varsa tanımsız
+        if not self.roc_auc_approximate:
+            return self._exact_roc_auc(c, n_pos, n_neg)
+        # Mann-Whitney U: her pozitif için daha düşük skorlu negatifler + eşitlerin yarısı
+        neg_below = np.cumsum(neg) - neg
+        return float((pos * (neg_below + 0.5 * neg)).sum() / (n_neg * n_pos))
+
+    def _exact_roc_auc(self, c: int, n_pos: int, n_neg: int) -> float:
+        from scipy.stats import rankdata
+        column = self._roc_classes.index(c)
+        scores = np.concatenate([chunk[:, column] for chunk in self._roc_scores])
+        positive = np.concatenate(self._roc_true) == c
+        # Mann-Whitney U, eşit skorlar ortalama sıra alır
+        ranks = rankdata(scores)
+        return float((ranks[positive].sum() - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg))
+
+    def per_class(self) -> dict:
+        tp = np.diag(self.confusion).astype(np.float64)
+        predicted = self.confusion.sum(axis=0)
+        support = self.confusion.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            precision = np.where(predicted > 0, tp / predicted, 0.0)
+            recall = np.where(support > 0, tp / support, 0.0)
+            f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+        stats = {}
+        for i, label in enumerate(self.classes.tolist()):
+            stats[str(label)] = {
+                "precision": float(precision[i]), "recall": float(recall[i]),
+                "f1_score": float(f1[i]), "support": int(support[i]),
+            }
+            if i in self._score_hist:
+                stats[str(label)]["roc_auc"] = self._roc_auc(i)
+        return stats
+
+    def result(self, include_details: bool = True) -> dict:
+        total = self.confusion.sum()
+        per_class = self.per_class()
+        binary = len(self.classes) == 2
+        # İkili: pozitif sınıfın değeri; çok sınıflı: makro ortalama
+        def summary(key):
+            if binary:
+                return per_class[str(self.classes.tolist()[-1])][key]
+            values = [stats[key] for stats in per_class.values() if stats.get(key) is not None]
+            return float(np.mean(values)) if values else None
+
+        values = {
+            "accuracy": lambda: float(np.trace(self.confusion) / total) if total else 0.0,
+            "precision": lambda: summary("precision"),
+            "recall": lambda: summary("recall"),
+            "f1": lambda: summary("f1_score"),
+            "f1_score": lambda: summary("f1_score"),
+            "roc_auc": lambda: summary("roc_auc"),
+        }
+        metrics = {name: values[name]() for name in self.metrics}
+        if include_details:
+            if self._roc_classes:
+                metrics["roc_auc_approximate"] = self.roc_auc_approximate
+            metrics["per_class"] = per_class
+            metrics["confusion_matrix"] = self.confusion.tolist()
+            metrics["n_samples"] = int(total)
+        return metrics
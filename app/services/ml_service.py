@@ -1,17 +1,26 @@
-import pandas as pd
 import os
 import json
-import mlflow # <-- MLOps Kütüphanesi
-import mlflow.sklearn # <-- Sklearn modellerini kaydetmek için
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+import functools
+import shutil
+import tempfile
+import numpy as np
 from app.schemas.config import ModelTrainingConfig, ModelTestingConfig
-from app.services.model_factory import ModelFactory
+from app.services.model_factory import ModelFactory, remove_files
+from app.services.dataset_io import read_table, iter_table_chunks
+from app.services.metrics_engine import MetricsAccumulator
+from app.services.preprocessing import fit_preprocessing, resample
+from app.services.model_cache import resolve_artifact_path
+from app.services.model_registry import model_registry
+from app.services.tracking_service import TrackingRecord, tracking_queue
 from app.core.logging_config import logger
+from app.core.metrics import stage_timer
 
 class MLService:
     
     # --- ENDPOINT 2: TRAIN (MLflow Entegre Edildi) ---
-    def train_model(self, config: ModelTrainingConfig):
+    def train_model(self, config: ModelTrainingConfig, progress=None):
+        # progress: opsiyonel (stage, yüzde) callback'i; arka plan işleri durum raporlar
+        report = progress or (lambda stage, pct: None)
         logger.info(f"İşlem Başlıyor: Model Eğitimi - {config.experiment_name}")
         
         # 1. Dosya Kontrolü
@@ -20,49 +29,205 @@ class MLService:
             raise FileNotFoundError(f"Train verisi bulunamadı: {config.train_data_path}")
             
         # 2. Veriyi Oku
+        report("loading_data", 0.05)
         logger.info(f"Veri okunuyor: {config.train_data_path}")
-        df = pd.read_csv(config.train_data_path)
+        with stage_timer("ml_service", "load_data"):
+            df = read_table(config.train_data_path, columns=config.feature_columns + [config.target_column])
         X = df[config.feature_columns]
         y = df[config.target_column]
         
-        # 3. MLflow Deneyini Ayarla (Klasör gibi düşün)
-        mlflow.set_experiment(config.experiment_name)
-
-        # 4. MLOps Takibini Başlat
-        with mlflow.start_run():
-            # A) Parametreleri Logla (Hangi ayarlarla eğittik?)
-            logger.info("Parametreler MLflow'a kaydediliyor...")
-            mlflow.log_params(config.algorithm_config.params)
-            mlflow.log_param("model_type", config.algorithm_config.type)
-            mlflow.log_param("train_data_size", len(df))
-
-            # B) Modeli Eğit
+        # 3. MLOps Takibi: kayıt bellekte toplanır, eğitim bitince arka plan kuyruğuna verilir
+        # (MLflow deneyi/run'ı tracking_queue tarafından açılır; eğitim tracking store'u beklemez)
+        tracking = TrackingRecord(config.experiment_name)
+
+        # A) Parametreleri Logla (Hangi ayarlarla eğittik?)
+        tracking.log_params(config.algorithm_config.params)
+        tracking.log_params({"model_type": config.algorithm_config.type, "train_data_size": len(df)})
+
+        if config.base_model_id:
+            tracking.log_params({"base_model_id": config.base_model_id})
+
+        # B) Opsiyonel Hiperparametre Araması (her deneme nested run olarak loglanır)
+        params = config.algorithm_config.params
+        search_summary = None
+        if config.search and config.base_model_id:
+            raise ValueError("Artımlı eğitimde (base_model_id) hiperparametre araması yapılamaz.")
+        if config.search:
+            report("searching", 0.1)
+            from app.services.search_service import SearchService
+            with stage_timer("ml_service", "search"):
+                search_result = SearchService().search(X, y, config.algorithm_config, config.search,
+                                                       config.preprocessing)
+            params = search_result["best_params"]
+            tracking.log_params(params, prefix="best_")
+            tracking.log_metric(f"best_cv_{search_result['scoring']}", search_result["best_score"])
+            for i, trial in enumerate(search_result["trials"]):
+                tracking.add_child(
+                    f"trial_{i}",
+                    {**trial["params"], "n_samples": trial["n_samples"], "halving_round": trial["round"]},
+                    {f"cv_{search_result['scoring']}_mean": trial["mean_score"],
+                     f"cv_{search_result['scoring']}_std": trial["std_score"]},
+                )
+            search_summary = {k: search_result[k] for k in ("best_params", "best_score", "scoring", "n_trials")}
+
+        if config.preprocessing:
+            tracking.log_params(config.preprocessing.model_dump(), prefix="prep_")
+
+        if config.base_model_id:
+            # C-D) Artımlı eğitim: önceki model ve preprocessor'ı yüklenir, sadece yeni veri işlenir
+            report("training", 0.2)
+            model_instance, X_fit, y_fit = self._load_base_model(config, X, y)
+            logger.info(f"Model ({config.algorithm_config.type}) artımlı eğitiliyor: {config.base_model_id}")
+            with stage_timer("ml_service", "fit_incremental"):
+                train_details = model_instance.train_incremental(X_fit, y_fit, params)
+            train_details["base_model_id"] = config.base_model_id
+        else:
+            # C) Preprocessing'i train split üzerinde bir kez fit et (model ile birlikte kaydedilir)
+            with stage_timer("ml_service", "preprocess"):
+                preprocessor, X_fit, y_fit = fit_preprocessing(config.preprocessing, X, y)
+
+            # D) Modeli Eğit
+            report("training", 0.2)
             model_instance = ModelFactory.get_model(config.algorithm_config)
+            model_instance.preprocessor = preprocessor
             logger.info(f"Model ({config.algorithm_config.type}) eğitiliyor...")
-            train_details = model_instance.train(X, y, config.algorithm_config.params)
-            
-            # C) Modeli Diske Kaydet (.pkl)
-            os.makedirs(os.path.dirname(config.save_model_path), exist_ok=True)
-            model_instance.save(config.save_model_path)
-            logger.info(f"Model başarıyla diske kaydedildi: {config.save_model_path}")
-
-            # D) Modeli MLflow'a Artifact Olarak Kaydet (Bulutta veya yerelde yedekleme)
-            # Not: Sadece sklearn tabanlılar için örnekliyoruz, diğerleri için custom logic gerekebilir.
-            if config.algorithm_config.type == "random_forest":
-                mlflow.sklearn.log_model(model_instance.model, "model")
-            
-            logger.info("MLflow kaydı tamamlandı.")
+            with stage_timer("ml_service", "fit"):
+                train_details = model_instance.train(X_fit, y_fit, params)
+        if config.algorithm_config.compile_inference:
+            with stage_timer("ml_service", "compile"):
+                model_instance.compile()
+            train_details["compiled_inference"] = True
+        if search_summary:
+            train_details["search"] = search_summary
+        
+        # E) Modeli Diske Kaydet (.pkl)
+        report("saving", 0.8)
+        with stage_timer("ml_service", "save"):
+            artifact_path, artifact_files = self._save_atomic(model_instance, config.save_model_path)
+        logger.info(f"Model başarıyla diske kaydedildi: {artifact_path}")
+
+        # F) Opsiyonel: Registry'ye yeni (değişmez) versiyon olarak kaydet
+        registry_info = None
+        if config.register_as:
+            record = model_registry.register(
+                config.register_as, config.algorithm_config.type, artifact_files, artifact_path,
+                {
+                    "feature_columns": config.feature_columns,
+                    "target_column": config.target_column,
+                    "params": params,
+                    "details": train_details,
+                    "experiment": config.experiment_name,
+                    "mlflow_run_id": None,  # Run oluşunca tracking kuyruğu tarafından yazılır
+                    "tracking_id": tracking.tracking_id,
+                    "train_data_path": config.train_data_path,
+                },
+            )
+            registry_info = {"name": record["name"], "version": record["version"]}
+            tracking.on_run_created.append(
+                functools.partial(model_registry.update_run_id, record["name"], record["version"])
+            )
+            if config.promote:
+                # Eğitim ayrı süreçte olabilir; modeli API süreçleri kendileri arka planda yükler
+                model_registry.promote(record["name"], record["version"], preload=False)
+                registry_info["serving"] = True
 
-            return {
-                "status": "Training Completed",
-                "experiment": config.experiment_name,
-                "mlflow_run_id": mlflow.active_run().info.run_id, # <-- Run ID'yi dönüyoruz
-                "save_path": config.save_model_path,
-                "details": train_details
-            }
+        # G) Diske yazılan dosyaları MLflow artifact'ı olarak kuyruğa ver (tekrar serialize edilmez)
+        report("logging", 0.9)
+        with stage_timer("ml_service", "mlflow_enqueue"):
+            tracking.stage_artifacts(artifact_files)
+            run_id = tracking_queue.submit(tracking)
+
+        return {
+            "status": "Training Completed",
+            "experiment": config.experiment_name,
+            "mlflow_run_id": run_id, # <-- Asenkron modda kayıt yazılınca oluşur (None)
+            "tracking_id": tracking.tracking_id, # <-- MLflow'da tags.tracking_id ile bulunur
+            "save_path": config.save_model_path,
+            "artifact_path": artifact_path, # <-- Diskteki gerçek dosya (.json/.keras olabilir)
+            "registry": registry_info,
+            "details": train_details
+        }
+
+    @staticmethod
+    def _iter_test_chunks(config: ModelTestingConfig):
+        columns = config.feature_columns + [config.target_column]
+        if config.test_data_path.endswith((".csv", ".parquet", ".feather")):
+            chunks = iter_table_chunks(config.test_data_path, config.test_data_path, columns, config.chunksize)
+        else:
+            # Excel parça parça okunamaz
+            chunks = iter([read_table(config.test_data_path, columns=columns)])
+        while True:
+            with stage_timer("ml_service", "load_test_data"):
+                chunk = next(chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+
+    @staticmethod
+    def _load_base_model(config: ModelTrainingConfig, X, y):
+        """
+        Artımlı eğitim için önceki modeli yükler. Eski ağaçlar/ağırlıklar o modelin
+        preprocessor'ıyla dönüştürülmüş veriyle eğitildiği için preprocessor yeniden fit
+        edilmez; yeni veri aynı dönüşümden geçer. (model, X, y) döner.
+        """
+        if model_registry.is_registered(config.base_model_id):
+            # Registry adı verildiyse serving versiyonundan devam edilir
+            path, _ = model_registry.resolve(config.base_model_id)
+        else:
+            path = resolve_artifact_path(config.algorithm_config.type, config.base_model_id)
+        model_instance = ModelFactory.get_model(config.algorithm_config)
+        with stage_timer("ml_service", "load_base_model"):
+            model_instance.load(path)
+
+        X_fit, y_fit = model_instance.transform(X), y
+        prep = config.preprocessing
+        if prep and (prep.impute_strategy or prep.scale_features):
+            logger.warning("Artımlı eğitimde preprocessing yeniden fit edilmez; temel modelinki kullanılıyor.")
+        if prep and prep.class_imbalance_method:
+            X_fit, y_fit = resample(np.asarray(X_fit), np.asarray(y), prep.class_imbalance_method, prep.random_state)
+        return model_instance, X_fit, y_fit
+
+    @staticmethod
+    def _save_atomic(model_instance, save_path: str):
+        """
+        Modeli boş bir geçici klasöre kaydedip yazılan her dosyayı (model + yan dosyalar)
+        hedefe os.replace ile taşır. Okuyucular yarım yazılmış model görmez ve eski dosyanın
+        inode'u (ör. MLflow/registry linki) bozulmaz.
+        (asıl model dosyasının yolu, tüm dosyaların yolları) döner; adapter uzantıyı değiştirmiş olabilir.
+        """
+        target_dir = os.path.dirname(save_path)
+        if target_dir:
+            os.makedirs(target_dir, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=".saving-", dir=target_dir or ".")
+        try:
+            written = model_instance.save(os.path.join(tmp_dir, os.path.basename(save_path)))
+            main_path = os.path.join(target_dir, os.path.basename(written))
+            # Bu kayıtta yazılmayan yan dosyaların hedefteki eski kopyaları (ör. derlenmeden yeniden
+            # eğitilen modelin önceki derlenmiş hali) model değişmeden önce silinir
+            written_names = set(os.listdir(tmp_dir))
+            remove_files(p for p in model_instance.sidecar_files(main_path)
+                         if os.path.basename(p) not in written_names)
+            final_files = []
+            for name in sorted(os.listdir(tmp_dir)):
+                final_path = os.path.join(target_dir, name)
+                os.replace(os.path.join(tmp_dir, name), final_path)
+                final_files.append(final_path)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        return main_path, final_files
 
     # --- ENDPOINT 3: TEST (Değişiklik Yok) ---
     def test_model(self, config: ModelTestingConfig):
+        registry_record = None
+        if config.registry_name:
+            # Registry modeli: versiyon verilmezse serving, o da yoksa en son versiyon test edilir
+            version = config.registry_version or model_registry.serving_version(config.registry_name)
+            if version is None:
+                versions = model_registry.list_versions(config.registry_name)
+                version = versions[-1]["version"] if versions else None
+            registry_record = model_registry.get_version(config.registry_name, version)
+            config.model_path = model_registry.artifact_path(registry_record)
+            config.model_type = registry_record["model_type"]
         logger.info(f"Test işlemi başladı. Model: {config.model_path}")
         
         if not os.path.exists(config.test_data_path):
@@ -70,27 +235,32 @@ class MLService:
         if not os.path.exists(config.model_path):
             raise FileNotFoundError(f"Model yok: {config.model_path}")
 
-        df = pd.read_csv(config.test_data_path)
-        X_test = df[config.feature_columns]
-        y_test = df[config.target_column]
-        
         class TempConfig: type = config.model_type
         model_instance = ModelFactory.get_model(TempConfig)
-        model_instance.load(config.model_path)
+        with stage_timer("ml_service", "load_model"):
+            model_instance.load(config.model_path)
         
-        y_pred = model_instance.predict(X_test)
+        # Test verisi parça parça skorlanır; her parça sadece karışıklık matrisini ve
+        # skor histogramını günceller, tüm tahminler hiçbir zaman bellekte tutulmaz
+        classes = model_instance.classes_
+        accumulator = MetricsAccumulator(classes, config.metrics)
+        for chunk in self._iter_test_chunks(config):
+            X_chunk = chunk[config.feature_columns]
+            with stage_timer("ml_service", "predict"):
+                proba = model_instance.predict_proba(X_chunk)
+            with stage_timer("ml_service", "metrics"):
+                accumulator.update(chunk[config.target_column].to_numpy(), classes[np.argmax(proba, axis=1)], proba)
+        metrics = accumulator.result()
         
-        metrics = {
-            "accuracy": float(accuracy_score(y_test, y_pred)),
-            "precision": float(precision_score(y_test, y_pred, zero_division=0)),
-            "recall": float(recall_score(y_test, y_pred, zero_division=0)),
-            "f1_score": float(f1_score(y_test, y_pred, zero_division=0))
-        }
-        
-        logger.info(f"Test metrikleri hesaplandı: Accuracy={metrics['accuracy']}")
+        logger.info(f"Test metrikleri hesaplandı: Accuracy={metrics.get('accuracy')}")
         
         os.makedirs(os.path.dirname(config.output_report_path), exist_ok=True)
         with open(config.output_report_path, 'w') as f:
             json.dump(metrics, f, indent=4)
+
+        if registry_record is not None:
+            model_registry.update_metrics(registry_record["name"], registry_record["version"], metrics)
+            return {"status": "Test Completed", "metrics": metrics,
+                    "registry": {"name": registry_record["name"], "version": registry_record["version"]}}
             
         return {"status": "Test Completed", "metrics": metrics}
\ No newline at end of file
@@ -0,0 +1,149 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+from app.services.model_factory import ModelFactory, BaseMLModel
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.core.metrics import MODEL_CACHE_REQUESTS, MODEL_CACHE_BYTES, stage_timer
+
+# Adapter'ların save() sırasında uzantıyı değiştirdiği tipler
+ARTIFACT_EXTENSIONS = {"xgboost": ".json", "neural_network": ".keras"}
+
+
+def resolve_artifact_path(model_type: str, path: str) -> str:
+    """Adapter'ın diske yazdığı gerçek dosya yolunu döner (.pkl -> .json/.keras)."""
+    if os.path.exists(path):
+        return path
+    ext = ARTIFACT_EXTENSIONS.get(model_type)
+    if ext and path.endswith(".pkl"):
+        candidate = path[:-len(".pkl")] + ext
+        if os.path.exists(candidate):
+            return candidate
+    raise FileNotFoundError(f"Model bulunamadı: {path}")
+
+
+def _artifact_size(path: str) -> int:
+    # Bellek bütçesi için diskteki boyutu yaklaşık değer olarak kullanıyoruz
+    if os.path.isdir(path):
+        return sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, files in os.walk(path) for name in files
+        )
+    return os.path.getsize(path)
+
+
+class ModelCache:
+    """
+    Süreç genelinde yüklü modelleri (BaseMLModel adapter'ları) bellekte tutar.
+    Anahtar: (model_id, version). Adet veya bellek bütçesi aşılınca en eski
+    kullanılan (LRU) model atılır.
+    """
+
+    def __init__(self, max_items: int = settings.MODEL_CACHE_MAX_ITEMS,
+                 max_bytes: int = settings.MODEL_CACHE_MAX_BYTES):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[BaseMLModel, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: dict = {}
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, model_id: str, model_type: str, version: Optional[str] = None) -> BaseMLModel:
+        return self.get_entry(model_id, model_type, version)[0]
+
+    def get_entry(self, model_id: str, model_type: str, version: Optional[str] = None,
+                  load: bool = True) -> Optional[Tuple[BaseMLModel, Tuple[str, str]]]:
+        """
+        Modeli ve önbellek anahtarını (model_id, version) döner; anahtar modelin tam versiyonunu tanımlar.
+        load=False ise model önbellekte yoksa yüklenmez, None döner (event loop'tan hızlı kontrol için).
+        """
+        path = resolve_artifact_path(model_type, model_id)
+        # Versiyon verilmezse dosyanın değişme zamanı kullanılır; aynı yola
+        # yeniden eğitilen model otomatik olarak yeni bir anahtar alır.
+        version = version or str(os.stat(path).st_mtime_ns)
+        key = (model_id, version)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                MODEL_CACHE_REQUESTS.labels("hit").inc()
+                return entry[0], key
+            if not load:
+                return None
+            self.misses += 1
+            MODEL_CACHE_REQUESTS.labels("miss").inc()
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Aynı modeli eşzamanlı isteklerin tekrar tekrar yüklemesini engelle
+        with load_lock:
+            try:
+                with self._lock:
+                    entry = self._entries.get(key)
+                    if entry is not None:
+                        return entry[0], key
+
+                logger.info(f"Model önbelleğe yükleniyor: {path} (versiyon={version})")
+                model_instance = ModelFactory.get_model({"type": model_type})
+                with stage_timer("model_cache", "load_model"):
+                    if settings.MODEL_SHARED_MEMORY:
+                        model_instance.load_shared(path)
+                    else:
+                        model_instance.load(path)
+                size = _artifact_size(path)
+
+                with self._lock:
+                    self._entries[key] = (model_instance, size)
+                    self.total_bytes += size
+                    self._evict()
+                    MODEL_CACHE_BYTES.set(self.total_bytes)
+                return model_instance, key
+            finally:
+                # Yükleme hata verse de kilit silinir; yüklenemeyen her model_id/versiyon için kilit birikmez
+                with self._lock:
+                    self._load_locks.pop(key, None)
+
+    def contains(self, model_id: str, version: str) -> bool:
+        with self._lock:
+            return (model_id, version) in self._entries
+
+    def _evict(self):
+        # Yeni eklenen model her zaman tutulur, bütçe eskilerden açılır
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_items or self.total_bytes > self.max_bytes
+        ):
+            key, (_, size) = self._entries.popitem(last=False)
+            self.total_bytes -= size
+            logger.info(f"Model önbellekten çıkarıldı: {key[0]} (versiyon={key[1]})")
+
+    def invalidate(self, model_id: str):
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == model_id]:
+                _, size = self._entries.pop(key)
+                self.total_bytes -= size
+            MODEL_CACHE_BYTES.set(self.total_bytes)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+            MODEL_CACHE_BYTES.set(0)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "models": [{"model_id": k[0], "version": k[1]} for k in self._entries],
+                "total_bytes": self.total_bytes,
+                "max_items": self.max_items,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Global önbellek nesnesi (tüm istekler paylaşır)
+model_cache = ModelCache()
@@ -1,22 +1,132 @@
 from abc import ABC, abstractmethod
+import os
 import joblib
-import xgboost as xgb
-from sklearn.ensemble import RandomForestClassifier
-import tensorflow as tf 
+import numpy as np
 from app.schemas.config import ModelConfig
+from app.services.preprocessing import Preprocessor, preprocessor_path
+from app.services.compiled_trees import CompiledForest, CompiledBooster, ArrayBooster
+from app.services.shared_models import load_shared_arrays
+
+
+def remove_files(paths):
+    # Olmayan dosyalar sessizce atlanır
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+# Backend kütüphaneleri (sklearn, xgboost, tensorflow) modül seviyesinde değil, ilgili
+# adapter ilk kullanıldığında import edilir. Böylece sadece Random Forest servis eden bir
+# worker TensorFlow'un açılış süresini ve belleğini hiç ödemez.
 
 # --- Abstract Base Class ---
 class BaseMLModel(ABC):
+    # Eğitimde fit edilen preprocessing; train() dönüştürülmüş veri alır, predict() kendisi uygular
+    preprocessor: Preprocessor = None
+
+    def transform(self, X):
+        return X if self.preprocessor is None else self.preprocessor.transform(X)
+
+    def save_preprocessor(self, path: str):
+        # Preprocessing'siz yeniden eğitimde önceki modelin dosyası kalırsa load() onu uygular
+        if self.preprocessor is not None:
+            self.preprocessor.save(preprocessor_path(path))
+        else:
+            remove_files([preprocessor_path(path)])
+
+    def load_preprocessor(self, path: str):
+        self.preprocessor = Preprocessor.load(preprocessor_path(path))
+
+    # Opsiyonel derlenmiş (dizi tabanlı) tahmin modu; tek satır ve küçük batch'ler için
+    compiled = None
+    COMPILED_MAX_ROWS = 1024
+
+    def compile(self):
+        raise ValueError(f"{type(self).__name__} derlenmiş tahmin modunu desteklemiyor.")
+
+    def compiled_files(self, path: str) -> list:
+        return []
+
+    def save_compiled(self, path: str):
+        # Derlenmeden aynı yola kaydedilen modelde önceki eğitimin derlenmiş dosyaları silinir;
+        # yoksa load() onları bulup eski ağaçları servis eder
+        if self.compiled is not None:
+            self.compiled.save(path + self.COMPILED_SUFFIX)
+        else:
+            remove_files(self.compiled_files(path))
+
+    def sidecar_files(self, path: str) -> list:
+        """save(path)'in sadece gerektiğinde yazdığı yan dosyalar; yazılmadıklarında eskileri silinmeli."""
+        return [preprocessor_path(path)] + self.compiled_files(path)
+
+    def use_compiled(self, X) -> bool:
+        # Paylaşımlı modda asıl model yüklenmez, tüm tahminler dizi tabanlı yoldan gider
+        return self.compiled is not None and (self.model is None or len(X) <= self.COMPILED_MAX_ROWS)
+
+    def load_shared(self, path: str):
+        """
+        Çok worker'lı servis için yükleme: model dizileri memory-map ile açılır ve
+        süreçler arasında paylaşılır. Desteklemeyen adapter'lar normal yükler.
+        """
+        self.load(path)
+
+    def _load_arrays(self, path: str, compiled_cls, build_compiled):
+        # İlk worker asıl modeli yükleyip dizilere çevirir; diğerleri sadece bağlanır
+        def build():
+            self.load(path)
+            return build_compiled().arrays()
+        self.compiled = compiled_cls(**load_shared_arrays(path, build))
+        self.model = None
+        self.load_preprocessor(path)
+
+    # Girdi şeması; paylaşımlı modda asıl model yerine dizi tabanlı modelden okunur
+    def _estimator(self):
+        return self.model if self.model is not None else self.compiled
+
+    @property
+    def n_features_in_(self):
+        return getattr(self._estimator(), "n_features_in_", None)
+
+    @property
+    def feature_names_in_(self):
+        return getattr(self._estimator(), "feature_names_in_", None)
+
     @abstractmethod
     def train(self, X, y, params: dict):
         pass
 
+    def train_incremental(self, X, y, params: dict):
+        """
+        Yüklü modeli sadece yeni veriyle eğitmeye devam eder (maliyet yeni veriyle orantılı).
+        params'taki n_estimators / epochs, eklenecek ağaç / tur / epoch sayısıdır.
+        """
+        raise ValueError(f"{type(self).__name__} artımlı eğitimi desteklemiyor.")
+
+    @staticmethod
+    def check_incremental_classes(y, classes):
+        # Yeni ağaçların/turların çıktı boyutu eskileriyle aynı olmalı
+        new_classes = np.unique(np.asarray(y))
+        if not np.array_equal(new_classes, np.asarray(classes)):
+            raise ValueError(
+                f"Artımlı eğitim verisi modelin sınıflarını içermeli: model={list(classes)}, "
+                f"yeni veri={list(new_classes)}"
+            )
+
     @abstractmethod
     def predict(self, X):
         pass
+
+    def predict_proba(self, X) -> np.ndarray:
+        """(n, n_classes) sınıf olasılıkları; sütun sırası classes_ ile aynıdır."""
+        raise ValueError(f"{type(self).__name__} olasılık tahmini desteklemiyor.")
+
+    @property
+    def classes_(self) -> np.ndarray:
+        return np.asarray(getattr(self._estimator(), "classes_", [0, 1]))
     
     @abstractmethod
     def save(self, path: str):
+        # Diske yazılan gerçek yolu döner (adapter uzantıyı .json/.keras yapabilir)
         pass
     
     @abstractmethod
@@ -28,41 +138,126 @@ class RandomForestAdapter(BaseMLModel):
     def __init__(self):
         self.model = None
 
+    COMPILED_SUFFIX = ".compiled.npz"
+
     def train(self, X, y, params: dict):
+        from sklearn.ensemble import RandomForestClassifier
         self.model = RandomForestClassifier(**params)
         self.model.fit(X, y)
+        self.compiled = None
         return {"algorithm": "RandomForest", "params": params}
 
+    def train_incremental(self, X, y, params: dict):
+        # warm_start: mevcut ağaçlar korunur, sadece yeni veriyle eğitilen ağaçlar eklenir
+        self.check_incremental_classes(y, self.model.classes_)
+        params = {k: v for k, v in params.items() if k != "warm_start"}
+        n_new = params.pop("n_estimators", 10)
+        n_old = len(self.model.estimators_)
+        self.model.set_params(**params, warm_start=True, n_estimators=n_old + n_new)
+        self.model.fit(X, y)
+        self.model.set_params(warm_start=False)
+        self.compiled = None
+        return {"algorithm": "RandomForest", "params": params, "added_trees": n_new, "total_trees": n_old + n_new}
+
+    def compile(self):
+        self.compiled = CompiledForest.from_sklearn(self.model)
+
+    def compiled_files(self, path):
+        return CompiledForest.files(path + self.COMPILED_SUFFIX)
+
     def predict(self, X):
+        X = self.transform(X)
+        if self.use_compiled(X):
+            return self.compiled.predict(X)
         return self.model.predict(X)
+
+    def predict_proba(self, X):
+        X = self.transform(X)
+        if self.use_compiled(X):
+            return self.compiled.predict_proba(X)
+        return self.model.predict_proba(X)
     
     def save(self, path):
         joblib.dump(self.model, path)
+        self.save_preprocessor(path)
+        self.save_compiled(path)
+        return path
         
     def load(self, path):
         self.model = joblib.load(path)
+        self.load_preprocessor(path)
+        compiled_path = path + self.COMPILED_SUFFIX
+        self.compiled = CompiledForest.load(compiled_path) if os.path.exists(compiled_path) else None
+
+    def load_shared(self, path):
+        # sklearn Tree'leri unpickle sırasında düğümleri kendi belleğine kopyalar (mmap_mode işe yaramaz);
+        # bu yüzden düzleştirilmiş orman paylaşılır
+        self._load_arrays(path, CompiledForest,
+                          lambda: self.compiled or CompiledForest.from_sklearn(self.model))
 
 # --- 2. XGBoost Adapter ---
 class XGBoostAdapter(BaseMLModel):
     def __init__(self):
         self.model = None
 
+    COMPILED_SUFFIX = ".compiled.ubj"
+
     def train(self, X, y, params: dict):
+        import xgboost as xgb
         self.model = xgb.XGBClassifier(**params)
         self.model.fit(X, y)
+        self.compiled = None
         return {"algorithm": "XGBoost", "params": params}
 
+    def train_incremental(self, X, y, params: dict):
+        # Mevcut booster'dan devam edilir; n_estimators yeni boosting turu sayısıdır
+        import xgboost as xgb
+        self.check_incremental_classes(y, self.model.classes_)
+        params = dict(params)
+        n_new = params.pop("n_estimators", 10)
+        n_old = self.model.get_booster().num_boosted_rounds()
+        model = xgb.XGBClassifier(**{**self.model.get_params(), **params, "n_estimators": n_new})
+        model.fit(X, y, xgb_model=self.model.get_booster())
+        self.model = model
+        self.compiled = None
+        return {"algorithm": "XGBoost", "params": params, "added_rounds": n_new, "total_rounds": n_old + n_new}
+
+    def compile(self):
+        self.compiled = CompiledBooster.from_xgboost(self.model)
+
+    def compiled_files(self, path):
+        return CompiledBooster.files(path + self.COMPILED_SUFFIX)
+
     def predict(self, X):
+        X = self.transform(X)
+        if self.use_compiled(X):
+            return self.compiled.predict(X)
         return self.model.predict(X)
 
+    def predict_proba(self, X):
+        X = self.transform(X)
+        if self.use_compiled(X):
+            return self.compiled.predict_proba(X)
+        return self.model.predict_proba(X)
+
     def save(self, path):
         if not path.endswith(".json"):
             path = path.replace(".pkl", ".json")
         self.model.save_model(path)
+        self.save_preprocessor(path)
+        self.save_compiled(path)
+        return path
         
     def load(self, path):
+        import xgboost as xgb
         self.model = xgb.XGBClassifier()
         self.model.load_model(path)
+        self.load_preprocessor(path)
+        compiled_path = path + self.COMPILED_SUFFIX
+        self.compiled = CompiledBooster.load(compiled_path) if os.path.exists(compiled_path) else None
+
+    def load_shared(self, path):
+        self._load_arrays(path, ArrayBooster, lambda: ArrayBooster.from_xgboost(self.model))
 
 # --- 3. Neural Network Adapter ---
 class NeuralNetworkAdapter(BaseMLModel):
@@ -70,6 +265,7 @@ class NeuralNetworkAdapter(BaseMLModel):
         self.model = None
 
     def train(self, X, y, params: dict):
+        import tensorflow as tf
         input_dim = X.shape[1]
         
         # TensorFlow Modern Çağırım Şekli
@@ -85,16 +281,32 @@ class NeuralNetworkAdapter(BaseMLModel):
         self.model.fit(X, y, epochs=epochs, batch_size=batch_size, verbose=0)
         return {"algorithm": "NeuralNetwork", "epochs": epochs}
 
+    def train_incremental(self, X, y, params: dict):
+        # .keras dosyası optimizer durumunu da içerir; fit kaldığı yerden devam eder
+        epochs = params.get('epochs', 10)
+        batch_size = params.get('batch_size', 32)
+        self.model.fit(X, y, epochs=epochs, batch_size=batch_size, verbose=0)
+        return {"algorithm": "NeuralNetwork", "epochs": epochs}
+
     def predict(self, X):
-        return (self.model.predict(X) > 0.5).astype(int)
+        return (self.model.predict(self.transform(X)) > 0.5).astype(int)
+
+    def predict_proba(self, X):
+        # Tek sigmoid çıkışı -> [P(0), P(1)]
+        proba = np.asarray(self.model.predict(self.transform(X), verbose=0)).reshape(-1)
+        return np.column_stack([1.0 - proba, proba])
 
     def save(self, path):
         if not path.endswith(".keras"):
             path = path.replace(".pkl", ".keras")
         self.model.save(path)
+        self.save_preprocessor(path)
+        return path
         
     def load(self, path):
+        import tensorflow as tf
         self.model = tf.keras.models.load_model(path)
+        self.load_preprocessor(path)
 
 # --- THE FACTORY ---
 class ModelFactory:
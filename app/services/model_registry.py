@@ -0,0 +1,262 @@
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from typing import List, Optional, Tuple
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.services.model_cache import model_cache, ModelCache
+
+# Kayıt adları klasör adı olarak kullanılır; "models/model.pkl" gibi yollarla karışmasın diye sadece harf/rakam/-/_
+NAME_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+# Versiyonlar da klasör adıdır; "../" gibi değerlerle registry dışına çıkılmasın
+VERSION_PATTERN = re.compile(r"^[0-9]+$")
+METADATA_FILE = "metadata.json"
+SERVING_FILE = "serving.json"
+
+
+def _write_json_atomic(path: str, data: dict):
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=4, default=str)
+    os.replace(tmp_path, path)
+
+
+class ModelRegistry:
+    """
+    Versiyonlu model kaydı.
+    {root}/{name}/versions/{n}/ : değişmez model dosyaları + metadata.json
+    {root}/{name}/serving.json  : trafiğe açık versiyonun işaretçisi (atomik olarak değiştirilir)
+
+    Servis tarafında her süreç kendi "aktif" versiyonunu tutar. İşaretçi değiştiğinde yeni
+    versiyon arka planda önbelleğe yüklenir; yüklenene kadar eski versiyon servis edilmeye
+    devam eder, sonra tek atamayla geçiş yapılır. Böylece deploy sırasında istekler ne
+    bekler ne de hata alır.
+    """
+
+    def __init__(self, root: str = settings.MODEL_REGISTRY_DIR, cache: ModelCache = model_cache):
+        self.root = root
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._metadata: dict = {}   # (name, version) -> metadata (dosyalar değişmez, bellekte tutulabilir)
+        self._pointers: dict = {}   # name -> (serving.json mtime_ns, version)
+        self._active: dict = {}     # name -> bu süreçte servis edilen versiyon
+        self._preloading: set = set()
+        self._failed: set = set()   # Yüklenemeyen (name, version); tekrar promote edilene kadar denenmez
+
+    # --- Yollar ---
+    def _model_dir(self, name: str) -> str:
+        if not NAME_PATTERN.match(name or ""):
+            raise ValueError(f"Geçersiz model adı: '{name}' (sadece harf, rakam, '-' ve '_')")
+        return os.path.join(self.root, name)
+
+    def _version_dir(self, name: str, version: str) -> str:
+        if not VERSION_PATTERN.match(str(version)):
+            raise ValueError(f"Geçersiz model versiyonu: '{version}' (pozitif tamsayı olmalı)")
+        return os.path.join(self._model_dir(name), "versions", str(version))
+
+    def is_registered(self, name: str) -> bool:
+        return bool(NAME_PATTERN.match(name or "")) and os.path.isdir(os.path.join(self.root, name, "versions"))
+
+    def artifact_path(self, metadata: dict) -> str:
+        return os.path.join(self._version_dir(metadata["name"], metadata["version"]), metadata["artifact"])
+
+    # --- Kayıt ---
+    def register(self, name: str, model_type: str, files: List[str], main_file: str, metadata: dict) -> dict:
+        """
+        Eğitilmiş modelin dosyalarını yeni bir versiyon olarak kaydeder ve metadata'yı döner.
+        Versiyon numarası os.mkdir ile ayrılır (eşzamanlı kayıtlar çakışmaz); metadata.json
+        en son yazılır, o yüzden yarım kalmış bir versiyon hiçbir zaman listelenmez.
+        """
+        versions_dir = os.path.join(self._model_dir(name), "versions")
+        os.makedirs(versions_dir, exist_ok=True)
+        while True:
+            existing = [int(v) for v in os.listdir(versions_dir) if v.isdigit()]
+            version = str(max(existing, default=0) + 1)
+            try:
+                os.mkdir(os.path.join(versions_dir, version))
+                break
+            except FileExistsError:
+                continue
+
+        version_dir = os.path.join(versions_dir, version)
+        for path in files:
+            target = os.path.join(version_dir, os.path.basename(path))
+            # Model dosyaları atomik değiştirildiği için hard link güvenli; farklı diskte kopyalanır.
+            # Link kaynakla aynı inode'u paylaşır; izin değişikliği sadece kopyaya uygulanır
+            try:
+                os.link(path, target)
+            except OSError:
+                shutil.copy2(path, target)
+                os.chmod(target, 0o444)
+
+        record = {
+            **metadata,
+            "name": name,
+            "version": version,
+            "model_type": model_type,
+            "artifact": os.path.basename(main_file),
+            "created_at": time.time(),
+            "metrics": None,
+        }
+        _write_json_atomic(os.path.join(version_dir, METADATA_FILE), record)
+        logger.info(f"Model kaydedildi: {name} v{version}")
+        return record
+
+    def update_metrics(self, name: str, version: str, metrics: dict) -> dict:
+        """test_model sonuçlarını metadata'ya yazar (model dosyaları değişmez)."""
+        return self._update_metadata(name, version, metrics=metrics, tested_at=time.time())
+
+    def update_run_id(self, name: str, version: str, run_id: str) -> dict:
+        """Asenkron MLflow kaydında run, versiyon kaydedildikten sonra oluşur; run_id sonradan yazılır."""
+        return self._update_metadata(name, version, mlflow_run_id=run_id)
+
+    def _update_metadata(self, name: str, version: str, **fields) -> dict:
+        record = {**self.get_version(name, version), **fields}
+        _write_json_atomic(os.path.join(self._version_dir(name, version), METADATA_FILE), record)
+        with self._lock:
+            self._metadata[(name, str(version))] = record
+        return record
+
+    # --- Okuma ---
+    def _cached_version(self, name: str, version: str) -> dict:
+        # Servis yolunda her istekte metadata.json okunmasın (model dosyaları zaten değişmez)
+        with self._lock:
+            record = self._metadata.get((name, str(version)))
+        return record if record is not None else self.get_version(name, version)
+
+    def get_version(self, name: str, version: str) -> dict:
+        key = (name, str(version))
+        try:
+            with open(os.path.join(self._version_dir(name, version), METADATA_FILE)) as f:
+                record = json.load(f)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Model versiyonu bulunamadı: {name} v{version}")
+        with self._lock:
+            self._metadata[key] = record
+        return record
+
+    def list_versions(self, name: str) -> List[dict]:
+        versions_dir = os.path.join(self._model_dir(name), "versions")
+        if not os.path.isdir(versions_dir):
+            raise FileNotFoundError(f"Kayıtlı model bulunamadı: {name}")
+        versions = sorted((int(v) for v in os.listdir(versions_dir) if v.isdigit()))
+        records = []
+        for version in versions:
+            try:
+                records.append(self.get_version(name, str(version)))
+            except FileNotFoundError:
+                continue  # Kaydı süren versiyon
+        return records
+
+    def list_models(self) -> List[dict]:
+        if not os.path.isdir(self.root):
+            return []
+        models = []
+        for name in sorted(os.listdir(self.root)):
+            if not self.is_registered(name):
+                continue
+            versions = self.list_versions(name)
+            models.append({
+                "name": name,
+                "serving_version": self.serving_version(name),
+                "latest_version": versions[-1]["version"] if versions else None,
+                "n_versions": len(versions),
+            })
+        return models
+
+    # --- Servis ---
+    def serving_version(self, name: str) -> Optional[str]:
+        """İşaretçiyi okur; dosya değişmediyse (mtime) bellekteki değer kullanılır."""
+        path = os.path.join(self._model_dir(name), SERVING_FILE)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        cached = self._pointers.get(name)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        with open(path) as f:
+            version = str(json.load(f)["version"])
+        self._pointers[name] = (mtime, version)
+        return version
+
+    def promote(self, name: str, version: str, preload: bool = True) -> dict:
+        """
+        Versiyonu "serving" yapar. preload=True ise model önce bu süreçte önbelleğe yüklenir,
+        işaretçi ancak ondan sonra değiştirilir. Diğer süreçler değişikliği bir sonraki
+        istekte görür ve yeni versiyonu arka planda yükler.
+        """
+        record = self.get_version(name, version)
+        if preload:
+            self.cache.get(self.artifact_path(record), record["model_type"], record["version"])
+
+        pointer = {"version": record["version"], "previous_version": self.serving_version(name),
+                   "promoted_at": time.time()}
+        _write_json_atomic(os.path.join(self._model_dir(name), SERVING_FILE), pointer)
+        with self._lock:
+            self._failed.discard((name, record["version"]))
+            if preload:
+                self._active[name] = record["version"]
+        logger.info(f"Model servise alındı: {name} v{record['version']} "
+                    f"(önceki: {pointer['previous_version']})")
+        return {"name": name, **pointer}
+
+    def resolve(self, name: str, version: Optional[str] = None) -> Tuple[str, dict]:
+        """
+        Tahmin için (artifact yolu, metadata) döner. version verilmezse serving versiyonu;
+        yeni versiyon henüz yüklenmediyse eski versiyon servis edilir.
+        """
+        if version is not None:
+            record = self._cached_version(name, version)
+            return self.artifact_path(record), record
+
+        target = self.serving_version(name)
+        if target is None:
+            raise FileNotFoundError(f"'{name}' için servis edilen versiyon yok, önce bir versiyonu promote edin.")
+
+        with self._lock:
+            active = self._active.get(name)
+        if active != target:
+            target_record = self._cached_version(name, target)
+            loaded = self.cache.contains(self.artifact_path(target_record), target)
+            if active is None or loaded:
+                # İlk istek (servis edilecek eski model yok) veya yeni model hazır: geçiş yap
+                with self._lock:
+                    self._active[name] = active = target
+            else:
+                self._start_preload(name, target_record)
+
+        record = self._cached_version(name, active)
+        return self.artifact_path(record), record
+
+    def _start_preload(self, name: str, record: dict):
+        key = (name, record["version"])
+        with self._lock:
+            if key in self._preloading or key in self._failed:
+                return
+            self._preloading.add(key)
+        threading.Thread(target=self._preload, args=(name, record), name=f"preload-{name}", daemon=True).start()
+
+    def _preload(self, name: str, record: dict):
+        try:
+            logger.info(f"Yeni serving versiyonu arka planda yükleniyor: {name} v{record['version']}")
+            self.cache.get(self.artifact_path(record), record["model_type"], record["version"])
+            with self._lock:
+                # Bu sırada başka bir versiyon promote edildiyse onu ezme
+                if self._pointers.get(name, (None, None))[1] == record["version"]:
+                    self._active[name] = record["version"]
+        except Exception as e:
+            with self._lock:
+                self._failed.add((name, record["version"]))
+            logger.error(f"Serving versiyonu yüklenemedi, eski versiyon kullanılmaya devam ediyor: "
+                         f"{name} v{record['version']} - {str(e)}")
+        finally:
+            with self._lock:
+                self._preloading.discard((name, record["version"]))
+
+
+# Global kayıt nesnesi
+model_registry = ModelRegistry()
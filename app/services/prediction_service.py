@@ -0,0 +1,185 @@
+import io
+import itertools
+import numpy as np
+import pandas as pd
+from typing import Iterator, List, Optional
+from app.schemas.prediction import PredictionInput
+from app.services.model_cache import model_cache, ModelCache
+from app.services.model_registry import model_registry, ModelRegistry
+from app.services.batcher import micro_batcher, MicroBatcher
+from app.services.admission import admission
+from app.services.model_factory import BaseMLModel
+from app.services.dataset_io import iter_table_chunks
+from app.services.wire_formats import decode_matrix, encode_predictions
+from app.services.result_cache import result_cache, PredictionResultCache
+from app.core.config import settings
+from app.core.metrics import stage_timer
+
+
+def check_feature_count(model_instance: BaseMLModel, X: np.ndarray):
+    expected = model_instance.n_features_in_
+    if expected is not None and X.shape[1] != expected:
+        raise ValueError(f"Model {expected} özellik bekliyor, {X.shape[1]} gönderildi.")
+
+
+def score_matrix(model_instance: BaseMLModel, X: np.ndarray):
+    """(n, d) matris için vektörel olarak (class_label, confidence) dizileri döner."""
+    check_feature_count(model_instance, X)
+    if model_instance.preprocessor is None and not model_instance.use_compiled(X):
+        # sklearn modelleri DataFrame ile eğitildiyse sütun isimlerini koru
+        # (preprocessor varsa model ham NumPy ile eğitildi; dönüşümü adapter uygular)
+        feature_names = model_instance.feature_names_in_
+        if feature_names is not None:
+            X = pd.DataFrame(X, columns=feature_names)
+
+    proba = np.asarray(model_instance.predict_proba(X))[:, -1]
+    labels = (proba > 0.5).astype(int)
+    confidences = np.where(labels == 1, proba, 1.0 - proba)
+    return labels, confidences
+
+
+def _to_output(label, confidence) -> dict:
+    return {"prediction": float(label), "class_label": int(label), "confidence": float(confidence)}
+
+
+class PredictionService:
+    def __init__(self, cache: ModelCache = model_cache, batcher: MicroBatcher = micro_batcher,
+                 registry: ModelRegistry = model_registry, results: PredictionResultCache = result_cache):
+        self.cache = cache
+        self.batcher = batcher
+        self.registry = registry
+        self.results = results
+
+    def get_model(self, model_id: str, model_type: str, version: Optional[str] = None, load: bool = True):
+        """
+        model_id bir registry adıysa serving (veya verilen) versiyonu, değilse dosya yolunu yükler.
+        (model, registry metadata'sı veya None, modelin tam versiyonunu tanımlayan anahtar) döner.
+        load=False ise model önbellekte değilse None döner.
+        """
+        record = None
+        if self.registry.is_registered(model_id):
+            model_id, record = self.registry.resolve(model_id, version)
+            model_type, version = record["model_type"], record["version"]
+        entry = self.cache.get_entry(model_id, model_type, version, load=load)
+        if entry is None:
+            return None
+        return entry[0], record, entry[1]
+
+    def _score_cached(self, model_key, model_instance: BaseMLModel, X: np.ndarray):
+        """score_matrix'in önbellekli hali: sadece önbellekte olmayan satırlar modele gider."""
+        if not settings.PREDICTION_CACHE_ENABLED:
+            return score_matrix(model_instance, X)
+        row_keys = self.results.row_keys(X)
+        cached = self.results.get_many(model_key, row_keys)
+        missing = [i for i, result in enumerate(cached) if result is None]
+        labels = np.empty(len(X), dtype=int)
+        confidences = np.empty(len(X), dtype=np.float64)
+        for i, result in enumerate(cached):
+            if result is not None:
+                labels[i], confidences[i] = result
+        if missing:
+            miss_labels, miss_confidences = score_matrix(model_instance, X[missing])
+            labels[missing], confidences[missing] = miss_labels, miss_confidences
+            self.results.put_many(model_key, [row_keys[i] for i in missing], miss_labels, miss_confidences)
+        return labels, confidences
+
+    @staticmethod
+    def _to_row(payload: PredictionInput) -> np.ndarray:
+        return np.asarray(payload.features, dtype=np.float64).reshape(1, -1)
+
+    def predict(self, payload: PredictionInput) -> dict:
+        model_instance, _, model_key = self.get_model(payload.model_id, payload.model_type, payload.version)
+        labels, confidences = self._score_cached(model_key, model_instance, self._to_row(payload))
+        return _to_output(labels[0], confidences[0])
+
+    async def predict_batched(self, payload: PredictionInput) -> dict:
+        # Önbellekteki model event loop'ta bulunur (sadece stat); yükleme gerekiyorsa disk I/O
+        # loop'u bloklamasın diye thread'de ve inference havuzundan slot alınarak yapılır.
+        # Skorlama batch'i MicroBatcher'da ayrıca bir kez kabul kontrolünden geçer.
+        model = self.get_model(payload.model_id, payload.model_type, payload.version, load=False)
+        if model is None:
+            model = await admission.run(
+                "inference", self.get_model, payload.model_id, payload.model_type, payload.version
+            )
+        model_instance, _, model_key = model
+        row = self._to_row(payload)
+        # Hatalı satır diğer isteklerin batch'ini bozmasın
+        check_feature_count(model_instance, row)
+
+        row_keys = None
+        if settings.PREDICTION_CACHE_ENABLED:
+            # Önbellekte varsa batch'e hiç girmeden dön
+            row_keys = self.results.row_keys(row)
+            cached = self.results.get_many(model_key, row_keys)[0]
+            if cached is not None:
+                return _to_output(*cached)
+
+        label, confidence = await self.batcher.submit(
+            id(model_instance), lambda X: score_matrix(model_instance, X), row
+        )
+        if row_keys is not None:
+            self.results.put_many(model_key, row_keys, [label], [confidence])
+        return _to_output(label, confidence)
+
+    # --- Çok satırlı ikili (binary) istekler ---
+    def predict_matrix(self, body: bytes, content_type: Optional[str], accept: Optional[str],
+                       model_id: str, model_type: str, version: Optional[str] = None,
+                       n_features: Optional[int] = None):
+        """
+        Arrow IPC / ham float32 / .npy / JSON gövdesini matrise çevirip tek predict çağrısıyla
+        skorlar. (yanıt gövdesi, media type) döner.
+        """
+        model_instance, record, model_key = self.get_model(model_id, model_type, version)
+        feature_columns = record.get("feature_columns") if record is not None else None
+        if n_features is None:
+            n_features = model_instance.n_features_in_ or (
+                len(feature_columns) if feature_columns else None)
+
+        with stage_timer("prediction_service", "decode"):
+            X = decode_matrix(body, content_type, n_features, feature_columns)
+        if X.ndim != 2 or len(X) == 0:
+            raise ValueError("İstek en az bir satırlık 2 boyutlu bir matris içermeli.")
+        with stage_timer("prediction_service", "predict_matrix"):
+            labels, confidences = self._score_cached(model_key, model_instance, X)
+        with stage_timer("prediction_service", "encode"):
+            return encode_predictions(labels, confidences, accept)
+
+    # --- Toplu Skorlama (Batch Scoring) ---
+    def iter_batch_predictions(self, file_obj, filename: str, model_id: str, model_type: str,
+                               feature_columns: Optional[List[str]] = None,
+                               chunksize: int = 50_000) -> Iterator[str]:
+        """
+        Dosyayı parça parça okuyup her parça için tek predict çağrısı yapar ve
+        sonuçları CSV metni olarak üretir. Bellek kullanımı chunksize ile sınırlıdır.
+        """
+        model_instance, record, _ = self.get_model(model_id, model_type)
+        if not feature_columns and record is not None:
+            feature_columns = record.get("feature_columns")
+        if not feature_columns:
+            names = model_instance.feature_names_in_
+            feature_columns = list(names) if names is not None else None
+        if not feature_columns:
+            raise ValueError("Model sütun isimlerini içermiyor, 'feature_columns' gönderilmeli.")
+
+        chunks = iter_table_chunks(file_obj, filename, feature_columns, chunksize)
+        # Hataların (eksik sütun vb.) yanıt başlamadan yakalanması için ilk parçayı önden oku
+        first_chunk = next(chunks, None)
+        return self._stream_predictions(model_instance, first_chunk, chunks, feature_columns)
+
+    def _stream_predictions(self, model_instance: BaseMLModel, first_chunk, chunks, feature_columns) -> Iterator[str]:
+        yield "row,class_label,confidence\n"
+        if first_chunk is None:
+            return
+        offset = 0
+        for chunk in itertools.chain([first_chunk], chunks):
+            X = chunk[feature_columns].to_numpy(dtype=np.float64)
+            labels, confidences = score_matrix(model_instance, X)
+            out = pd.DataFrame({
+                "row": np.arange(offset, offset + len(chunk)),
+                "class_label": labels,
+                "confidence": confidences,
+            })
+            offset += len(chunk)
+            buffer = io.StringIO()
+            out.to_csv(buffer, index=False, header=False)
+            yield buffer.getvalue()
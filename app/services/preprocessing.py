@@ -0,0 +1,121 @@
+import json
+import os
+from typing import Optional
+import numpy as np
+from app.schemas.config import PreprocessingConfig
+
+PREPROCESSOR_SUFFIX = ".preprocessor.json"
+
+
+def preprocessor_path(artifact_path: str) -> str:
+    """Model dosyasının yanında tutulan preprocessing dosyasının yolu."""
+    return artifact_path + PREPROCESSOR_SUFFIX
+
+
+class Preprocessor:
+    """
+    Train split üzerinde bir kez fit edilen impute + scale adımı.
+    İstatistikler sadece NumPy dizileri olarak tutulur; transform pandas kullanmadan
+    tek bir vektörel işlemle uygulanır, böylece eğitim ve servis aynı dönüşümü görür.
+    """
+
+    def __init__(self, impute_strategy: Optional[str] = None, scale_features: bool = False):
+        self.impute_strategy = impute_strategy
+        self.scale_features = scale_features
+        self.fill_values: Optional[np.ndarray] = None
+        self.mean: Optional[np.ndarray] = None
+        self.scale: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_config(cls, config: PreprocessingConfig) -> "Preprocessor":
+        return cls(impute_strategy=config.impute_strategy, scale_features=config.scale_features)
+
+    def fit(self, X) -> "Preprocessor":
+        X = np.asarray(X, dtype=np.float64)
+        if self.impute_strategy == "mean":
+            self.fill_values = np.nanmean(X, axis=0)
+        elif self.impute_strategy == "median":
+            self.fill_values = np.nanmedian(X, axis=0)
+        elif self.impute_strategy == "most_frequent":
+            self.fill_values = np.array([_most_frequent(col) for col in X.T])
+        if self.fill_values is not None:
+            # Tamamen boş sütunlar için 0 kullan
+            self.fill_values = np.nan_to_num(self.fill_values, nan=0.0)
+            X = self._impute(X)
+
+        if self.scale_features:
+            self.mean = np.nanmean(X, axis=0)
+            std = np.nanstd(X, axis=0)
+            self.scale = np.where(std > 0, std, 1.0)
+        return self
+
+    def _impute(self, X: np.ndarray) -> np.ndarray:
+        mask = np.isnan(X)
+        if mask.any():
+            X = np.where(mask, self.fill_values, X)
+        return X
+
+    def transform(self, X) -> np.ndarray:
+        X = np.array(X, dtype=np.float64)  # kopya: çağıranın verisi değişmesin
+        if self.fill_values is not None:
+            X = self._impute(X)
+        if self.scale is not None:
+            X -= self.mean
+            X /= self.scale
+        return X
+
+    # --- Serileştirme (model dosyasının yanında küçük bir JSON) ---
+    def to_dict(self) -> dict:
+        as_list = lambda a: None if a is None else a.tolist()
+        return {
+            "impute_strategy": self.impute_strategy,
+            "scale_features": self.scale_features,
+            "fill_values": as_list(self.fill_values),
+            "mean": as_list(self.mean),
+            "scale": as_list(self.scale),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Preprocessor":
+        obj = cls(data["impute_strategy"], data["scale_features"])
+        as_array = lambda v: None if v is None else np.asarray(v, dtype=np.float64)
+        obj.fill_values = as_array(data["fill_values"])
+        obj.mean = as_array(data["mean"])
+        obj.scale = as_array(data["scale"])
+        return obj
+
+    def save(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["Preprocessor"]:
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+def _most_frequent(column: np.ndarray) -> float:
+    values, counts = np.unique(column[~np.isnan(column)], return_counts=True)
+    return float(values[np.argmax(counts)]) if len(values) else np.nan
+
+
+def resample(X: np.ndarray, y, method: Optional[str], random_state: int = 42):
+    """Sınıf dengesizliği için sadece eğitim verisine uygulanır; servis sırasında kullanılmaz."""
+    if method is None:
+        return X, y
+    if method == "smote":
+        from imblearn.over_sampling import SMOTE
+        return SMOTE(random_state=random_state).fit_resample(X, y)
+    raise ValueError(f"Bilinmeyen dengeleme yöntemi: {method}")
+
+
+def fit_preprocessing(config: Optional[PreprocessingConfig], X, y):
+    """Config'e göre preprocessor'ı fit eder; (preprocessor, X, y) döner."""
+    if config is None:
+        return None, X, y
+    preprocessor = Preprocessor.from_config(config).fit(X)
+    X_t = preprocessor.transform(X)
+    X_t, y_t = resample(X_t, np.asarray(y), config.class_imbalance_method, config.random_state)
+    return preprocessor, X_t, y_t
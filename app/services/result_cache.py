@@ -0,0 +1,111 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+import numpy as np
+from app.core.config import settings
+from app.core.metrics import PREDICTION_CACHE_REQUESTS
+
+
+class PredictionResultCache:
+    """
+    Tahmin sonuçları önbelleği. Anahtar: (model versiyonu, özellik vektörünün hash'i).
+    round_decimals verilirse vektör önce yuvarlanır; böylece ölçüm gürültüsüyle farklılaşan
+    sensör değerleri aynı sonucu paylaşır. Adet sınırı aşılınca en eski kullanılan (LRU),
+    süresi dolan (TTL) kayıt atılır. Model anahtarı versiyonu içerdiği için yeni versiyon
+    eski sonuçları hiç görmez; registry birden fazla versiyonu aynı anda servis edebildiğinden
+    eski versiyonun kayıtları istek sırasında silinmez, LRU/TTL ile kendiliğinden düşer.
+    """
+
+    def __init__(self, max_items: int = settings.PREDICTION_CACHE_MAX_ITEMS,
+                 ttl_seconds: float = settings.PREDICTION_CACHE_TTL_S,
+                 round_decimals: Optional[int] = settings.PREDICTION_CACHE_ROUND_DECIMALS):
+        self.max_items = max_items
+        self.ttl = ttl_seconds
+        self.round_decimals = round_decimals
+        self._entries: "OrderedDict[Tuple[Hashable, bytes], Tuple[float, int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def row_keys(self, X: np.ndarray) -> list:
+        """Her satır için 16 baytlık hash (yuvarlama ve -0.0/0.0 normalizasyonu sonrası)."""
+        X = np.asarray(X, dtype=np.float64)
+        if self.round_decimals is not None:
+            X = np.round(X, self.round_decimals)
+        X = np.ascontiguousarray(X + 0.0)  # -0.0 -> 0.0
+        return [hashlib.blake2b(row.tobytes(), digest_size=16).digest() for row in X]
+
+    def get_many(self, model_key: Hashable, row_keys: list):
+        """Her satır için (label, confidence) veya None döner."""
+        now = time.monotonic()
+        results = []
+        with self._lock:
+            for row_key in row_keys:
+                key = (model_key, row_key)
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] < now:
+                    del self._entries[key]
+                    self.expirations += 1
+                    entry = None
+                if entry is None:
+                    results.append(None)
+                    continue
+                self._entries.move_to_end(key)
+                results.append(entry[1:])
+            hits = sum(r is not None for r in results)
+            self.hits += hits
+            self.misses += len(results) - hits
+        PREDICTION_CACHE_REQUESTS.labels("hit").inc(hits)
+        PREDICTION_CACHE_REQUESTS.labels("miss").inc(len(results) - hits)
+        return results
+
+    def put_many(self, model_key: Hashable, row_keys: list, labels, confidences):
+        expires_at = time.monotonic() + self.ttl if self.ttl else float("inf")
+        with self._lock:
+            for row_key, label, confidence in zip(row_keys, labels, confidences):
+                self._entries[(model_key, row_key)] = (expires_at, int(label), float(confidence))
+                self._entries.move_to_end((model_key, row_key))
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, model_id: Optional[str] = None):
+        """
+        Bir modelin (model anahtarındaki yol/id) ya da tüm modellerin sonuçlarını siler.
+        Tüm kayıtları taradığı için istek yolunda değil, yönetim işlemlerinde çağrılmalı.
+        """
+        with self._lock:
+            if model_id is None:
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+                return
+            stale = [key for key in self._entries if key[0][0] == model_id]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "enabled": settings.PREDICTION_CACHE_ENABLED,
+                "size": len(self._entries),
+                "max_items": self.max_items,
+                "ttl_seconds": self.ttl,
+                "round_decimals": self.round_decimals,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+# Global tahmin sonucu önbelleği
+result_cache = PredictionResultCache()
@@ -0,0 +1,139 @@
+import os
+import shutil
+import tempfile
+from typing import Optional
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.model_selection import ParameterGrid, ParameterSampler, StratifiedKFold, train_test_split
+from app.schemas.config import ModelConfig, SearchConfig, PreprocessingConfig
+from app.services.preprocessing import fit_preprocessing
+from app.services.model_factory import ModelFactory
+from app.services.metrics_engine import MetricsAccumulator
+from app.core.logging_config import logger
+
+# Ağaç modelleri kendi içinde de paralel çalışır; dış paralellikle çakışmasın
+_INNER_SINGLE_THREAD = {"random_forest": {"n_jobs": 1}, "xgboost": {"n_jobs": 1}}
+
+
+def _subsample(train_idx, y, n_samples: int, random_state: int):
+    """
+    Halving turları için fold'un train kısmından seed'li, sınıf oranlarını koruyan alt örnek.
+    Aynı fold'daki tüm adaylar aynı satırları görür; indeksler sıralı döner (memory-map sırayla okunur).
+    """
+    try:
+        subset, _ = train_test_split(train_idx, train_size=n_samples, stratify=y[train_idx],
+                                     random_state=random_state)
+    except ValueError:
+        # Çok az örnekli sınıf varsa tabakalama yapılamaz; rastgele alt örneğe düşülür
+        subset = np.random.default_rng(random_state).permutation(train_idx)[:n_samples]
+    return np.sort(subset)
+
+
+def _fit_and_score(data_dir: str, model_type: str, params: dict, train_idx, val_idx,
+                   n_samples: int, scoring: str, preprocessing: Optional[PreprocessingConfig],
+                   random_state: int = 42) -> float:
+    """Worker'da çalışır: veriyi memory-map ile açar, tek fold için eğitip skorlar."""
+    X = np.load(os.path.join(data_dir, "X.npy"), mmap_mode="r")
+    y = np.load(os.path.join(data_dir, "y.npy"), mmap_mode="r")
+    if n_samples < len(train_idx):
+        train_idx = _subsample(train_idx, y, n_samples, random_state)
+
+    # Preprocessing her fold'un kendi train kısmında fit edilir (validasyona sızıntı olmasın)
+    preprocessor, X_fit, y_fit = fit_preprocessing(preprocessing, X[train_idx], y[train_idx])
+    model_instance = ModelFactory.get_model({"type": model_type})
+    model_instance.preprocessor = preprocessor
+    model_instance.train(X_fit, y_fit, params)
+    proba = model_instance.predict_proba(X[val_idx])
+    classes = model_instance.classes_
+    metrics = MetricsAccumulator(classes, [scoring])
+    metrics.update(y[val_idx], classes[np.argmax(proba, axis=1)], proba)
+    score = metrics.result(include_details=False)[scoring]
+    # Tek sınıflı validasyon fold'unda roc_auc tanımsız; aramayı bozmasın
+    return 0.0 if score is None else float(score)
+
+
+class SearchService:
+    """
+    Aday parametreler x CV fold'larını tüm çekirdeklere dağıtarak hiperparametre
+    araması yapar. Eğitim verisi bir kez .npy olarak diske yazılır, worker'lar
+    kopyalamak yerine memory-map ile okur.
+    """
+
+    def _candidates(self, base_params: dict, search: SearchConfig):
+        if search.strategy == "random":
+            sampled = ParameterSampler(search.param_grid, n_iter=search.n_iter,
+                                       random_state=search.random_state)
+        else:
+            sampled = ParameterGrid(search.param_grid)
+        return [{**base_params, **candidate} for candidate in sampled]
+
+    def _evaluate(self, parallel, data_dir, algorithm: ModelConfig, candidates, folds,
+                  n_samples: int, search: SearchConfig, preprocessing: Optional[PreprocessingConfig]):
+        inner = _INNER_SINGLE_THREAD.get(algorithm.type, {}) if search.n_jobs != 1 else {}
+        tasks = [
+            delayed(_fit_and_score)(data_dir, algorithm.type, {**params, **inner},
+                                    train_idx, val_idx, n_samples, search.scoring, preprocessing,
+                                    search.random_state)
+            for params in candidates for train_idx, val_idx in folds
+        ]
+        scores = np.asarray(parallel(tasks)).reshape(len(candidates), len(folds))
+        return scores.mean(axis=1), scores.std(axis=1)
+
+    def search(self, X, y, algorithm: ModelConfig, search: SearchConfig,
+               preprocessing: Optional[PreprocessingConfig] = None) -> dict:
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        # Worker'lar y'yi memory-map ile açar; object (metin) dizileri map'lenemez. Etiketler
+        # 0..k-1 kodlarına çevrilir (sıralama sklearn'ün classes_ sırasıyla aynı). Sonuçlarda
+        # sadece parametre ve skorlar olduğu için geri çevrilecek etiket yoktur.
+        _, y = np.unique(np.asarray(y), return_inverse=True)
+        y = np.ascontiguousarray(y.ravel(), dtype=np.int64)
+        folds = list(StratifiedKFold(n_splits=search.cv_folds, shuffle=True,
+                                     random_state=search.random_state).split(X, y))
+        candidates = self._candidates(algorithm.params, search)
+        logger.info(f"Hiperparametre araması: {search.strategy}, {len(candidates)} aday x {search.cv_folds} fold")
+
+        data_dir = tempfile.mkdtemp(prefix="search_")
+        trials = []
+        try:
+            np.save(os.path.join(data_dir, "X.npy"), X)
+            np.save(os.path.join(data_dir, "y.npy"), y)
+            full_size = min(len(train_idx) for train_idx, _ in folds)
+
+            with Parallel(n_jobs=search.n_jobs) as parallel:
+                if search.strategy == "halving":
+                    # Her turda en iyi 1/factor aday kalır, örnek sayısı factor katına çıkar
+                    n_rounds = max(int(np.ceil(np.log(len(candidates)) / np.log(search.halving_factor))), 0)
+                    n_samples = max(full_size // (search.halving_factor ** n_rounds), search.cv_folds * 2)
+                    round_idx = 0
+                    while True:
+                        means, stds = self._evaluate(parallel, data_dir, algorithm, candidates,
+                                                     folds, n_samples, search, preprocessing)
+                        trials.extend(
+                            {"params": p, "mean_score": float(m), "std_score": float(s),
+                             "n_samples": int(min(n_samples, full_size)), "round": round_idx}
+                            for p, m, s in zip(candidates, means, stds)
+                        )
+                        if len(candidates) == 1 or n_samples >= full_size:
+                            break
+                        keep = max(len(candidates) // search.halving_factor, 1)
+                        order = np.argsort(-means)[:keep]
+                        candidates = [candidates[i] for i in order]
+                        n_samples *= search.halving_factor
+                        round_idx += 1
+                else:
+                    means, stds = self._evaluate(parallel, data_dir, algorithm, candidates,
+                                                 folds, full_size, search, preprocessing)
+                    trials.extend(
+                        {"params": p, "mean_score": float(m), "std_score": float(s),
+                         "n_samples": int(full_size), "round": 0}
+                        for p, m, s in zip(candidates, means, stds)
+                    )
+        finally:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+        # Halving'de sadece son turu (en çok veriyle) karşılaştır
+        last_round = max(t["round"] for t in trials)
+        best = max((t for t in trials if t["round"] == last_round), key=lambda t: t["mean_score"])
+        logger.info(f"En iyi parametreler: {best['params']} ({search.scoring}={best['mean_score']:.4f})")
+        return {"best_params": best["params"], "best_score": best["mean_score"],
+                "scoring": search.scoring, "n_trials": len(trials), "trials": trials}
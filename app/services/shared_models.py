@@ -0,0 +1,101 @@
+import hashlib
+import os
+import shutil
+import time
+from typing import Callable, Dict
+import numpy as np
+from app.core.config import settings
+from app.core.logging_config import logger
+
+_PAGE_SIZE = 4096
+
+
+def _source_key(path: str) -> str:
+    real_path = os.path.realpath(path)
+    return hashlib.blake2b(real_path.encode(), digest_size=8).hexdigest()
+
+
+def shared_dir(path: str, root: str = settings.MODEL_SHARED_DIR) -> str:
+    """
+    Model dosyasının paylaşımlı dizi klasörü. Ad, dosyanın gerçek yolu + mtime + boyutundan
+    türetilir; aynı yola yeniden eğitilen model yeni bir klasör alır.
+    """
+    stat = os.stat(path)
+    return os.path.join(root, f"{_source_key(path)}-{stat.st_mtime_ns}-{stat.st_size}")
+
+
+def _export(directory: str, arrays: Dict[str, np.ndarray]):
+    # Tüm diziler geçici klasöre yazılır, klasör tek rename ile yerine konur:
+    # diğer worker'lar ya hiç görmez ya da tamamını görür
+    tmp_dir = f"{directory}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    for name, values in arrays.items():
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), values, allow_pickle=False)
+    try:
+        os.rename(tmp_dir, directory)
+    except OSError:
+        # Başka bir worker aynı modeli önce yazdı; onunkini kullan
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return
+    logger.info(f"Model dizileri paylaşımlı belleğe aktarıldı: {directory}")
+
+
+def _remove_stale(directory: str, grace_s: float):
+    """
+    Aynı kaynak dosyanın eski versiyonlarına ait klasörleri (ve çöken worker'lardan kalan
+    geçici klasörleri) siler. Her yükleme klasörün mtime'ını günceller; son grace_s saniyede
+    kullanılan klasöre dokunulmaz, eski dosya yolunu henüz açmakta olan worker'lar etkilenmez.
+    Açılmış memory-map'ler dosya silinse de geçerli kalır.
+    """
+    root, name = os.path.split(directory)
+    prefix = name.split("-")[0] + "-"
+    now = time.time()
+    for other in os.listdir(root):
+        if not other.startswith(prefix) or other == name:
+            continue
+        other_path = os.path.join(root, other)
+        try:
+            idle = now - os.stat(other_path).st_mtime
+        except FileNotFoundError:
+            continue
+        if idle >= grace_s:
+            shutil.rmtree(other_path, ignore_errors=True)
+            logger.info(f"Kullanılmayan paylaşımlı model klasörü silindi: {other_path}")
+
+
+def _open_arrays(directory: str) -> Dict[str, np.ndarray]:
+    arrays = {}
+    for name in os.listdir(directory):
+        if not name.endswith(".npy"):
+            continue
+        file_path = os.path.join(directory, name)
+        # Bir sayfadan küçük diziler (derinlik, sınıflar vb.) doğrudan belleğe okunur
+        mmap_mode = "r" if os.path.getsize(file_path) > _PAGE_SIZE else None
+        arrays[name[:-len(".npy")]] = np.load(file_path, mmap_mode=mmap_mode, allow_pickle=False)
+    return arrays
+
+
+def load_shared_arrays(path: str, build: Callable[[], Dict[str, np.ndarray]],
+                       root: str = settings.MODEL_SHARED_DIR,
+                       grace_s: float = settings.MODEL_SHARED_GRACE_S) -> Dict[str, np.ndarray]:
+    """
+    Modelin dizilerini salt okunur memory-map olarak açar. Klasör yoksa build() ile bir kez
+    üretilip yazılır (ilk yükleyen worker öder). Sayfalar işletim sisteminin page cache'inden
+    gelir; aynı makinedeki tüm worker'lar modelin tek kopyasını paylaşır.
+    """
+    for attempt in range(2):
+        directory = shared_dir(path, root)
+        if not os.path.isdir(directory):
+            os.makedirs(root, exist_ok=True)
+            _export(directory, build())
+        try:
+            os.utime(directory)  # Son kullanım: temizlik bu klasörü grace_s boyunca silmez
+            arrays = _open_arrays(directory)
+            break
+        except FileNotFoundError:
+            # Klasör açılırken temizlendi (model dosyası bu arada değişti); yeniden denenir
+            if attempt:
+                raise
+    _remove_stale(directory, grace_s)
+    return arrays
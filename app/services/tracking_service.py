@@ -0,0 +1,242 @@
+import os
+import queue
+import shutil
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.core.metrics import TRACKING_QUEUE_DEPTH, TRACKING_RECORDS, stage_timer
+
+# MLflow tek log_batch çağrısında en fazla 100 parametre / 1000 metrik kabul eder
+_MAX_PARAMS_PER_BATCH = 100
+_MAX_METRICS_PER_BATCH = 1000
+
+
+class TrackingRecord:
+    """
+    Bir eğitimin MLflow'a yazılacak her şeyi: parametreler, metrikler, tag'ler,
+    diske zaten kaydedilmiş artifact dosyaları ve (arama denemeleri için) child run'lar.
+    """
+
+    def __init__(self, experiment_name: str):
+        self.tracking_id = uuid.uuid4().hex
+        self.experiment_name = experiment_name
+        self.params: Dict[str, str] = {}
+        self.metrics: Dict[str, float] = {}
+        self.tags: Dict[str, str] = {"tracking_id": self.tracking_id}
+        self.artifacts: List[str] = []
+        self.children: List[dict] = []
+        self.staging_dir: Optional[str] = None
+        self.created_at = time.time()
+        # Tekrar denemelerde aynı run'ın tekrar açılmaması için yazılan adımlar saklanır
+        self.run_id: Optional[str] = None
+        self.done_steps: set = set()
+        self.attempts = 0
+        # Run oluşunca run_id ile çağrılır (örn. registry metadata'sına yazmak için)
+        self.on_run_created: List[Callable[[str], None]] = []
+
+    def log_params(self, params: dict, prefix: str = ""):
+        self.params.update({f"{prefix}{k}": str(v) for k, v in params.items()})
+
+    def log_metric(self, key: str, value: float):
+        self.metrics[key] = float(value)
+
+    def add_child(self, run_name: str, params: dict, metrics: dict):
+        self.children.append({"run_name": run_name, "params": params, "metrics": metrics})
+
+    def stage_artifacts(self, files: List[str], staging_root: str = settings.MLFLOW_STAGING_DIR):
+        """
+        Modelin diske yazılmış dosyalarını ikinci kez serialize etmeden loglamak için
+        staging klasörüne hard link ile bağlar (farklı diskte ise kopyalar). Model dosyaları
+        atomik olarak değiştirildiğinden, aynı yola yeniden eğitim bu kopyayı bozmaz.
+        """
+        self.staging_dir = os.path.join(staging_root, self.tracking_id)
+        os.makedirs(self.staging_dir, exist_ok=True)
+        for path in files:
+            target = os.path.join(self.staging_dir, os.path.basename(path))
+            try:
+                os.link(path, target)
+            except OSError:
+                shutil.copy2(path, target)
+            self.artifacts.append(target)
+
+
+class TrackingQueue:
+    """
+    MLflow kayıtlarını arka plan thread'inde yazar; eğitim isteği tracking store'un
+    hızını beklemez. Kuyruktaki kayıtlar toplu olarak alınır, her run tek log_batch
+    çağrısıyla yazılır ve hata olursa artan beklemeyle tekrar denenir.
+    """
+
+    def __init__(self, max_size: int = settings.MLFLOW_LOG_QUEUE_SIZE,
+                 max_retries: int = settings.MLFLOW_LOG_MAX_RETRIES,
+                 retry_backoff: float = settings.MLFLOW_LOG_RETRY_BACKOFF_S,
+                 batch_size: int = settings.MLFLOW_LOG_BATCH_SIZE):
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.batch_size = batch_size
+        self._queue: "queue.Queue[TrackingRecord]" = queue.Queue(maxsize=max_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._client = None
+        self._experiment_ids: Dict[str, str] = {}
+        self.logged = 0
+        self.failed = 0
+
+    # --- Üretici tarafı ---
+    def submit(self, record: TrackingRecord, wait: bool = False) -> Optional[str]:
+        """
+        Kaydı kuyruğa ekler. wait=True (veya MLFLOW_ASYNC_LOGGING kapalıysa) kayıt
+        hemen bu thread'de yazılır ve run_id döner.
+        """
+        if wait or not settings.MLFLOW_ASYNC_LOGGING:
+            self._process(record)
+            return record.run_id
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            # Kuyruk doluysa eğitimi bekletmek yerine kaydı düşür ama iz bırak
+            TRACKING_RECORDS.labels("dropped").inc()
+            logger.error(f"MLflow kuyruğu dolu, kayıt düşürüldü: {record.tracking_id}")
+            self._cleanup(record)
+            return None
+        TRACKING_QUEUE_DEPTH.set(self._queue.qsize())
+        return None
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Kuyruktaki tüm kayıtlar yazılana kadar bekler. Zaman aşımında False döner."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                logger.warning(f"MLflow kuyruğu boşaltılamadı, bekleyen kayıt: {self._queue.unfinished_tasks}")
+                return False
+            time.sleep(0.05)
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "pending": self._queue.unfinished_tasks,
+            "logged": self.logged,
+            "failed": self.failed,
+        }
+
+    # --- Tüketici tarafı ---
+    def _ensure_worker(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, name="mlflow-logger", daemon=True)
+                self._thread.start()
+
+    def _worker(self):
+        while True:
+            batch = [self._queue.get()]
+            # Bekleyen diğer kayıtları da al; hepsi tek uyanışta yazılır
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            for record in batch:
+                try:
+                    self._process(record)
+                finally:
+                    self._queue.task_done()
+            TRACKING_QUEUE_DEPTH.set(self._queue.qsize())
+
+    def _process(self, record: TrackingRecord):
+        while True:
+            record.attempts += 1
+            try:
+                with stage_timer("tracking", "log_run"):
+                    self._write(record)
+                self.logged += 1
+                TRACKING_RECORDS.labels("logged").inc()
+                logger.info(f"MLflow kaydı tamamlandı: run_id={record.run_id} "
+                            f"(gecikme {time.time() - record.created_at:.2f}s)")
+                break
+            except Exception as e:
+                if record.attempts > self.max_retries:
+                    self.failed += 1
+                    TRACKING_RECORDS.labels("failed").inc()
+                    logger.error(f"MLflow kaydı başarısız ({record.attempts} deneme): "
+                                 f"{record.tracking_id} - {str(e)}")
+                    break
+                TRACKING_RECORDS.labels("retry").inc()
+                delay = self.retry_backoff * 2 ** (record.attempts - 1)
+                logger.warning(f"MLflow kaydı tekrar denenecek ({delay:.1f}s sonra): {str(e)}")
+                time.sleep(delay)
+        self._cleanup(record)
+
+    def _get_client(self):
+        if self._client is None:
+            from mlflow.tracking import MlflowClient
+            self._client = MlflowClient()
+        return self._client
+
+    def _experiment_id(self, name: str) -> str:
+        if name not in self._experiment_ids:
+            client = self._get_client()
+            experiment = client.get_experiment_by_name(name)
+            self._experiment_ids[name] = (
+                experiment.experiment_id if experiment is not None else client.create_experiment(name)
+            )
+        return self._experiment_ids[name]
+
+    def _write(self, record: TrackingRecord):
+        client = self._get_client()
+        experiment_id = self._experiment_id(record.experiment_name)
+
+        if record.run_id is None:
+            run = client.create_run(experiment_id, start_time=int(record.created_at * 1000), tags=record.tags)
+            record.run_id = run.info.run_id
+            for callback in record.on_run_created:
+                try:
+                    callback(record.run_id)
+                except Exception as e:
+                    # Run'ın kendisi yazılmaya devam etsin; run tags.tracking_id ile de bulunur
+                    logger.warning(f"run_id geri bildirimi başarısız: {record.tracking_id} - {str(e)}")
+
+        if "data" not in record.done_steps:
+            self._log_batch(client, record.run_id, record.params, record.metrics)
+            record.done_steps.add("data")
+
+        for i, child in enumerate(record.children):
+            step = f"child_{i}"
+            if step in record.done_steps:
+                continue
+            child_run = client.create_run(experiment_id, run_name=child["run_name"],
+                                          tags={"mlflow.parentRunId": record.run_id})
+            self._log_batch(client, child_run.info.run_id,
+                            {k: str(v) for k, v in child["params"].items()}, child["metrics"])
+            client.set_terminated(child_run.info.run_id)
+            record.done_steps.add(step)
+
+        if "artifacts" not in record.done_steps:
+            for path in record.artifacts:
+                client.log_artifact(record.run_id, path, artifact_path="model")
+            record.done_steps.add("artifacts")
+
+        client.set_terminated(record.run_id)
+
+    @staticmethod
+    def _log_batch(client, run_id: str, params: dict, metrics: dict):
+        from mlflow.entities import Metric, Param
+        timestamp = int(time.time() * 1000)
+        param_list = [Param(k, v) for k, v in params.items()]
+        metric_list = [Metric(k, v, timestamp, 0) for k, v in metrics.items()]
+        for start in range(0, len(param_list), _MAX_PARAMS_PER_BATCH):
+            client.log_batch(run_id, params=param_list[start:start + _MAX_PARAMS_PER_BATCH])
+        for start in range(0, len(metric_list), _MAX_METRICS_PER_BATCH):
+            client.log_batch(run_id, metrics=metric_list[start:start + _MAX_METRICS_PER_BATCH])
+
+    @staticmethod
+    def _cleanup(record: TrackingRecord):
+        if record.staging_dir:
+            shutil.rmtree(record.staging_dir, ignore_errors=True)
+
+
+# Global kuyruk nesnesi
+tracking_queue = TrackingQueue()
@@ -0,0 +1,122 @@
+import io
+from typing import List, Optional, Tuple
+import numpy as np
+import orjson
+
+# Yüksek hacimli tahmin trafiği için istek/yanıt formatları
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+ARROW_FILE = "application/vnd.apache.arrow.file"
+NPY = "application/x-npy"
+FLOAT32 = "application/octet-stream"  # Ham little-endian float32, satır satır (row-major)
+JSON = "application/json"
+
+REQUEST_FORMATS = (ARROW_STREAM, ARROW_FILE, NPY, FLOAT32, JSON)
+
+
+def _media_type(header: Optional[str]) -> str:
+    # "application/json; charset=utf-8" -> "application/json"
+    return (header or "").split(";")[0].strip().lower()
+
+
+def _from_float32(body: bytes, n_features: Optional[int]) -> np.ndarray:
+    if not n_features:
+        raise ValueError("Ham float32 gövdesi için özellik sayısı (n_features) gerekli.")
+    if len(body) % (4 * n_features):
+        raise ValueError(f"Gövde boyutu ({len(body)} bayt) {n_features} özellikli float32 satırlarına bölünmüyor.")
+    return np.frombuffer(body, dtype="<f4").reshape(-1, n_features)
+
+
+def _from_npy(body: bytes) -> np.ndarray:
+    # np.load BytesIO'dan okurken kopyalar; başlığı okuyup veriyi doğrudan gövdeden görüntülüyoruz
+    buffer = io.BytesIO(body)
+    version = np.lib.format.read_magic(buffer)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(buffer)
+    elif version == (2, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(buffer)
+    else:
+        return np.load(io.BytesIO(body), allow_pickle=False)
+    if dtype.hasobject:
+        raise ValueError(".npy içinde nesne dizisi kabul edilmez.")
+    count = int(np.prod(shape)) if shape else 1
+    X = np.frombuffer(body, dtype=dtype, count=count, offset=buffer.tell())
+    X = X.reshape(shape, order="F" if fortran_order else "C")
+    return X.reshape(1, -1) if X.ndim == 1 else X
+
+
+def _from_arrow(body: bytes, media_type: str, feature_columns: Optional[List[str]]) -> np.ndarray:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    source = pa.py_buffer(body)
+    reader = ipc.open_stream(source) if media_type == ARROW_STREAM else ipc.open_file(source)
+    table = reader.read_all()
+
+    # Tek FixedSizeList<float> sütunu: değer buffer'ı doğrudan (n, d) matris olarak görüntülenir
+    if table.num_columns == 1 and pa.types.is_fixed_size_list(table.schema.field(0).type):
+        column = table.column(0).combine_chunks()
+        if column.null_count:
+            raise ValueError("Özellik listesinde boş (null) satır var.")
+        return column.flatten().to_numpy(zero_copy_only=False).reshape(len(column), column.type.list_size)
+
+    # Sütun başına bir özellik: sütunlar tek kopyayla matrise yazılır
+    if feature_columns:
+        missing = [c for c in feature_columns if c not in table.column_names]
+        if missing:
+            raise ValueError(f"Arrow tablosunda eksik sütunlar: {missing}")
+        table = table.select(feature_columns)
+    columns = [table.column(i).to_numpy() for i in range(table.num_columns)]
+    X = np.empty((table.num_rows, table.num_columns), dtype=np.result_type(*columns))
+    for i, values in enumerate(columns):
+        X[:, i] = values
+    return X
+
+
+def decode_matrix(body: bytes, content_type: Optional[str], n_features: Optional[int] = None,
+                  feature_columns: Optional[List[str]] = None) -> np.ndarray:
+    """
+    İstek gövdesini Content-Type'a göre (n, d) NumPy matrisine çevirir. Ham float32 ve .npy
+    gövdeleri kopyalanmadan (salt okunur) görüntülenir; JSON sadece geriye uyumluluk içindir.
+    Sayısal olmayan (metin, tarih vb.) matrisler ValueError ile reddedilir.
+    """
+    X = _decode(body, _media_type(content_type), n_features, feature_columns)
+    if X.dtype.kind not in "biuf":
+        raise ValueError(f"Özellikler sayısal olmalı, gelen veri tipi: {X.dtype}")
+    return X
+
+
+def _decode(body: bytes, media_type: str, n_features: Optional[int],
+            feature_columns: Optional[List[str]]) -> np.ndarray:
+    if media_type == FLOAT32:
+        return _from_float32(body, n_features)
+    if media_type == NPY:
+        return _from_npy(body)
+    if media_type in (ARROW_STREAM, ARROW_FILE):
+        return _from_arrow(body, media_type, feature_columns)
+    if media_type == JSON:
+        payload = orjson.loads(body)
+        rows = payload["features"] if isinstance(payload, dict) else payload
+        X = np.asarray(rows, dtype=np.float64)
+        return X.reshape(1, -1) if X.ndim == 1 else X
+    raise ValueError(f"Desteklenmeyen Content-Type: '{media_type}'. Desteklenenler: {', '.join(REQUEST_FORMATS)}")
+
+
+def encode_predictions(labels: np.ndarray, confidences: np.ndarray, accept: Optional[str]) -> Tuple[bytes, str]:
+    """Sonuçları Accept başlığına göre Arrow IPC stream veya orjson ile kodlar. (gövde, media type) döner."""
+    if ARROW_STREAM in (accept or ""):
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+        batch = pa.record_batch([
+            pa.array(np.asarray(labels, dtype=np.int32)),
+            pa.array(np.asarray(confidences, dtype=np.float32)),
+        ], names=["class_label", "confidence"])
+        sink = pa.BufferOutputStream()
+        with ipc.new_stream(sink, batch.schema) as writer:
+            writer.write_batch(batch)
+        return sink.getvalue().to_pybytes(), ARROW_STREAM
+
+    body = orjson.dumps(
+        {"class_label": np.asarray(labels, dtype=np.int32),
+         "confidence": np.asarray(confidences, dtype=np.float64)},
+        option=orjson.OPT_SERIALIZE_NUMPY,
+    )
+    return body, JSON
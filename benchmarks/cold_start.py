@@ -0,0 +1,52 @@
+"""
+API açılış (cold-start) ölçümü.
+
+Her denemede temiz bir Python süreci açıp `app.main`'i import eder; import süresini,
+sürecin tepe belleğini (RSS) ve hangi ML backend'lerinin yüklendiğini raporlar.
+
+Kullanım:
+    python -m benchmarks.cold_start --runs 5
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+BACKENDS = ["tensorflow", "xgboost", "sklearn", "mlflow", "imblearn"]
+
+PROBE = f"""
+import json, resource, sys, time
+t0 = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - t0
+print(json.dumps({{
+    "import_seconds": elapsed,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "loaded_backends": [m for m in {BACKENDS!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure(runs: int) -> dict:
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", PROBE], capture_output=True, text=True, check=True)
+        samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {
+        "runs": runs,
+        "import_seconds_median": statistics.median(s["import_seconds"] for s in samples),
+        "max_rss_mb_median": statistics.median(s["max_rss_mb"] for s in samples),
+        "loaded_backends": samples[-1]["loaded_backends"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FastAPI ML Service cold-start ölçümü")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(measure(args.runs), indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+app/schemas/config.json'daki toprak verimliliği şemasına benzeyen sentetik veri üretimi.
+Aynı seed ve boyut her zaman aynı veriyi üretir; böylece commit'ler arası ölçümler karşılaştırılabilir.
+"""
+import os
+import numpy as np
+import pandas as pd
+
+FEATURE_COLUMNS = ["temperature", "humidity", "soil_moisture", "rain", "pH", "fertilizer_used"]
+TARGET_COLUMN = "target"
+CHUNK_ROWS = 1_000_000
+
+
+def _chunk(rng: np.random.Generator, n: int) -> pd.DataFrame:
+    temperature = rng.normal(22, 6, n)
+    humidity = rng.uniform(20, 95, n)
+    soil_moisture = np.clip(rng.normal(35, 12, n), 0, 100)
+    rain = rng.gamma(2.0, 4.0, n)
+    ph = np.clip(rng.normal(6.5, 0.7, n), 3.5, 9.5)
+    fertilizer = rng.integers(0, 2, n)
+    # Hedef: özelliklerin doğrusal olmayan bir birleşimi + gürültü
+    score = (
+        0.04 * (soil_moisture - 35)
+        - 0.6 * np.abs(ph - 6.5)
+        + 0.02 * (humidity - 55)
+        + 0.8 * fertilizer
+        + 0.03 * rain
+        - 0.002 * (temperature - 22) ** 2
+        + rng.normal(0, 0.5, n)
+    )
+    df = pd.DataFrame({
+        "temperature": temperature,
+        "humidity": humidity,
+        "soil_moisture": soil_moisture,
+        "rain": rain,
+        "pH": ph,
+        "fertilizer_used": fertilizer,
+        TARGET_COLUMN: (score > 0.3).astype(np.int64),
+    })
+    # Gerçek sensör verisindeki gibi az miktarda eksik değer
+    missing = rng.random(n) < 0.01
+    df.loc[missing, "humidity"] = np.nan
+    return df
+
+
+def make_dataset(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    return _chunk(np.random.default_rng(seed), n_rows)
+
+
+def write_dataset(n_rows: int, directory: str, fmt: str = "csv", seed: int = 42) -> str:
+    """
+    Veri setini diske yazar ve yolunu döner. Büyük boyutlar (10M satır) bellek
+    kullanımını sınırlamak için parça parça üretilir. Dosya zaten varsa tekrar üretilmez.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"soil_{n_rows}_{seed}.{fmt}")
+    if os.path.exists(path):
+        return path
+
+    rng = np.random.default_rng(seed)
+    tmp_path = path + ".tmp"
+    if fmt == "csv":
+        written = 0
+        while written < n_rows:
+            n = min(CHUNK_ROWS, n_rows - written)
+            _chunk(rng, n).to_csv(tmp_path, mode="a", header=(written == 0), index=False)
+            written += n
+    elif fmt == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        writer = None
+        written = 0
+        while written < n_rows:
+            n = min(CHUNK_ROWS, n_rows - written)
+            table = pa.Table.from_pandas(_chunk(rng, n), preserve_index=False)
+            writer = writer or pq.ParquetWriter(tmp_path, table.schema)
+            writer.write_table(table)
+            written += n
+        writer.close()
+    else:
+        raise ValueError(f"Desteklenmeyen format: {fmt}")
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,302 @@
+"""
+Veri alma, eğitim ve tahmin sıcak yolları için tekrarlanabilir benchmark.
+
+Ölçülenler (her veri boyutu için):
+  ingest   : CSV / Parquet parse, DataService.process_data (temizlik + split + kayıt)
+  model    : her adapter için fit süresi, toplu tahmin hızı, tek satır gecikmesi (p50/p99)
+  http     : uvicorn üzerinden /predict uçtan uca gecikme ve throughput (yerel yük üreteci)
+  startup  : app.main import süresi ve bellek
+
+Sonuçlar düz bir JSON'a yazılır; --compare ile önceki bir baseline'a karşı
+gerilemeler raporlanır (gerileme varsa çıkış kodu 1).
+
+Örnekler:
+    python -m benchmarks.run --sizes 1000,100000 --output benchmarks/results/baseline.json
+    python -m benchmarks.run --sizes 1000,100000 --compare benchmarks/results/baseline.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.datasets import FEATURE_COLUMNS, TARGET_COLUMN, write_dataset  # noqa: E402
+
+MODEL_PARAMS = {
+    "random_forest": {"n_estimators": 100, "max_depth": 8, "n_jobs": -1, "random_state": 42},
+    "xgboost": {"n_estimators": 200, "max_depth": 6, "n_jobs": -1, "random_state": 42},
+    "neural_network": {"epochs": 5, "batch_size": 256},
+}
+# Metrik adının sonekine göre yön: bu sonekler için büyük değer daha iyidir
+HIGHER_IS_BETTER = ("_rows_per_s", "_rps")
+
+
+def _timed(fn, repeat: int = 1):
+    """fn'i repeat kez çalıştırır; (medyan süre, son sonuç) döner."""
+    durations, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations), result
+
+
+def _percentile(values, q):
+    return float(np.percentile(np.asarray(values), q))
+
+
+# --- Ingestion ---
+def bench_ingest(size: int, data_dir: str, work_dir: str, repeat: int) -> dict:
+    from app.schemas.config import DataProcessingConfig
+    from app.services.data_service import DataService
+    from app.services.dataset_io import read_table
+    import sklearn.model_selection  # noqa: F401  # lazy import süresi ölçüme girmesin
+
+    csv_path = write_dataset(size, data_dir, "csv")
+    parquet_path = write_dataset(size, data_dir, "parquet")
+    columns = FEATURE_COLUMNS + [TARGET_COLUMN]
+
+    csv_s, _ = _timed(lambda: read_table(csv_path, columns=columns), repeat)
+    parquet_s, _ = _timed(lambda: read_table(parquet_path, columns=columns), repeat)
+
+    def process():
+        config = DataProcessingConfig(
+            raw_data_path=parquet_path, target_column=TARGET_COLUMN, feature_columns=FEATURE_COLUMNS,
+            output_train_path=os.path.join(work_dir, "train.parquet"),
+            output_test_path=os.path.join(work_dir, "test.parquet"),
+            output_format="parquet",
+        )
+        return DataService().process_data(config)
+
+    process_s, _ = _timed(process, repeat)
+    return {
+        f"ingest.csv_parse_s.{size}": csv_s,
+        f"ingest.parquet_parse_s.{size}": parquet_s,
+        f"ingest.csv_parse_rows_per_s.{size}": size / csv_s,
+        f"ingest.process_data_s.{size}": process_s,
+    }
+
+
+# --- Model: fit / predict ---
+def bench_model(model_type: str, size: int, work_dir: str, single_calls: int) -> dict:
+    from app.schemas.config import ModelConfig
+    from app.services.dataset_io import read_table
+    from app.services.model_factory import ModelFactory
+
+    train = read_table(os.path.join(work_dir, "train.parquet"))
+    test = read_table(os.path.join(work_dir, "test.parquet"))
+    X_train, y_train = train[FEATURE_COLUMNS], train[TARGET_COLUMN]
+    X_test = test[FEATURE_COLUMNS]
+    if model_type == "neural_network":
+        # Keras NaN ile eğitilemez; karşılaştırılabilirlik için basitçe 0 ile doldur
+        X_train, X_test = X_train.fillna(0), X_test.fillna(0)
+
+    params = MODEL_PARAMS[model_type]
+    model_instance = ModelFactory.get_model(ModelConfig(type=model_type, params=params))
+    fit_s, _ = _timed(lambda: model_instance.train(X_train, y_train, params))
+    predict_s, _ = _timed(lambda: model_instance.predict(X_test))
+
+    prefix = f"model.{model_type}"
+    results = {
+        f"{prefix}.fit_s.{size}": fit_s,
+        f"{prefix}.predict_batch_rows_per_s.{size}": len(X_test) / predict_s,
+        **_single_row_latency(model_instance, X_test, single_calls, f"{prefix}.single_row", size),
+    }
+    if model_type in ("random_forest", "xgboost"):
+        model_instance.compile()
+        results.update(_single_row_latency(model_instance, X_test, single_calls,
+                                           f"{prefix}.compiled_single_row", size))
+
+    path = os.path.join(work_dir, f"{model_type}.pkl")
+    model_instance.compiled = None
+    model_instance.save(path)
+    return results
+
+
+def _single_row_latency(model_instance, X_test, calls: int, prefix: str, size: int) -> dict:
+    rows = [X_test.iloc[[i % len(X_test)]] for i in range(calls)]
+    latencies = []
+    for row in rows:
+        started = time.perf_counter()
+        model_instance.predict(row)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return {
+        f"{prefix}_p50_ms.{size}": _percentile(latencies, 50),
+        f"{prefix}_p99_ms.{size}": _percentile(latencies, 99),
+    }
+
+
+# --- HTTP uçtan uca ---
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _load(url: str, payloads, concurrency: int):
+    import httpx
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(timeout=30) as client:
+        async def one(payload):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post(url, json=payload)
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        await one(payloads[0])  # model önbelleğini ısıt
+        latencies.clear()
+        started = time.perf_counter()
+        await asyncio.gather(*(one(p) for p in payloads))
+        elapsed = time.perf_counter() - started
+    return latencies, elapsed
+
+
+def bench_http(model_type: str, size: int, work_dir: str, requests: int, concurrency: int) -> dict:
+    from app.services.dataset_io import read_table
+
+    port = _free_port()
+    env = {**os.environ, "PYTHONPATH": REPO_ROOT + os.pathsep + os.environ.get("PYTHONPATH", "")}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=work_dir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        import httpx
+        base = f"http://127.0.0.1:{port}/api/v1"
+        for _ in range(300):
+            try:
+                if httpx.get(f"{base}/health").status_code == 200:
+                    break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        else:
+            raise RuntimeError("uvicorn başlatılamadı")
+
+        test = read_table(os.path.join(work_dir, "test.parquet"), columns=FEATURE_COLUMNS).fillna(0)
+        rows = test.to_numpy()[:requests]
+        payloads = [
+            {"model_id": f"{model_type}.pkl", "model_type": model_type, "features": rows[i % len(rows)].tolist()}
+            for i in range(requests)
+        ]
+        latencies, elapsed = asyncio.run(_load(f"{base}/predict", payloads, concurrency))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    prefix = f"http.{model_type}.predict_c{concurrency}"
+    return {
+        f"{prefix}_p50_ms.{size}": _percentile(latencies, 50),
+        f"{prefix}_p99_ms.{size}": _percentile(latencies, 99),
+        f"{prefix}_rps.{size}": len(latencies) / elapsed,
+    }
+
+
+# --- Karşılaştırma ---
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Baseline'a göre threshold'dan (örn. 0.1 = %10) fazla kötüleşen metrikleri döner."""
+    regressions = []
+    for key, value in current.items():
+        old = baseline.get(key)
+        if old is None or old == 0:
+            continue
+        metric = key.rsplit(".", 1)[0]
+        change = (old - value) / old if metric.endswith(HIGHER_IS_BETTER) else (value - old) / old
+        if change > threshold:
+            regressions.append({"metric": key, "baseline": old, "current": value, "worse_by": change})
+    return regressions
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FastAPI ML Service benchmark")
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="Virgülle ayrılmış satır sayıları (örn. 1000,100000,10000000)")
+    parser.add_argument("--models", default="random_forest,xgboost",
+                        help="random_forest,xgboost,neural_network")
+    parser.add_argument("--max-fit-rows", type=int, default=1_000_000,
+                        help="Bu boyutun üstünde sadece ingest ölçülür")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--single-calls", type=int, default=200)
+    parser.add_argument("--http-requests", type=int, default=2000)
+    parser.add_argument("--http-concurrency", type=int, default=32)
+    parser.add_argument("--skip-http", action="store_true")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "ml_service_bench_data"))
+    parser.add_argument("--output", default=None, help="Sonuç JSON dosyası")
+    parser.add_argument("--compare", default=None, help="Karşılaştırılacak baseline JSON dosyası")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    models = [m for m in args.models.split(",") if m]
+    results = {}
+
+    from benchmarks.cold_start import measure
+    startup = measure(3)
+    results["startup.import_s"] = startup["import_seconds_median"]
+    results["startup.max_rss_mb"] = startup["max_rss_mb_median"]
+
+    for size in sizes:
+        work_dir = tempfile.mkdtemp(prefix=f"bench_{size}_")
+        print(f"[{size} satır] ingest...", file=sys.stderr)
+        results.update(bench_ingest(size, args.data_dir, work_dir, args.repeat))
+        if size > args.max_fit_rows:
+            continue
+        for model_type in models:
+            print(f"[{size} satır] {model_type} fit/predict...", file=sys.stderr)
+            results.update(bench_model(model_type, size, work_dir, args.single_calls))
+            if not args.skip_http:
+                print(f"[{size} satır] {model_type} http...", file=sys.stderr)
+                results.update(bench_http(model_type, size, work_dir, args.http_requests, args.http_concurrency))
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    print(json.dumps(report, indent=4))
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=4)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for r in regressions:
+            print(f"GERİLEME {r['metric']}: {r['baseline']:.4g} -> {r['current']:.4g} "
+                  f"(%{r['worse_by'] * 100:.1f} kötü)", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.v1 import router
+from app.services.admission import AdmissionController, AdmissionRejected
+
+
+def controller(max_concurrency=1, **pools):
+    return AdmissionController(max_concurrency=max_concurrency, pools=pools, enabled=True)
+
+
+def pool(priority=1, max_concurrency=1, max_queue=1, max_wait_s=5.0, reserved=0):
+    return {"priority": priority, "max_concurrency": max_concurrency, "max_queue": max_queue,
+            "max_wait_s": max_wait_s, "reserved": reserved}
+
+
+def test_queue_then_reject_when_full():
+    async def main():
+        admission = controller(work=pool(max_queue=1))
+        await admission.acquire("work")
+        queued = asyncio.ensure_future(admission.acquire("work"))
+        await asyncio.sleep(0)
+        assert admission.stats()["pools"]["work"]["queued"] == 1
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            await admission.acquire("work")
+        assert rejected.value.reason == "queue_full"
+        assert rejected.value.retry_after >= 1
+
+        admission.release("work")
+        await asyncio.wait_for(queued, 1.0)
+        assert admission.stats()["pools"]["work"]["running"] == 1
+        admission.release("work")
+        assert admission.running == 0
+
+    asyncio.run(main())
+
+
+def test_wait_timeout_is_rejected_and_forgotten():
+    async def main():
+        admission = controller(work=pool(max_queue=4, max_wait_s=0.05))
+        await admission.acquire("work")
+        with pytest.raises(AdmissionRejected) as rejected:
+            await admission.acquire("work")
+        assert rejected.value.reason == "timeout"
+        assert admission.stats()["pools"]["work"]["queued"] == 0
+
+    asyncio.run(main())
+
+
+def test_reserved_slots_and_priority_order():
+    async def main():
+        admission = controller(max_concurrency=2,
+                               fast=pool(priority=0, max_concurrency=2, max_queue=4, reserved=1),
+                               slow=pool(priority=2, max_concurrency=2, max_queue=4))
+        await admission.acquire("slow")
+        # İkinci slot fast havuzuna ayrılmış; slow beklemek zorunda
+        slow = asyncio.ensure_future(admission.acquire("slow"))
+        await asyncio.sleep(0)
+        assert not slow.done()
+        await asyncio.wait_for(admission.acquire("fast"), 1.0)
+
+        # İkisi de beklerken slot boşalırsa yüksek öncelikli havuz önce başlar
+        fast = asyncio.ensure_future(admission.acquire("fast"))
+        await asyncio.sleep(0)
+        admission.release("slow")
+        await asyncio.wait_for(fast, 1.0)
+        assert not slow.done()
+        assert admission.stats()["pools"]["fast"]["running"] == 2
+        slow.cancel()
+
+    asyncio.run(main())
+
+
+def test_cancelled_waiter_does_not_leak_slot():
+    async def main():
+        admission = controller(work=pool(max_queue=2))
+        await admission.acquire("work")
+        waiter = asyncio.ensure_future(admission.acquire("work"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0)
+        admission.release("work")
+        assert admission.running == 0
+        assert admission.stats()["pools"]["work"]["queued"] == 0
+
+    asyncio.run(main())
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(router.api_router)
+    return TestClient(app)
+
+
+def test_saturated_upload_pool_returns_429(client, monkeypatch):
+    # Hiç slotu ve kuyruğu olmayan havuz: istek gövdesi okunmadan reddedilir
+    monkeypatch.setattr(router, "admission", controller(upload=pool(max_concurrency=0, max_queue=0)))
+    response = client.post("/datasets", params={"filename": "d.csv"}, content=b"a,b\n1,2\n")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_multipart_upload_goes_through_upload_pool(client, monkeypatch):
+    monkeypatch.setattr(router, "admission", controller(upload=pool(max_concurrency=0, max_queue=0)))
+    response = client.post("/process-data", files={"file": ("d.csv", b"a,b\n1,2\n")},
+                           data={"target_column": "b"})
+    assert response.status_code == 429
@@ -0,0 +1,108 @@
+import asyncio
+import time
+import numpy as np
+import pytest
+from app.services import batcher
+from app.services.admission import AdmissionController
+from app.services.batcher import MicroBatcher
+
+
+@pytest.fixture(autouse=True)
+def admission(monkeypatch):
+    admission = AdmissionController(max_concurrency=4, pools={"inference": {
+        "priority": 0, "max_concurrency": 4, "max_queue": 16, "max_wait_s": 5.0, "reserved": 0}}, enabled=True)
+    monkeypatch.setattr(batcher, "admission", admission)
+    return admission
+
+
+def recording(calls):
+    def score(X):
+        calls.append(X.copy())
+        return X[:, 0] * 10, X[:, 1]
+    return score
+
+
+def test_concurrent_requests_share_one_batch():
+    calls = []
+
+    async def main():
+        micro_batcher = MicroBatcher(max_batch_size=64, max_wait_ms=50)
+        score = recording(calls)
+        rows = [np.array([[float(i), -float(i)]]) for i in range(10)]
+        return await asyncio.gather(*(micro_batcher.submit("model", score, row) for row in rows))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1 and calls[0].shape == (10, 2)
+    # Her çağıran kendi satırının sonucunu alır
+    assert results == [(i * 10.0, -float(i)) for i in range(10)]
+
+
+def test_models_are_batched_separately():
+    calls = []
+
+    async def main():
+        micro_batcher = MicroBatcher(max_batch_size=64, max_wait_ms=20)
+        score = recording(calls)
+        return await asyncio.gather(
+            micro_batcher.submit("a", score, np.array([[1.0, 0.0]])),
+            micro_batcher.submit("b", score, np.array([[2.0, 0.0]])),
+        )
+
+    assert asyncio.run(main()) == [(10.0, 0.0), (20.0, 0.0)]
+    assert len(calls) == 2
+
+
+def test_full_batch_flushes_without_waiting():
+    calls = []
+
+    async def main():
+        micro_batcher = MicroBatcher(max_batch_size=4, max_wait_ms=10_000)
+        score = recording(calls)
+        started = time.perf_counter()
+        await asyncio.gather(*(micro_batcher.submit("model", score, np.array([[float(i), 0.0]]))
+                               for i in range(8)))
+        return time.perf_counter() - started
+
+    assert asyncio.run(main()) < 1.0
+    assert [len(X) for X in calls] == [4, 4]
+
+
+def test_partial_batch_flushes_after_max_wait():
+    calls = []
+
+    async def main():
+        micro_batcher = MicroBatcher(max_batch_size=64, max_wait_ms=50)
+        score = recording(calls)
+        started = time.perf_counter()
+        result = await micro_batcher.submit("model", score, np.array([[1.0, 2.0]]))
+        return result, time.perf_counter() - started
+
+    result, elapsed = asyncio.run(main())
+    assert result == (10.0, 2.0)
+    assert 0.04 <= elapsed < 1.0
+    assert len(calls) == 1
+
+
+def test_failed_batch_raises_in_every_caller():
+    async def main():
+        micro_batcher = MicroBatcher(max_batch_size=64, max_wait_ms=20)
+
+        def broken(X):
+            raise RuntimeError("model patladı")
+
+        return await asyncio.gather(*(micro_batcher.submit("model", broken, np.array([[float(i)]]))
+                                      for i in range(5)), return_exceptions=True)
+
+    errors = asyncio.run(main())
+    assert len(errors) == 5
+    assert all(isinstance(e, RuntimeError) and str(e) == "model patladı" for e in errors)
+
+
+def test_batch_uses_one_inference_slot(admission):
+    async def main():
+        micro_batcher = MicroBatcher(max_batch_size=64, max_wait_ms=20)
+        await asyncio.gather(*(micro_batcher.submit("model", recording([]), np.array([[float(i), 0.0]]))
+                               for i in range(20)))
+
+    asyncio.run(main())
+    assert admission.stats()["pools"]["inference"]["admitted"] == 1
@@ -0,0 +1,85 @@
+import os
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from app.services.compiled_trees import CompiledForest, ArrayBooster
+from app.services.ml_service import MLService
+from app.services.model_factory import RandomForestAdapter, XGBoostAdapter
+
+
+def make_data(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 5))
+    y = (X[:, 0] + 0.5 * X[:, 1] > 0).astype(int)
+    return X, y
+
+
+def train(adapter, X, y, compile_inference):
+    params = {"n_estimators": 5, "random_state": 0}
+    if isinstance(adapter, XGBoostAdapter):
+        params["max_depth"] = 3
+    adapter.train(X, y, params)
+    if compile_inference:
+        adapter.compile()
+    return adapter
+
+
+def test_compiled_forest_matches_sklearn():
+    X, y = make_data()
+    forest = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+    compiled = CompiledForest.from_sklearn(forest)
+    # Eşiğin hemen üstündeki float64 değerler: sklearn önce float32'ye çevirir, bazıları eşiğe yuvarlanıp sola gider
+    tree = forest.estimators_[0].tree_
+    split = tree.children_left != -1
+    edge = np.zeros((split.sum(), X.shape[1]))
+    edge[np.arange(split.sum()), tree.feature[split]] = np.nextafter(tree.threshold[split], np.inf)
+    X_test = np.vstack([make_data(seed=1)[0], edge])
+    np.testing.assert_array_equal(compiled.predict_proba(X_test), forest.predict_proba(X_test))
+    np.testing.assert_array_equal(compiled.predict(X_test), forest.predict(X_test))
+
+
+def test_compiled_forest_save_load_roundtrip(tmp_path):
+    X, y = make_data()
+    forest = RandomForestClassifier(n_estimators=3, random_state=0).fit(X, y)
+    path = str(tmp_path / "forest.npz")
+    CompiledForest.from_sklearn(forest).save(path)
+    np.testing.assert_array_equal(CompiledForest.load(path).predict_proba(X), forest.predict_proba(X))
+
+
+def test_array_booster_matches_xgboost():
+    pytest.importorskip("xgboost")
+    X, y = make_data()
+    adapter = train(XGBoostAdapter(), X, y, compile_inference=False)
+    booster = ArrayBooster.from_xgboost(adapter.model)
+    np.testing.assert_allclose(booster.predict_proba(X), adapter.model.predict_proba(X), atol=1e-5)
+
+
+@pytest.mark.parametrize("adapter_cls", [RandomForestAdapter, XGBoostAdapter])
+def test_retrain_without_compile_removes_stale_sidecar(tmp_path, adapter_cls):
+    if adapter_cls is XGBoostAdapter:
+        pytest.importorskip("xgboost")
+    X, y = make_data()
+    save_path = str(tmp_path / "model.pkl")
+
+    compiled = train(adapter_cls(), X, y, compile_inference=True)
+    main_path, files = MLService._save_atomic(compiled, save_path)
+    sidecars = compiled.compiled_files(main_path)
+    assert all(os.path.exists(p) for p in sidecars)
+
+    # Aynı yola farklı veriyle, derlemeden yeniden eğitim
+    retrained = train(adapter_cls(), X, 1 - y, compile_inference=False)
+    MLService._save_atomic(retrained, save_path)
+    assert not any(os.path.exists(p) for p in sidecars)
+
+    loaded = adapter_cls()
+    loaded.load(main_path)
+    assert loaded.compiled is None
+    np.testing.assert_array_equal(loaded.predict(X), retrained.predict(X))
+
+
+def test_direct_save_without_compile_removes_stale_sidecar(tmp_path):
+    X, y = make_data()
+    path = str(tmp_path / "model.pkl")
+    train(RandomForestAdapter(), X, y, compile_inference=True).save(path)
+    train(RandomForestAdapter(), X, 1 - y, compile_inference=False).save(path)
+    assert not os.path.exists(path + RandomForestAdapter.COMPILED_SUFFIX)
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.schemas.config import DataProcessingConfig
+from app.services.data_service import DataService, _StreamingSplitter
+
+
+@pytest.fixture
+def raw_csv(tmp_path):
+    # Dengesiz ve sınıfa göre sıralı veri: 600 / 300 / 100 satır
+    rng = np.random.default_rng(0)
+    labels = np.repeat(["a", "b", "c"], [600, 300, 100])
+    df = pd.DataFrame({"row_id": np.arange(len(labels)), "x": rng.normal(size=len(labels)), "target": labels})
+    df.loc[::97, "target"] = None  # Hedefi boş satırlar atılır
+    path = tmp_path / "raw.csv"
+    df.to_csv(path, index=False)
+    return str(path), df
+
+
+def split(raw_path, tmp_path, name, **overrides):
+    config = DataProcessingConfig(
+        raw_data_path=raw_path, target_column="target", feature_columns=["row_id", "x"],
+        output_train_path=str(tmp_path / f"{name}_train.csv"), output_test_path=str(tmp_path / f"{name}_test.csv"),
+        streaming=True, **overrides,
+    )
+    result = DataService().process_data(config)
+    return pd.read_csv(result["train_path"]), pd.read_csv(result["test_path"])
+
+
+@pytest.mark.parametrize("stratify", [False, True])
+def test_chunked_split_matches_in_memory_assignment(raw_csv, tmp_path, stratify):
+    raw_path, df = raw_csv
+    _, test = split(raw_path, tmp_path, "chunked", chunksize=37, stratify=stratify)
+    _, single = split(raw_path, tmp_path, "single", chunksize=10_000, stratify=stratify)
+
+    # Aynı atama tüm veri bellekteyken tek seferde yapılınca da aynı satırları teste koyar
+    kept = df[df["target"].notna()]
+    splitter = _StreamingSplitter(0.2, 42, stratify)
+    is_test = splitter.assign(kept["row_id"].to_numpy(dtype=np.uint64), kept["target"].to_numpy())
+    expected = sorted(kept["row_id"][is_test])
+
+    assert sorted(test["row_id"]) == sorted(single["row_id"]) == expected
+
+
+def test_stratified_split_keeps_class_ratios(raw_csv, tmp_path):
+    raw_path, df = raw_csv
+    train, test = split(raw_path, tmp_path, "strat", chunksize=50, stratify=True, test_size=0.25)
+    counts = df["target"].value_counts()
+    for label, n in counts.items():
+        n_test = (test["target"] == label).sum()
+        assert n_test + (train["target"] == label).sum() == n
+        # Sistematik örnekleme: her sınıfın test sayısı hedefin en fazla 1 satır uzağında
+        assert abs(n_test - 0.25 * n) <= 1
+
+
+def test_split_is_deterministic_for_seed(raw_csv, tmp_path):
+    raw_path, _ = raw_csv
+    first = split(raw_path, tmp_path, "first", chunksize=64, random_state=7)
+    again = split(raw_path, tmp_path, "again", chunksize=64, random_state=7)
+    other = split(raw_path, tmp_path, "other", chunksize=64, random_state=8)
+    pd.testing.assert_frame_equal(first[1], again[1])
+    assert set(first[1]["row_id"]) != set(other[1]["row_id"])
+    assert set(first[0]["row_id"]).isdisjoint(first[1]["row_id"])
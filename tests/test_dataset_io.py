@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+from app.services.dataset_io import ChunkedTableWriter, read_table
+
+
+def frame(start, n):
+    return pd.DataFrame({"x": [float(i) for i in range(start, start + n)], "y": [i % 2 for i in range(start, start + n)]})
+
+
+@pytest.mark.parametrize("ext", [".csv", ".parquet", ".feather"])
+def test_leading_empty_chunks_are_skipped(tmp_path, ext):
+    path = str(tmp_path / f"train{ext}")
+    with ChunkedTableWriter(path) as writer:
+        writer.write(frame(0, 0))
+        writer.write(frame(0, 3))
+        writer.write(frame(3, 0))
+        writer.write(frame(3, 2))
+    assert writer.rows == 5
+    result = read_table(path)
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), frame(0, 5), check_dtype=False)
+
+
+def test_csv_header_written_once(tmp_path):
+    path = tmp_path / "train.csv"
+    with ChunkedTableWriter(str(path)) as writer:
+        writer.write(frame(0, 0))
+        writer.write(frame(0, 2))
+    assert path.read_text().splitlines() == ["x,y", "0.0,0", "1.0,1"]
+
+
+@pytest.mark.parametrize("ext", [".csv", ".parquet", ".feather"])
+def test_all_empty_split_still_creates_file(tmp_path, ext):
+    path = str(tmp_path / f"test{ext}")
+    with ChunkedTableWriter(path) as writer:
+        writer.write(frame(0, 0))
+        writer.write(frame(0, 0))
+    result = read_table(path)
+    assert len(result) == 0
+    assert list(result.columns) == ["x", "y"]
@@ -0,0 +1,115 @@
+import asyncio
+import hashlib
+import os
+import threading
+import time
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.v1 import router
+from app.services.dataset_store import DatasetStore
+
+CSV = b"a,b,target\n1,2.5,0\n3,4.5,1\n"
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = DatasetStore(root=str(tmp_path))
+    monkeypatch.setattr(router, "dataset_store", store)
+    return store
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(router.api_router)
+    return TestClient(app)
+
+
+def stored_files(store, kind):
+    directory = os.path.join(store.root, kind)
+    return sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+
+
+def test_upload_parses_and_deduplicates(store, client):
+    first = client.post("/datasets", params={"filename": "d.csv"}, content=CSV)
+    second = client.post("/datasets", params={"filename": "again.csv"}, content=CSV)
+    assert first.status_code == 200
+    assert first.json()["columns"] == ["a", "b", "target"]
+    assert second.json()["dataset_id"] == first.json()["dataset_id"]
+    assert len(stored_files(store, "raw")) == 1
+    assert stored_files(store, "incoming") == []
+
+
+
+def test_repeat_uploads_skip_the_parse(store, client, monkeypatch):
+    parses = []
+    convert = DatasetStore._convert_csv
+
+    def counting_convert(raw_path, tmp_path):
+        parses.append(raw_path)
+        return convert(raw_path, tmp_path)
+
+    monkeypatch.setattr(DatasetStore, "_convert_csv", staticmethod(counting_convert))
+    responses = [client.post("/datasets", params={"filename": "d.csv"}, content=CSV) for _ in range(3)]
+    assert {r.json()["dataset_id"] for r in responses} == {responses[0].json()["dataset_id"]}
+    assert len(parses) == 1
+    assert len(stored_files(store, "parsed")) == 1
+
+def test_unsupported_extension_is_rejected_before_streaming(store, client):
+    response = client.post("/datasets", params={"filename": "d.txt"}, content=CSV)
+    assert response.status_code == 415
+    assert stored_files(store, "raw") == [] and stored_files(store, "incoming") == []
+
+
+@pytest.mark.parametrize("filename, body", [
+    ("empty.csv", b""),
+    ("junk.xlsx", b"not an excel file"),
+    ("junk.parquet", b"not a parquet file"),
+])
+def test_unreadable_upload_is_400_and_not_persisted(store, client, filename, body):
+    response = client.post("/datasets", params={"filename": filename}, content=body)
+    assert response.status_code == 400
+    assert stored_files(store, "raw") == []
+    assert stored_files(store, "parsed") == []
+    assert stored_files(store, "incoming") == []
+
+
+def test_ingests_run_on_bounded_executor(tmp_path):
+    store = DatasetStore(root=str(tmp_path), max_ingests=1)
+    running, peak, threads = [0], [0], set()
+    lock = threading.Lock()
+    finalize = store._finalize
+
+    def tracked_finalize(*args):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            threads.add(threading.current_thread().name)
+        try:
+            time.sleep(0.05)
+            return finalize(*args)
+        finally:
+            with lock:
+                running[0] -= 1
+
+    store._finalize = tracked_finalize
+
+    async def body(i):
+        yield f"a,b\n{i},{i}\n".encode()
+
+    async def main():
+        return await asyncio.gather(*(store.ingest_stream(body(i), f"d{i}.csv") for i in range(3)))
+
+    results = asyncio.run(main())
+    assert len({r["digest"] for r in results}) == 3
+    assert peak[0] == 1
+    assert all(name.startswith("ingest") for name in threads)
+
+
+def test_digest_locks_are_bounded(tmp_path):
+    store = DatasetStore(root=str(tmp_path))
+    digests = [hashlib.sha256(str(i).encode()).hexdigest() for i in range(1000)]
+    locks = {id(store._digest_lock(d)) for d in digests}
+    assert len(locks) == len(store._digest_locks)
+    assert store._digest_lock(digests[0]) is store._digest_lock(digests[0])
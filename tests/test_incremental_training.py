@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.schemas.config import ModelTrainingConfig, PreprocessingConfig
+from app.services.ml_service import MLService
+from app.services.model_factory import ModelFactory
+from app.services.preprocessing import fit_preprocessing
+
+
+def data(n=300, seed=0, shift=0.0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(loc=shift, size=(n, 4)), columns=list("abcd"))
+    y = ((X.a - shift) + (X.b - shift) > 0).astype(int)
+    return X, y
+
+
+def trained(model_type, params):
+    X, y = data()
+    model = ModelFactory.get_model({"type": model_type})
+    model.train(X, y, params)
+    return model
+
+
+def test_random_forest_warm_start_adds_trees():
+    model = trained("random_forest", {"n_estimators": 5, "random_state": 0})
+    old_trees = list(model.model.estimators_)
+    X_new, y_new = data(seed=1)
+    details = model.train_incremental(X_new, y_new, {"n_estimators": 3})
+    assert (details["added_trees"], details["total_trees"]) == (3, 8)
+    assert len(model.model.estimators_) == 8
+    # Eski ağaçlar yeniden eğitilmez, aynen korunur
+    assert all(a is b for a, b in zip(model.model.estimators_[:5], old_trees))
+    assert model.model.warm_start is False
+
+
+def test_xgboost_continues_from_existing_rounds():
+    import xgboost as xgb
+    model = trained("xgboost", {"n_estimators": 5, "max_depth": 2})
+    X_new, y_new = data(seed=1)
+    probe = xgb.DMatrix(X_new)
+    before = model.model.get_booster().predict(probe, output_margin=True)
+
+    details = model.train_incremental(X_new, y_new, {"n_estimators": 3})
+    booster = model.model.get_booster()
+    assert (details["added_rounds"], details["total_rounds"]) == (3, 8)
+    assert booster.num_boosted_rounds() == 8
+    # İlk 5 tur değişmeden kalır
+    np.testing.assert_allclose(booster.predict(probe, output_margin=True, iteration_range=(0, 5)), before,
+                               rtol=1e-6)
+
+
+@pytest.mark.parametrize("model_type", ["random_forest", "xgboost"])
+def test_incremental_data_must_keep_the_classes(model_type):
+    model = trained(model_type, {"n_estimators": 3})
+    X_new, _ = data(seed=1)
+    with pytest.raises(ValueError):
+        model.train_incremental(X_new, np.zeros(len(X_new), dtype=int), {"n_estimators": 2})
+
+
+def test_base_model_preprocessor_is_reused(tmp_path):
+    X, y = data()
+    preprocessor, X_fit, y_fit = fit_preprocessing(PreprocessingConfig(scale_features=True), X, y)
+    model = ModelFactory.get_model({"type": "random_forest"})
+    model.preprocessor = preprocessor
+    model.train(X_fit, y_fit, {"n_estimators": 5, "random_state": 0})
+    path = model.save(str(tmp_path / "base.pkl"))
+
+    # Yeni verinin dağılımı farklı; preprocessor yeniden fit edilseydi ölçek değişirdi
+    X_new, y_new = data(seed=1, shift=5.0)
+    config = ModelTrainingConfig(
+        target_column="target", feature_columns=list("abcd"), experiment_name="test",
+        algorithm_config={"type": "random_forest", "params": {"n_estimators": 3}},
+        preprocessing=PreprocessingConfig(scale_features=True), base_model_id=path,
+    )
+    base, X_base, y_base = MLService._load_base_model(config, X_new, y_new)
+    np.testing.assert_array_equal(base.preprocessor.mean, preprocessor.mean)
+    np.testing.assert_array_equal(base.preprocessor.scale, preprocessor.scale)
+    np.testing.assert_array_equal(X_base, preprocessor.transform(X_new))
+    assert len(base.model.estimators_) == 5
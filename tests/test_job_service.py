@@ -0,0 +1,81 @@
+import os
+import socket
+import subprocess
+import sys
+from concurrent.futures import Future
+import pytest
+from fastapi.testclient import TestClient
+from app import main
+from app.services.job_service import TrainingJobManager
+
+
+class PendingExecutor:
+    """İşleri çalıştırmadan kaydeder; dönen future hiç tamamlanmaz (iş sürüyor gibi)."""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, job_id, *args):
+        self.submitted.append(job_id)
+        return Future()
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = TrainingJobManager(jobs_dir=str(tmp_path))
+    manager._executor = PendingExecutor()
+    return manager
+
+
+@pytest.fixture(scope="module")
+def dead_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def write_job(manager, job_id, status, **fields):
+    job = {"job_id": job_id, "status": status, "stage": status, "progress": 0.5, "config": {}}
+    job.update(fields)
+    manager.store.write(job)
+
+
+def test_resume_redispatches_only_orphaned_jobs(manager, dead_pid):
+    host = socket.gethostname()
+    write_job(manager, "orphan", "running", owner_host=host, owner_pid=dead_pid, worker_pid=dead_pid)
+    write_job(manager, "legacy", "queued")
+    write_job(manager, "sibling", "queued", owner_host=host, owner_pid=os.getppid(), worker_pid=None)
+    write_job(manager, "training", "running", owner_host=host, owner_pid=dead_pid, worker_pid=os.getppid())
+    write_job(manager, "remote", "running", owner_host=f"{host}-other", owner_pid=dead_pid)
+    write_job(manager, "done", "completed", owner_host=host, owner_pid=dead_pid)
+
+    manager.resume_pending()
+
+    assert sorted(manager._executor.submitted) == ["legacy", "orphan"]
+    resumed = manager.get("orphan")
+    assert resumed["status"] == "queued" and resumed["progress"] == 0.0
+    assert resumed["owner_pid"] == os.getpid() and resumed["worker_pid"] is None
+    assert manager.get("training")["status"] == "running"
+
+
+def test_resume_skips_jobs_dispatched_by_this_process(manager, dead_pid):
+    write_job(manager, "orphan", "queued", owner_host=socket.gethostname(), owner_pid=dead_pid)
+    job = manager.submit({})
+    manager.resume_pending()
+    manager.resume_pending()
+    assert manager._executor.submitted == [job["job_id"], "orphan"]
+
+
+def test_stale_own_pid_is_treated_as_dead(manager):
+    # Konteyner yeniden başladığında API süreci aynı pid ile açılabilir
+    write_job(manager, "stale", "running", owner_host=socket.gethostname(), owner_pid=os.getpid())
+    manager.resume_pending()
+    assert manager._executor.submitted == ["stale"]
+
+
+def test_lifespan_resumes_pending_jobs(monkeypatch):
+    calls = []
+    monkeypatch.setattr(main.job_manager, "resume_pending", lambda: calls.append(True))
+    monkeypatch.setattr(main.job_manager, "shutdown", lambda: None)
+    with TestClient(main.app):
+        assert calls == [True]
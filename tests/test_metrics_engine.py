@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+from app.services.metrics_engine import MetricsAccumulator
+
+METRICS = ["accuracy", "precision", "recall", "f1_score", "roc_auc"]
+
+
+def binary_scores(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    y = rng.integers(0, 2, n)
+    # 0.5 civarında yoğun, eşitlik içeren skorlar: histogram yaklaşımının en zayıf olduğu durum
+    score = np.clip(0.5 + 0.01 * (y - 0.5) + rng.normal(scale=0.005, size=n), 0, 1)
+    score[::10] = 0.5
+    return y, np.column_stack([1 - score, score])
+
+
+def accumulate(y, proba, chunk=777, **kwargs):
+    accumulator = MetricsAccumulator(np.array([0, 1]), METRICS, **kwargs)
+    for i in range(0, len(y), chunk):
+        part = proba[i:i + chunk]
+        accumulator.update(y[i:i + chunk], np.argmax(part, axis=1), part)
+    return accumulator.result()
+
+
+def test_binary_metrics_match_sklearn_exactly():
+    y, proba = binary_scores()
+    pred = np.argmax(proba, axis=1)
+    result = accumulate(y, proba)
+    assert result["accuracy"] == pytest.approx(accuracy_score(y, pred), abs=1e-12)
+    assert result["precision"] == pytest.approx(precision_score(y, pred), abs=1e-12)
+    assert result["recall"] == pytest.approx(recall_score(y, pred), abs=1e-12)
+    assert result["f1_score"] == pytest.approx(f1_score(y, pred), abs=1e-12)
+    assert result["roc_auc"] == pytest.approx(roc_auc_score(y, proba[:, 1]), abs=1e-12)
+    assert result["roc_auc_approximate"] is False
+
+
+def test_falls_back_to_histogram_over_sample_limit():
+    y, proba = binary_scores()
+    result = accumulate(y, proba, exact_roc_max_samples=1000)
+    assert result["roc_auc_approximate"] is True
+    assert result["roc_auc"] == pytest.approx(roc_auc_score(y, proba[:, 1]), abs=1e-3)
+
+
+def test_multiclass_macro_roc_auc():
+    rng = np.random.default_rng(1)
+    y = rng.integers(0, 3, 2000)
+    proba = rng.dirichlet(np.ones(3), size=2000)
+    proba[np.arange(2000), y] += 0.3
+    proba /= proba.sum(axis=1, keepdims=True)
+    accumulator = MetricsAccumulator(np.array([0, 1, 2]), METRICS)
+    accumulator.update(y, np.argmax(proba, axis=1), proba)
+    expected = roc_auc_score(y, proba, multi_class="ovr", average="macro")
+    assert accumulator.result()["roc_auc"] == pytest.approx(expected, abs=1e-12)
+
+
+def test_single_class_roc_auc_is_none():
+    accumulator = MetricsAccumulator(np.array([0, 1]), ["roc_auc"])
+    accumulator.update(np.ones(5, dtype=int), np.ones(5, dtype=int), np.full((5, 2), 0.5))
+    assert accumulator.result()["roc_auc"] is None
@@ -0,0 +1,70 @@
+import os
+import numpy as np
+import pytest
+from app.services.model_cache import ModelCache
+from app.services.model_factory import RandomForestAdapter
+
+
+def save_model(path, n_estimators=3) -> str:
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(50, 3))
+    adapter = RandomForestAdapter()
+    adapter.train(X, (X[:, 0] > 0).astype(int), {"n_estimators": n_estimators, "random_state": 0})
+    return adapter.save(str(path))
+
+
+@pytest.fixture
+def models(tmp_path):
+    return {name: save_model(tmp_path / f"{name}.pkl") for name in ("a", "b", "c")}
+
+
+def cached_ids(cache):
+    return [m["model_id"] for m in cache.stats()["models"]]
+
+
+def test_least_recently_used_model_is_evicted(models):
+    cache = ModelCache(max_items=2, max_bytes=10**12)
+    cache.get(models["a"], "random_forest")
+    cache.get(models["b"], "random_forest")
+    cache.get(models["a"], "random_forest")  # a en son kullanılan olur
+    cache.get(models["c"], "random_forest")
+    assert cached_ids(cache) == [models["a"], models["c"]]
+    assert cache.total_bytes == os.path.getsize(models["a"]) + os.path.getsize(models["c"])
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_byte_budget_keeps_newest_model(models):
+    cache = ModelCache(max_items=10, max_bytes=1)
+    cache.get(models["a"], "random_forest")
+    cache.get(models["b"], "random_forest")
+    # Bütçeyi tek başına aşsa da en son yüklenen model tutulur
+    assert cached_ids(cache) == [models["b"]]
+
+
+def test_retrained_file_gets_a_new_key(tmp_path):
+    path = save_model(tmp_path / "model.pkl")
+    cache = ModelCache()
+    first, first_key = cache.get_entry(path, "random_forest")
+    assert cache.get_entry(path, "random_forest") == (first, first_key)
+
+    save_model(path, n_estimators=5)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, int(first_key[1]) + 1_000_000))  # Aynı zaman damgasına düşmesin
+    second, second_key = cache.get_entry(path, "random_forest")
+    assert second_key != first_key and second is not first
+    assert len(second.model.estimators_) == 5
+    assert cache.get_entry(path, "random_forest", load=False) == (second, second_key)
+
+
+def test_failed_load_releases_its_lock(tmp_path):
+    path = tmp_path / "broken.pkl"
+    path.write_bytes(b"not a model")
+    cache = ModelCache()
+    with pytest.raises(Exception):
+        cache.get(str(path), "random_forest")
+    assert cache._load_locks == {}
+    assert cache.stats()["models"] == []
+
+    save_model(path)
+    assert len(cache.get(str(path), "random_forest").model.estimators_) == 3
+    assert cache._load_locks == {}
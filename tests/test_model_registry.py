@@ -0,0 +1,75 @@
+import functools
+import os
+import stat
+from types import SimpleNamespace
+import pytest
+from app.services.model_cache import ModelCache
+from app.services.model_registry import ModelRegistry
+from app.services.tracking_service import TrackingQueue, TrackingRecord
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return ModelRegistry(root=str(tmp_path / "registry"), cache=ModelCache())
+
+
+@pytest.fixture
+def artifact(tmp_path):
+    path = tmp_path / "model.pkl"
+    path.write_bytes(b"model")
+    return str(path)
+
+
+def test_register_assigns_increasing_versions(registry, artifact):
+    first = registry.register("churn", "random_forest", [artifact], artifact, {})
+    second = registry.register("churn", "random_forest", [artifact], artifact, {})
+    assert (first["version"], second["version"]) == ("1", "2")
+    assert open(registry.artifact_path(second), "rb").read() == b"model"
+    assert [v["version"] for v in registry.list_versions("churn")] == ["1", "2"]
+
+
+def test_hard_linked_source_stays_writable(registry, artifact):
+    registry.register("churn", "random_forest", [artifact], artifact, {})
+    assert os.stat(artifact).st_mode & stat.S_IWUSR
+
+
+@pytest.mark.parametrize("version", ["../../etc", "..", "1/../../x", "-1", "", "1.0"])
+def test_invalid_versions_are_rejected(registry, artifact, version):
+    registry.register("churn", "random_forest", [artifact], artifact, {})
+    with pytest.raises(ValueError):
+        registry.get_version("churn", version)
+    with pytest.raises(ValueError):
+        registry.update_metrics("churn", version, {"accuracy": 1.0})
+    with pytest.raises(ValueError):
+        registry.promote("churn", version, preload=False)
+
+
+def test_invalid_names_are_rejected(registry):
+    with pytest.raises(ValueError):
+        registry.get_version("../churn", "1")
+
+
+class FakeMlflowClient:
+    def get_experiment_by_name(self, name):
+        return SimpleNamespace(experiment_id="0")
+
+    def create_run(self, experiment_id, **kwargs):
+        return SimpleNamespace(info=SimpleNamespace(run_id="run-1"))
+
+    def log_batch(self, run_id, **kwargs):
+        pass
+
+    def set_terminated(self, run_id):
+        pass
+
+
+def test_async_tracking_writes_run_id_back(registry, artifact):
+    record = registry.register("churn", "random_forest", [artifact], artifact, {"mlflow_run_id": None})
+    tracking = TrackingRecord("exp")
+    tracking.on_run_created.append(functools.partial(registry.update_run_id, "churn", record["version"]))
+    tracking_queue = TrackingQueue()
+    tracking_queue._client = FakeMlflowClient()
+
+    assert tracking_queue.submit(tracking) is None  # Asenkron: run henüz oluşmadı
+    assert tracking_queue.flush(timeout=5)
+    assert registry.get_version("churn", record["version"])["mlflow_run_id"] == "run-1"
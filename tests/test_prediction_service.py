@@ -0,0 +1,71 @@
+import asyncio
+import numpy as np
+import pytest
+from app.schemas.prediction import PredictionInput
+from app.services import batcher as batcher_module, prediction_service
+from app.services.admission import AdmissionController
+from app.services.batcher import MicroBatcher
+from app.services.model_cache import ModelCache
+from app.services.model_factory import RandomForestAdapter
+from app.services.model_registry import ModelRegistry
+from app.services.prediction_service import PredictionService
+
+
+@pytest.fixture
+def model_path(tmp_path):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 3))
+    adapter = RandomForestAdapter()
+    adapter.train(X, (X[:, 0] > 0).astype(int), {"n_estimators": 5, "random_state": 0})
+    path = str(tmp_path / "model.pkl")
+    adapter.save(path)
+    return path
+
+
+@pytest.fixture
+def admission(monkeypatch):
+    # Çok dar inference havuzu: istek başına slot alınsaydı çoğu istek 429 alırdı
+    controller = AdmissionController(max_concurrency=1, enabled=True, pools={
+        "inference": {"priority": 0, "max_concurrency": 1, "max_queue": 16, "max_wait_s": 5.0},
+    })
+    monkeypatch.setattr(prediction_service, "admission", controller)
+    monkeypatch.setattr(batcher_module, "admission", controller)
+    return controller
+
+
+def service(tmp_path, cache):
+    return PredictionService(cache=cache, batcher=MicroBatcher(max_batch_size=64, max_wait_ms=5),
+                             registry=ModelRegistry(root=str(tmp_path / "registry"), cache=cache))
+
+
+def test_cached_model_requests_share_batch_slots(tmp_path, model_path, admission):
+    cache = ModelCache()
+    cache.get(model_path, "random_forest")
+    svc = service(tmp_path, cache)
+    rows = np.random.default_rng(1).normal(size=(600, 3))
+
+    async def main():
+        return await asyncio.gather(*(
+            svc.predict_batched(PredictionInput(model_id=model_path, features=row.tolist())) for row in rows
+        ))
+
+    results = asyncio.run(main())
+    expected = cache.get(model_path, "random_forest").predict(rows)
+    assert [r["class_label"] for r in results] == expected.tolist()
+    pool = admission.stats()["pools"]["inference"]
+    assert pool["rejected"] == 0 and pool["timeouts"] == 0
+    # Sadece batch'ler slot alır (600 satır / 64)
+    assert pool["admitted"] <= 10
+
+
+def test_cache_miss_loads_through_admission(tmp_path, model_path, admission):
+    cache = ModelCache()
+    svc = service(tmp_path, cache)
+
+    async def main():
+        return await svc.predict_batched(PredictionInput(model_id=model_path, features=[1.0, 0.0, 0.0]))
+
+    assert asyncio.run(main())["class_label"] == 1
+    assert cache.stats()["misses"] == 1
+    # Yükleme + batch
+    assert admission.stats()["pools"]["inference"]["admitted"] == 2
@@ -0,0 +1,70 @@
+import io
+import os
+import numpy as np
+from app.api.v1 import router
+from app.services.ml_service import MLService
+from app.services.model_factory import RandomForestAdapter
+from app.services.preprocessing import Preprocessor, preprocessor_path
+
+
+def make_data(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(loc=5.0, scale=3.0, size=(n, 3))
+    y = (X[:, 0] > 5.0).astype(int)
+    return X, y
+
+
+def train(X, y, scale_features):
+    adapter = RandomForestAdapter()
+    if scale_features:
+        adapter.preprocessor = Preprocessor(scale_features=True).fit(X)
+    adapter.train(adapter.transform(X), y, {"n_estimators": 5, "random_state": 0})
+    return adapter
+
+
+def test_preprocessor_roundtrip(tmp_path):
+    X, y = make_data()
+    X[::7, 1] = np.nan
+    preprocessor = Preprocessor(impute_strategy="median", scale_features=True).fit(X)
+    path = str(tmp_path / "model.pkl")
+    preprocessor.save(preprocessor_path(path))
+    loaded = Preprocessor.load(preprocessor_path(path))
+    np.testing.assert_array_equal(loaded.transform(X), preprocessor.transform(X))
+    assert not np.isnan(loaded.transform(X)).any()
+
+
+def test_retrain_without_preprocessing_removes_stale_sidecar(tmp_path):
+    X, y = make_data()
+    save_path = str(tmp_path / "model.pkl")
+    MLService._save_atomic(train(X, y, scale_features=True), save_path)
+    assert os.path.exists(preprocessor_path(save_path))
+
+    retrained = train(X, y, scale_features=False)
+    MLService._save_atomic(retrained, save_path)
+    assert not os.path.exists(preprocessor_path(save_path))
+
+    loaded = RandomForestAdapter()
+    loaded.load(save_path)
+    assert loaded.preprocessor is None
+    np.testing.assert_array_equal(loaded.predict(X), retrained.predict(X))
+
+
+def test_direct_save_without_preprocessing_removes_stale_sidecar(tmp_path):
+    X, y = make_data()
+    path = str(tmp_path / "model.pkl")
+    train(X, y, scale_features=True).save(path)
+    train(X, y, scale_features=False).save(path)
+    assert not os.path.exists(preprocessor_path(path))
+
+
+def test_stage_model_keeps_shared_model_untouched(tmp_path, monkeypatch):
+    monkeypatch.setattr(router.dataset_store, "root", str(tmp_path))
+    model_path = tmp_path / "raw" / "digest.pkl"
+    model_path.parent.mkdir()
+    model_path.write_bytes(b"model")
+
+    staged = router.stage_model(str(model_path), io.BytesIO(b"{}"))
+    assert os.path.dirname(staged) != str(model_path.parent)
+    assert open(staged, "rb").read() == b"model"
+    assert open(preprocessor_path(staged), "rb").read() == b"{}"
+    assert not os.path.exists(preprocessor_path(str(model_path)))
@@ -0,0 +1,38 @@
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from app import main
+from app.core.metrics import route_label
+
+
+def request_count(route: str, status: str) -> float:
+    labels = {"method": "GET", "route": route, "status": status}
+    return REGISTRY.get_sample_value("http_request_duration_seconds_count", labels) or 0.0
+
+
+def test_latency_label_includes_api_prefix():
+    before = request_count("/api/v1/jobs/{job_id}", "404")
+    TestClient(main.app).get("/api/v1/jobs/does-not-exist")
+    assert request_count("/api/v1/jobs/{job_id}", "404") == before + 1
+    assert request_count("/jobs/{job_id}", "404") == 0.0
+
+
+def test_route_label_for_nested_prefixes_and_root_path():
+    inner = APIRouter()
+    labels = []
+
+    @inner.get("/files/{name:path}")
+    def read_file(name: str, request: Request):
+        labels.append(route_label(request.scope))
+        return {}
+
+    outer = APIRouter()
+    outer.include_router(inner, prefix="/v2")
+    app = FastAPI(root_path="/svc")
+    app.include_router(outer, prefix="/api")
+
+    client = TestClient(app)
+    assert client.get("/api/v2/files/a/b.csv").status_code == 200
+    assert client.get("/svc/api/v2/files/c.csv").status_code == 200
+    assert labels == ["/api/v2/files/{name}", "/api/v2/files/{name}"]
+    assert route_label({"path": "/nope"}) == "unmatched"
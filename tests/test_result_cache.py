@@ -0,0 +1,66 @@
+import time
+import numpy as np
+from app.services.result_cache import PredictionResultCache
+
+V1 = ("models/a.pkl", "1")
+V2 = ("models/a.pkl", "2")
+OTHER = ("models/b.pkl", "1")
+
+
+def cache(**kwargs):
+    return PredictionResultCache(**{"max_items": 100, "ttl_seconds": 0, "round_decimals": None, **kwargs})
+
+
+def test_hit_after_put_and_rounding():
+    results = cache(round_decimals=2)
+    keys = results.row_keys(np.array([[1.001, -0.0], [2.0, 3.0]]))
+    assert results.get_many(V1, keys) == [None, None]
+    results.put_many(V1, keys, [0, 1], [0.9, 0.8])
+    near = results.row_keys(np.array([[1.0, 0.0]]))
+    assert results.get_many(V1, near) == [(0, 0.9)]
+    assert results.stats()["hits"] == 1
+
+
+def test_new_version_misses_without_purging_old_version():
+    results = cache()
+    keys = results.row_keys(np.array([[1.0, 2.0]]))
+    results.put_many(V1, keys, [0], [0.9])
+    assert results.get_many(V2, keys) == [None]
+    results.put_many(V2, keys, [1], [0.7])
+    # Registry iki versiyonu aynı anda servis ederken ikisi de önbellekte kalır (thrash yok)
+    for _ in range(3):
+        assert results.get_many(V1, keys) == [(0, 0.9)]
+        assert results.get_many(V2, keys) == [(1, 0.7)]
+    assert results.stats()["invalidations"] == 0
+
+
+def test_old_versions_age_out_by_lru():
+    results = cache(max_items=2)
+    keys = results.row_keys(np.array([[1.0], [2.0]]))
+    results.put_many(V1, keys, [0, 0], [0.9, 0.9])
+    results.put_many(V2, keys, [1, 1], [0.8, 0.8])
+    assert results.get_many(V1, keys) == [None, None]
+    assert results.get_many(V2, keys) == [(1, 0.8), (1, 0.8)]
+    assert results.stats()["evictions"] == 2
+
+
+def test_ttl_expiry():
+    results = cache(ttl_seconds=0.05)
+    keys = results.row_keys(np.array([[1.0]]))
+    results.put_many(V1, keys, [0], [0.9])
+    time.sleep(0.06)
+    assert results.get_many(V1, keys) == [None]
+    assert results.stats()["expirations"] == 1
+
+
+def test_explicit_invalidate_by_model():
+    results = cache()
+    keys = results.row_keys(np.array([[1.0]]))
+    for model_key in (V1, V2, OTHER):
+        results.put_many(model_key, keys, [0], [0.9])
+    results.invalidate("models/a.pkl")
+    assert results.get_many(V1, keys) == [None]
+    assert results.get_many(V2, keys) == [None]
+    assert results.get_many(OTHER, keys) == [(0, 0.9)]
+    results.invalidate()
+    assert results.stats()["size"] == 0
@@ -0,0 +1,51 @@
+import numpy as np
+from app.schemas.config import ModelConfig, SearchConfig
+from app.services.search_service import SearchService, _subsample
+
+
+def sorted_data(n=300, seed=0):
+    # Sınıfa göre sıralı veri: ilk satırların hepsi 0 sınıfından
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 3))
+    y = np.zeros(n, dtype=int)
+    y[n // 3:] = 1
+    X[:, 0] += 3 * y
+    return X, y
+
+
+def test_subsample_is_stratified_and_seeded():
+    _, y = sorted_data()
+    train_idx = np.arange(len(y))
+    subset = _subsample(train_idx, y, 30, random_state=0)
+    assert len(subset) == 30
+    assert np.all(np.diff(subset) > 0)
+    assert abs(y[subset].mean() - y.mean()) < 0.05
+    np.testing.assert_array_equal(subset, _subsample(train_idx, y, 30, random_state=0))
+
+
+def test_subsample_falls_back_when_stratification_impossible():
+    y = np.array([0] * 20 + [1])
+    subset = _subsample(np.arange(len(y)), y, 5, random_state=0)
+    assert len(subset) == 5 and len(set(subset)) == 5
+
+
+def test_halving_search_on_class_sorted_data():
+    X, y = sorted_data()
+    search = SearchConfig(strategy="halving", param_grid={"max_depth": [1, 2, 3, 4]},
+                          cv_folds=3, n_jobs=1, scoring="roc_auc")
+    algorithm = ModelConfig(type="random_forest", params={"n_estimators": 5, "random_state": 0})
+    result = SearchService().search(X, y, algorithm, search)
+    first_round = [t for t in result["trials"] if t["round"] == 0]
+    # İlk tur alt örneği iki sınıfı da içerdiği için skorlar anlamlı (tek sınıfla eğitilen model 0.5 verir)
+    assert all(t["mean_score"] > 0.6 for t in first_round)
+
+
+def test_search_accepts_string_targets():
+    X, y = sorted_data()
+    labels = np.array(["no", "yes"], dtype=object)[y]
+    search = SearchConfig(strategy="grid", param_grid={"max_depth": [1, 3]}, cv_folds=3, n_jobs=2)
+    algorithm = ModelConfig(type="xgboost", params={"n_estimators": 5})
+    by_label = SearchService().search(X, labels, algorithm, search)
+    by_code = SearchService().search(X, y, algorithm, search)
+    assert by_label["best_score"] > 0.6
+    assert [t["mean_score"] for t in by_label["trials"]] == [t["mean_score"] for t in by_code["trials"]]
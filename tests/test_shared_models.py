@@ -0,0 +1,89 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from app.services.model_factory import ModelFactory
+from app.services.shared_models import load_shared_arrays, shared_dir
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "model.pkl"
+    path.write_bytes(b"v1")
+    return str(path)
+
+
+def arrays(value):
+    return {"big": np.full(4096, value, dtype=np.float64), "small": np.array([value])}
+
+
+def replace_source(path, content):
+    with open(path, "wb") as f:
+        f.write(content)
+    # Aynı saniyede yazılsa da farklı versiyon sayılsın
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_arrays_are_exported_once_and_memory_mapped(source, tmp_path):
+    root = str(tmp_path / "shared")
+    builds = []
+
+    def build():
+        builds.append(True)
+        return arrays(1.0)
+
+    first = load_shared_arrays(source, build, root=root)
+    second = load_shared_arrays(source, build, root=root)
+    assert len(builds) == 1
+    assert isinstance(first["big"], np.memmap) and not isinstance(first["small"], np.memmap)
+    np.testing.assert_array_equal(first["big"], second["big"])
+    assert os.listdir(root) == [os.path.basename(shared_dir(source, root))]
+
+
+def test_old_version_is_kept_during_grace_period(source, tmp_path):
+    root = str(tmp_path / "shared")
+    old = load_shared_arrays(source, lambda: arrays(1.0), root=root)
+    old_dir = shared_dir(source, root)
+
+    replace_source(source, b"v2")
+    new = load_shared_arrays(source, lambda: arrays(2.0), root=root, grace_s=60)
+    # Eski versiyonu yeni açmış bir worker'ın klasörü silinmez
+    assert os.path.isdir(old_dir)
+    assert old["big"][0] == 1.0 and new["big"][0] == 2.0
+
+    past = time.time() - 120
+    os.utime(old_dir, (past, past))
+    load_shared_arrays(source, lambda: arrays(2.0), root=root, grace_s=60)
+    assert not os.path.isdir(old_dir)
+    # Silinen klasörden önce açılmış memory-map okunmaya devam eder
+    assert old["big"][-1] == 1.0
+
+
+def test_stale_tmp_dirs_are_removed(source, tmp_path):
+    root = str(tmp_path / "shared")
+    load_shared_arrays(source, lambda: arrays(1.0), root=root)
+    tmp_dir = f"{shared_dir(source, root)}.999999.tmp"
+    os.makedirs(tmp_dir)
+    past = time.time() - 120
+    os.utime(tmp_dir, (past, past))
+    load_shared_arrays(source, lambda: arrays(1.0), root=root, grace_s=60)
+    assert not os.path.exists(tmp_dir)
+
+
+def test_shared_load_matches_regular_load(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Paylaşımlı klasör varsayılan olarak çalışma dizinine göre
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.random((300, 4)), columns=list("abcd"))
+    y = (X.a + X.b > 1).astype(int)
+    model = ModelFactory.get_model({"type": "random_forest"})
+    model.train(X, y, {"n_estimators": 10, "random_state": 0})
+    path = model.save("rf.pkl")
+
+    regular = ModelFactory.get_model({"type": "random_forest"})
+    regular.load(path)
+    shared = ModelFactory.get_model({"type": "random_forest"})
+    shared.load_shared(path)
+    assert shared.model is None and os.path.isdir("models/shared")
+    np.testing.assert_allclose(shared.predict_proba(X.values), regular.predict_proba(X.values), atol=1e-6)
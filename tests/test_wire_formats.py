@@ -0,0 +1,132 @@
+import io
+import numpy as np
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.v1 import router
+from app.services.model_factory import RandomForestAdapter
+from app.services.wire_formats import ARROW_FILE, ARROW_STREAM, FLOAT32, NPY, decode_matrix
+
+X = np.arange(24, dtype=np.float32).reshape(6, 4)
+
+
+def npy_bytes(values) -> bytes:
+    buffer = io.BytesIO()
+    np.save(buffer, values)
+    return buffer.getvalue()
+
+
+def arrow_bytes(table: pa.Table, media_type: str = ARROW_STREAM) -> bytes:
+    sink = pa.BufferOutputStream()
+    writer = ipc.new_stream(sink, table.schema) if media_type == ARROW_STREAM else ipc.new_file(sink, table.schema)
+    with writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def feature_list_table(values: np.ndarray) -> pa.Table:
+    column = pa.FixedSizeListArray.from_arrays(pa.array(values.ravel()), values.shape[1])
+    return pa.table({"features": column})
+
+
+def test_raw_float32_is_viewed_without_copy():
+    body = X.astype("<f4").tobytes()
+    decoded = decode_matrix(body, FLOAT32, n_features=4)
+    np.testing.assert_array_equal(decoded, X)
+    assert not decoded.flags.writeable  # Gövdenin kendisi görüntülenir
+
+
+@pytest.mark.parametrize("n_features", [None, 5])
+def test_raw_float32_needs_matching_feature_count(n_features):
+    with pytest.raises(ValueError):
+        decode_matrix(X.tobytes(), FLOAT32, n_features=n_features)
+
+
+@pytest.mark.parametrize("values", [X, np.asfortranarray(X), X.astype(np.float64)])
+def test_npy_keeps_layout_and_dtype(values):
+    decoded = decode_matrix(npy_bytes(values), NPY)
+    np.testing.assert_array_equal(decoded, values)
+    assert decoded.dtype == values.dtype
+
+
+def test_npy_single_row_becomes_matrix():
+    assert decode_matrix(npy_bytes(X[0]), f"{NPY}; charset=binary").shape == (1, 4)
+
+
+@pytest.mark.parametrize("media_type", [ARROW_STREAM, ARROW_FILE])
+def test_arrow_fixed_size_list(media_type):
+    decoded = decode_matrix(arrow_bytes(feature_list_table(X), media_type), media_type)
+    np.testing.assert_array_equal(decoded, X)
+
+
+def test_arrow_sliced_fixed_size_list_respects_offset():
+    # İstemci dilimlenmiş bir tabloyu gönderirse değer buffer'ı offset'ten itibaren okunmalı
+    table = feature_list_table(X).slice(2, 3)
+    assert table.column(0).chunk(0).offset == 2
+    np.testing.assert_array_equal(decode_matrix(arrow_bytes(table), ARROW_STREAM), X[2:5])
+
+
+def test_arrow_multiple_batches_are_combined():
+    batches = feature_list_table(X).to_batches(max_chunksize=2)
+    table = pa.Table.from_batches(batches)
+    assert table.column(0).num_chunks == 3
+    np.testing.assert_array_equal(decode_matrix(arrow_bytes(table), ARROW_STREAM), X)
+
+
+def test_arrow_columns_follow_feature_order():
+    table = pa.table({"b": X[:, 1], "a": X[:, 0], "extra": X[:, 2]})
+    decoded = decode_matrix(arrow_bytes(table), ARROW_STREAM, feature_columns=["a", "b"])
+    np.testing.assert_array_equal(decoded, X[:, :2])
+    with pytest.raises(ValueError):
+        decode_matrix(arrow_bytes(table), ARROW_STREAM, feature_columns=["a", "missing"])
+
+
+@pytest.mark.parametrize("body, media_type", [
+    (npy_bytes(np.array([["a", "b"]])), NPY),
+    (npy_bytes(np.array([[1, None]], dtype=object)), NPY),
+    (arrow_bytes(pa.table({"a": ["x", "y"]})), ARROW_STREAM),
+    (b'{"features": [[1, 2]]}', "text/plain"),
+], ids=["npy-str", "npy-object", "arrow-str", "unknown-type"])
+def test_non_numeric_or_unknown_bodies_are_rejected(body, media_type):
+    with pytest.raises(ValueError):
+        decode_matrix(body, media_type)
+
+
+@pytest.fixture
+def client(tmp_path):
+    rng = np.random.default_rng(0)
+    train = rng.normal(size=(100, 4))
+    adapter = RandomForestAdapter()
+    adapter.train(train, (train[:, 0] > 0).astype(int), {"n_estimators": 3, "random_state": 0})
+    path = str(tmp_path / "model.pkl")
+    adapter.save(path)
+    app = FastAPI()
+    app.include_router(router.api_router)
+    return TestClient(app), path
+
+
+def post_matrix(client, body, content_type, **params):
+    test_client, model_path = client
+    return test_client.post("/predict-matrix", params={"model_id": model_path, **params}, content=body,
+                            headers={"content-type": content_type})
+
+
+def test_predict_matrix_accepts_binary_bodies(client):
+    response = post_matrix(client, X.tobytes(), FLOAT32)
+    assert response.status_code == 200
+    assert len(response.json()["class_label"]) == 6
+
+
+@pytest.mark.parametrize("body, content_type, params", [
+    (X[:, :3].copy().tobytes(), FLOAT32, {"n_features": 3}),   # Model 4 özellik bekliyor
+    (X.tobytes()[:-2], FLOAT32, {}),                            # Satırlara bölünmüyor
+    (npy_bytes(X[:, :3]), NPY, {}),
+    (npy_bytes(np.array([["a", "b", "c", "d"]])), NPY, {}),     # Sayısal değil
+    (b"not arrow", ARROW_STREAM, {}),
+    (X.tobytes(), "text/csv", {}),
+], ids=["feature-count", "float32-size", "npy-shape", "npy-str", "bad-arrow", "unknown-type"])
+def test_predict_matrix_rejects_bad_shape_or_dtype_with_422(client, body, content_type, params):
+    response = post_matrix(client, body, content_type, **params)
+    assert response.status_code == 422, response.text